@@ -0,0 +1,64 @@
+"""
+Run benchmarks and print the results or write them as JSON
+
+    python -m benchmarks
+    python -m benchmarks models webhook
+    python -m benchmarks --json results.json
+
+Every benchmark module has `run() -> Dict[str, float]`.
+The metric name carries the unit: `*_per_second`, `*_ms` and `*.bytes_per_item` are explicit,
+client and webhook throughput is per second, exceptions and exchange lookups are in microseconds
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+from typing import Any, Dict, List
+
+import icryptopay
+
+MODULES: List[str] = ["client", "decoding", "exceptions", "exchange", "import_time", "lite", "models", "sync", "webhook"]
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("modules", nargs="*", help=f"Benchmarks to run, all by default: {', '.join(MODULES)}")
+    parser.add_argument("--json", dest="path", help="Write results to this file, - for stdout")
+    args: argparse.Namespace = parser.parse_args()
+
+    for name in args.modules:
+        if name not in MODULES:
+            parser.error(f"unknown benchmark {name!r}")
+
+    results: Dict[str, float] = {}
+
+    for name in args.modules or MODULES:
+        print(f"Running {name}", file=sys.stderr)
+        results.update(importlib.import_module(f"benchmarks.{name}").run())
+
+    if args.path is None:
+        for name, value in results.items():
+            print(f"{name}: {value:,.3f}")
+        return
+
+    report: Dict[str, Any] = {
+        "timestamp": int(time.time()),
+        "icryptopay": icryptopay.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output: str = json.dumps(report, indent=2)
+
+    if args.path == "-":
+        print(output)
+    else:
+        with open(args.path, "w") as file:
+            file.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Client round trips against the local emulator at several concurrency levels
+
+    python -m benchmarks.client
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from icryptopay import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.utils.instrumentation import Instrumentation
+
+TOKEN: str = "1337:JHigdsaASq"
+CONCURRENCY: List[int] = [1, 10, 50, 100]
+REQUESTS: int = 1000
+INVOICES: int = 100
+
+
+async def measure(call: Callable[[], Awaitable[object]], concurrency: int) -> Dict[str, float]:
+    """Returns requests per second and latency percentiles in milliseconds"""
+
+    latencies: List[float] = []
+    remaining: List[int] = [REQUESTS]
+
+    async def worker() -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            started_at: float = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at: float = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed: float = time.perf_counter() - started_at
+
+    percentiles: List[float] = statistics.quantiles(latencies, n=100)
+
+    return {
+        "requests_per_second": REQUESTS / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+async def run_async() -> Dict[str, float]:
+    results: Dict[str, float] = {}
+
+    async with CryptoPayEmulator(token=TOKEN) as emulator:
+        crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url)
+        instrumented: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, instrumentation=Instrumentation())
+
+        for _ in range(INVOICES):
+            await crypto.create_invoice(asset="TON", amount=1)
+
+        calls: Dict[str, Callable[[], Awaitable[object]]] = {
+            "get_me": crypto.get_me,
+            "get_me_instrumented": instrumented.get_me,
+            "get_invoices": lambda: crypto.get_invoices(count=INVOICES),
+        }
+
+        for name, call in calls.items():
+            await call()
+
+            for concurrency in CONCURRENCY:
+                for metric, value in (await measure(call=call, concurrency=concurrency)).items():
+                    results[f"client.{name}.concurrency_{concurrency}.{metric}"] = value
+
+        await crypto.close()
+        await instrumented.close()
+
+    return results
+
+
+def run() -> Dict[str, float]:
+    """
+    Returns throughput and latency of get_me, get_me with no-op instrumentation
+    and 100 invoice get_invoices for every concurrency level
+    """
+
+    return asyncio.run(run_async())
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:,.2f}")
@@ -0,0 +1,56 @@
+"""
+Decode and validate throughput for a 1000 item getInvoices page
+
+    python -m benchmarks.decoding
+"""
+
+import json
+import timeit
+from typing import Callable, Dict, List
+
+from benchmarks.fixtures import make_invoice, make_page
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.response import ItemsPage
+from icryptopay.utils.decoder import JSONDecoder, OrjsonDecoder, get_response_adapter
+
+PAGE_SIZE: int = 1000
+NUMBER: int = 20
+
+
+def run() -> Dict[str, float]:
+    """Returns invoices per second for every decoding path"""
+
+    body: bytes = make_page([make_invoice(invoice_id) for invoice_id in range(PAGE_SIZE)])
+    adapter = get_response_adapter(ItemsPage[Invoice])
+
+    def dict_then_models() -> List[Invoice]:
+        response = json.loads(body)
+        return [Invoice(**invoice) for invoice in response["result"]["items"]]
+
+    def stdlib_then_adapter() -> List[Invoice]:
+        return adapter.validate_python(JSONDecoder().decode(body)).result.items
+
+    def validate_json() -> List[Invoice]:
+        return adapter.validate_json(body).result.items
+
+    paths: Dict[str, Callable[[], List[Invoice]]] = {
+        "dict_then_models": dict_then_models,
+        "stdlib_then_adapter": stdlib_then_adapter,
+        "validate_json": validate_json,
+    }
+
+    try:
+        orjson_decoder: JSONDecoder = OrjsonDecoder()
+        paths["orjson_then_adapter"] = lambda: adapter.validate_python(orjson_decoder.decode(body)).result.items
+    except ImportError:
+        pass
+
+    return {
+        f"decoding.{name}": PAGE_SIZE * NUMBER / min(timeit.repeat(path, number=NUMBER, repeat=5))
+        for name, path in paths.items()
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:,.0f} invoices/s")
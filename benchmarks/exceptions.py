@@ -0,0 +1,48 @@
+"""
+CryptoPayAPIError creation cost and raise/catch cost as the interpreter heap grows
+
+    python -m benchmarks.exceptions
+"""
+
+import itertools
+import timeit
+from typing import Dict, Iterator, List
+
+from icryptopay.exceptions import CryptoPayAPIError
+
+HEAP_SIZES: List[int] = [0, 100_000, 1_000_000]
+NUMBER: int = 10_000
+
+
+def raise_and_catch() -> None:
+    try:
+        raise CryptoPayAPIError(400, "INSUFFICIENT_FUNDS")
+    except CryptoPayAPIError(400):
+        pass
+
+
+def run() -> Dict[str, float]:
+    """Returns microseconds per creation and per raise/catch for every heap size"""
+
+    names: Iterator[str] = (f"ERROR_{index}" for index in itertools.count())
+    results: Dict[str, float] = {
+        "exceptions.create": min(timeit.repeat(
+            lambda: CryptoPayAPIError(400, "INSUFFICIENT_FUNDS"), number=NUMBER, repeat=5
+        )) / NUMBER * 1e6,
+        "exceptions.create.new_name": min(timeit.repeat(
+            lambda: CryptoPayAPIError(400, next(names)), number=1000, repeat=5
+        )) / 1000 * 1e6,
+    }
+    heap: List[object] = []
+
+    for size in HEAP_SIZES:
+        heap.extend(object() for _ in range(size - len(heap)))
+        seconds: float = min(timeit.repeat(raise_and_catch, number=NUMBER, repeat=5))
+        results[f"exceptions.raise_catch.heap_{size}"] = seconds / NUMBER * 1e6
+
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:.3f} us")
@@ -0,0 +1,59 @@
+"""
+get_rate linear scan against RateTable lookups
+
+    python -m benchmarks.exchange
+"""
+
+import timeit
+from typing import Dict, List
+
+from icryptopay.enums.asset import Asset
+from icryptopay.enums.fiat import FiatType
+from icryptopay.types.rates import ExchangeRate
+from icryptopay.utils.exchange import RateTable, get_rate
+
+NUMBER: int = 10_000
+
+
+def make_rates() -> List[ExchangeRate]:
+    """All asset/fiat pairs, like a getExchangeRates response"""
+
+    return [
+        ExchangeRate(is_valid=True, is_crypto=True, is_fiat=False, source=asset, target=fiat, rate=1.5)
+        for asset in Asset
+        for fiat in FiatType
+    ]
+
+
+def run() -> Dict[str, float]:
+    """Returns microseconds per lookup of the last listed pair"""
+
+    rates: List[ExchangeRate] = make_rates()
+    rate_table: RateTable = RateTable(rates=rates)
+    source, target = rates[-1].source, rates[-1].target
+    amounts: List[int] = list(range(100))
+
+    def convert_each() -> None:
+        for amount in amounts:
+            amount / get_rate(source=source, target=target, rates=rates).rate
+
+    return {
+        "exchange.get_rate": min(timeit.repeat(
+            lambda: get_rate(source=source, target=target, rates=rates), number=NUMBER, repeat=5
+        )) / NUMBER * 1e6,
+        "exchange.rate_table.get_rate": min(timeit.repeat(
+            lambda: rate_table.get_rate(source=source, target=target), number=NUMBER, repeat=5
+        )) / NUMBER * 1e6,
+        "exchange.rate_table.build": min(timeit.repeat(
+            lambda: RateTable(rates=rates), number=100, repeat=5
+        )) / 100 * 1e6,
+        "exchange.get_rate.100_amounts": min(timeit.repeat(convert_each, number=100, repeat=5)) / 100 * 1e6,
+        "exchange.rate_table.convert_many.100_amounts": min(timeit.repeat(
+            lambda: rate_table.convert_many(amounts=amounts, source=target, target=source), number=100, repeat=5
+        )) / 100 * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:.3f} us")
@@ -0,0 +1,106 @@
+"""Sample Crypto Pay API payloads"""
+
+import json
+from typing import Any, Dict, List
+
+
+def make_profile() -> Dict[str, Any]:
+    return {"app_id": 1, "name": "Shop", "payment_processing_bot_username": "CryptoBot"}
+
+
+def make_app_stats() -> Dict[str, Any]:
+    return {
+        "volume": "1520.5",
+        "conversion": 0.42,
+        "unique_users_count": 210,
+        "created_invoice_count": 1000,
+        "paid_invoice_count": 420,
+        "start_at": "2024-08-19T10:00:00.000Z",
+        "end_at": "2024-08-20T10:00:00.000Z",
+    }
+
+
+def make_exchange_rate(source: str, target: str) -> Dict[str, Any]:
+    return {"is_valid": True, "is_crypto": True, "is_fiat": False, "source": source, "target": target, "rate": "5.43"}
+
+
+def make_currency(code: str) -> Dict[str, Any]:
+    return {
+        "is_blockchain": True,
+        "is_stablecoin": False,
+        "is_fiat": False,
+        "name": code,
+        "code": code,
+        "url": None,
+        "decimals": 9,
+    }
+
+
+def make_update(update_id: int) -> Dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "update_type": "invoice_paid",
+        "request_date": "2024-08-20T10:05:00.000Z",
+        "payload": make_invoice(update_id),
+    }
+
+
+def make_invoice(invoice_id: int, status: str = "paid") -> Dict[str, Any]:
+    return {
+        "invoice_id": invoice_id,
+        "hash": f"IV{invoice_id:010d}",
+        "currency_type": "crypto",
+        "asset": "TON",
+        "amount": "1.5",
+        "paid_asset": "TON",
+        "paid_amount": "1.5",
+        "fee_asset": "TON",
+        "fee_amount": "0.015",
+        "fee_in_usd": "0.08",
+        "paid_usd_rate": "5.43",
+        "bot_invoice_url": f"https://t.me/CryptoBot?start=IV{invoice_id}",
+        "mini_app_invoice_url": f"https://t.me/CryptoBot/app?startapp=invoice-IV{invoice_id}",
+        "web_app_invoice_url": f"https://app.send.tg/invoices/IV{invoice_id}",
+        "description": "Subscription",
+        "status": status,
+        "created_at": "2024-08-20T10:00:00.000Z",
+        "allow_comments": True,
+        "allow_anonymous": True,
+        "paid_at": "2024-08-20T10:05:00.000Z",
+        "paid_anonymously": False,
+        "payload": f"order-{invoice_id}",
+    }
+
+
+def make_check(check_id: int) -> Dict[str, Any]:
+    return {
+        "check_id": check_id,
+        "hash": f"CQ{check_id:010d}",
+        "asset": "USDT",
+        "amount": "10",
+        "bot_check_url": f"https://t.me/CryptoBot?start=CQ{check_id}",
+        "status": "active",
+        "created_at": "2024-08-20T10:00:00.000Z",
+    }
+
+
+def make_transfer(transfer_id: int) -> Dict[str, Any]:
+    return {
+        "transfer_id": transfer_id,
+        "user_id": 1000 + transfer_id,
+        "asset": "USDT",
+        "amount": "2.5",
+        "status": "completed",
+        "completed_at": "2024-08-20T10:00:00.000Z",
+        "comment": "Payout",
+    }
+
+
+def make_balance(currency_code: str) -> Dict[str, Any]:
+    return {"currency_code": currency_code, "available": "125.5", "onhold": "10"}
+
+
+def make_page(items: List[Dict[str, Any]]) -> bytes:
+    """getInvoices/getChecks/getTransfers response body"""
+
+    return json.dumps({"ok": True, "result": {"items": items}}).encode()
@@ -0,0 +1,87 @@
+"""
+Import time of icryptopay modules, measured with `python -X importtime` in a fresh interpreter
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --check
+
+With --check the script exits with status 1 if a module is over its time budget
+or imports a module it must not import. tests/test_imports.py runs the same check
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+RUNS: int = 5
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+# Module: (budget in milliseconds, modules it must not import)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "icryptopay": (25.0, ("aiohttp", "pydantic", "fastapi", "starlette")),
+    "icryptopay.api": (500.0, ("fastapi", "starlette", "sqlite3", "pydantic.type_adapter")),
+    "icryptopay.webhook.asgi": (300.0, ("aiohttp", "fastapi", "starlette")),
+}
+
+
+def measure(module: str) -> Dict[str, int]:
+    """Returns cumulative import time in microseconds of the module and of every module it imports"""
+
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times: Dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def run() -> Dict[str, float]:
+    """Returns the best of `RUNS` import times in milliseconds for every module"""
+
+    return {
+        f"import_time.{module}": min(measure(module)[module] for _ in range(RUNS)) / 1000
+        for module in BUDGETS
+    }
+
+
+def check() -> List[str]:
+    """Returns budget violations"""
+
+    errors: List[str] = []
+
+    for module, (budget, forbidden) in BUDGETS.items():
+        runs: List[Dict[str, int]] = [measure(module) for _ in range(RUNS)]
+        best: float = min(times[module] for times in runs) / 1000
+
+        if best > budget:
+            errors.append(f"{module}: {best:.1f} ms, budget {budget:.1f} ms")
+
+        for name in forbidden:
+            if name in runs[0]:
+                errors.append(f"{module}: imports {name}")
+
+    return errors
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        violations: List[str] = check()
+
+        for violation in violations:
+            print(violation, file=sys.stderr)
+
+        sys.exit(1 if violations else 0)
+
+    for name, value in run().items():
+        print(f"{name}: {value:.1f} ms")
@@ -0,0 +1,83 @@
+"""
+Parse throughput and memory of pydantic models and lite models for 1000 item responses
+
+    python -m benchmarks.lite
+"""
+
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from benchmarks.fixtures import make_balance, make_check, make_invoice, make_page, make_transfer
+from icryptopay.types.balance import Balance
+from icryptopay.types.check import Check
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.lite import LiteBalance, LiteCheck, LiteInvoice, LiteModel, LiteResult, LiteTransfer
+from icryptopay.types.response import ItemsPage
+from icryptopay.types.transfer import Transfer
+from icryptopay.utils.decoder import JSONDecoder, get_default_decoder, get_response_adapter
+
+SIZE: int = 1000
+NUMBER: int = 10
+
+ASSETS: Tuple[str, ...] = ("TON", "USDT", "BTC", "ETH")
+
+
+def make_bodies() -> Dict[str, Tuple[bytes, Any, Type[LiteModel], bool]]:
+    """Returns response body, pydantic result type, lite model and page flag for every model"""
+
+    return {
+        "invoice": (make_page([make_invoice(i) for i in range(SIZE)]), ItemsPage[Invoice], LiteInvoice, True),
+        "check": (make_page([make_check(i) for i in range(SIZE)]), ItemsPage[Check], LiteCheck, True),
+        "transfer": (make_page([make_transfer(i) for i in range(SIZE)]), ItemsPage[Transfer], LiteTransfer, True),
+        "balance": (
+            json.dumps({"ok": True, "result": [make_balance(ASSETS[i % len(ASSETS)]) for i in range(SIZE)]}).encode(),
+            List[Balance],
+            LiteBalance,
+            False
+        ),
+    }
+
+
+def measure_memory(parse: Callable[[], Any]) -> float:
+    """Returns bytes retained by the parsed result per item"""
+
+    tracemalloc.start()
+    result: Any = parse()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+
+    return size / SIZE
+
+
+def run() -> Dict[str, float]:
+    """Returns items per second and retained bytes per item of both model kinds"""
+
+    decoder: JSONDecoder = get_default_decoder(use_decimal=False) or JSONDecoder()
+    results: Dict[str, float] = {}
+
+    for name, (body, result_type, lite_model, page) in make_bodies().items():
+        adapter = get_response_adapter(result_type)
+        lite_result: LiteResult = LiteResult(lite_model, page=page)
+
+        paths: Dict[str, Callable[[], Any]] = {
+            "pydantic": lambda: adapter.validate_json(body).result,
+            "lite": lambda: lite_result.parse(decoder.decode(body)["result"]),
+        }
+
+        for kind, parse in paths.items():
+            parse()
+            seconds: float = min(timeit.repeat(parse, number=NUMBER, repeat=5))
+
+            results[f"lite.{name}.{kind}.items_per_second"] = SIZE * NUMBER / seconds
+            results[f"lite.{name}.{kind}.bytes_per_item"] = measure_memory(parse)
+
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:,.0f}")
@@ -0,0 +1,82 @@
+"""
+Validation throughput of every response model from raw JSON
+
+    python -m benchmarks.models
+"""
+
+import json
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.fixtures import (
+    make_app_stats,
+    make_balance,
+    make_check,
+    make_currency,
+    make_exchange_rate,
+    make_invoice,
+    make_profile,
+    make_transfer,
+    make_update
+)
+from icryptopay.enums.asset import Asset
+from icryptopay.enums.fiat import FiatType
+from icryptopay.types.app_stats import AppStats
+from icryptopay.types.balance import Balance
+from icryptopay.types.check import Check
+from icryptopay.types.currencies import Currency
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.profile import Profile
+from icryptopay.types.rates import ExchangeRate
+from icryptopay.types.transfer import Transfer
+from icryptopay.types.update import Update
+from icryptopay.utils.decoder import get_response_adapter
+
+SIZE: int = 1000
+NUMBER: int = 10
+
+
+def make_bodies() -> Dict[str, Tuple[Any, bytes]]:
+    """Returns result type and a response body with `SIZE` objects for every model"""
+
+    assets: List[Asset] = list(Asset)
+    fiats: List[FiatType] = list(FiatType)
+    items: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {
+        "profile": (Profile, [make_profile() for _ in range(SIZE)]),
+        "app_stats": (AppStats, [make_app_stats() for _ in range(SIZE)]),
+        "balance": (Balance, [make_balance(assets[i % len(assets)]) for i in range(SIZE)]),
+        "exchange_rate": (
+            ExchangeRate,
+            [make_exchange_rate(assets[i % len(assets)], fiats[i % len(fiats)]) for i in range(SIZE)]
+        ),
+        "currency": (Currency, [make_currency(assets[i % len(assets)]) for i in range(SIZE)]),
+        "invoice": (Invoice, [make_invoice(i) for i in range(SIZE)]),
+        "check": (Check, [make_check(i) for i in range(SIZE)]),
+        "transfer": (Transfer, [make_transfer(i) for i in range(SIZE)]),
+        "update": (Update, [make_update(i) for i in range(SIZE)]),
+    }
+
+    return {
+        name: (List[model], json.dumps({"ok": True, "result": objects}).encode())
+        for name, (model, objects) in items.items()
+    }
+
+
+def run() -> Dict[str, float]:
+    """Returns objects per second validated from the response body"""
+
+    results: Dict[str, float] = {}
+
+    for name, (result_type, body) in make_bodies().items():
+        adapter = get_response_adapter(result_type)
+        adapter.validate_json(body)
+
+        seconds: float = min(timeit.repeat(lambda: adapter.validate_json(body), number=NUMBER, repeat=5))
+        results[f"models.{name}"] = SIZE * NUMBER / seconds
+
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:,.0f} objects/s")
@@ -0,0 +1,73 @@
+"""
+Blocking calls: asyncio.run with a new client per call against SyncICryptoPay, on the local emulator
+
+    python -m benchmarks.sync
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from icryptopay import ICryptoPay, SyncICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+
+TOKEN: str = "1337:JHigdsaASq"
+REQUESTS: int = 500
+THREADS: int = 8
+
+
+async def get_me_once(base_url: str) -> None:
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=base_url)
+
+    try:
+        await crypto.get_me()
+    finally:
+        await crypto.close()
+
+
+def run() -> Dict[str, float]:
+    """Returns get_me calls per second for asyncio.run per call and for the facade with 1 and 8 threads"""
+
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    base_url: str = loop.run_until_complete(emulator.start())
+    thread: threading.Thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    results: Dict[str, float] = {}
+
+    started_at: float = time.perf_counter()
+
+    for _ in range(REQUESTS):
+        asyncio.run(get_me_once(base_url))
+
+    results["sync.asyncio_run.requests_per_second"] = REQUESTS / (time.perf_counter() - started_at)
+
+    with SyncICryptoPay(token=TOKEN, base_url=base_url) as crypto:
+        crypto.get_me()
+        started_at = time.perf_counter()
+
+        for _ in range(REQUESTS):
+            crypto.get_me()
+
+        results["sync.facade.threads_1.requests_per_second"] = REQUESTS / (time.perf_counter() - started_at)
+
+        with ThreadPoolExecutor(THREADS) as executor:
+            started_at = time.perf_counter()
+            list(executor.map(lambda _: crypto.get_me(), range(REQUESTS)))
+
+        results[f"sync.facade.threads_{THREADS}.requests_per_second"] = REQUESTS / (time.perf_counter() - started_at)
+
+    asyncio.run_coroutine_threadsafe(emulator.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:,.2f}")
@@ -0,0 +1,139 @@
+"""
+Webhook verifications per second and updates dispatched per second
+
+    python -m benchmarks.webhook
+"""
+
+import asyncio
+import json
+import time
+import timeit
+from hashlib import sha256
+from hmac import HMAC
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from benchmarks.fixtures import make_update
+from icryptopay import ICryptoPay
+from icryptopay.types.update import Update
+
+TOKEN: str = "1337:JHigdsaASq"
+NUMBER: int = 5_000
+DISPATCH_NUMBER: int = 2_000
+
+
+def make_update_body(update_id: int = 1) -> bytes:
+    return json.dumps(make_update(update_id)).encode()
+
+
+def sign(body: bytes, token: str = TOKEN) -> str:
+    return HMAC(key=sha256(token.encode()).digest(), msg=body, digestmod=sha256).hexdigest()
+
+
+def legacy_verify(body: bytes, signature: str) -> Update:
+    """Verification before single pass parsing: parse, decode, rehash the token and compare with =="""
+
+    data = json.loads(body)
+    body_text: str = body.decode("UTF-8")
+    token: bytes = sha256(TOKEN.encode("UTF-8")).digest()
+
+    if HMAC(key=token, msg=body_text.encode("UTF-8"), digestmod=sha256).hexdigest() == signature:
+        return Update(**data)
+
+
+def make_scope(body: bytes) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", b"application/json"), (b"crypto-pay-api-signature", sign(body).encode())],
+    }
+
+
+async def measure_dispatch(handle: Callable[[Dict[str, Any], bytes], Awaitable[None]]) -> float:
+    """Returns updates per second passed through `handle` with a no-op pay handler"""
+
+    bodies: List[Tuple[Dict[str, Any], bytes]] = [
+        (make_scope(body), body) for body in map(make_update_body, range(1, DISPATCH_NUMBER + 1))
+    ]
+    started_at: float = time.perf_counter()
+
+    for scope, body in bodies:
+        await handle(scope, body)
+
+    return DISPATCH_NUMBER / (time.perf_counter() - started_at)
+
+
+async def run_dispatch() -> Dict[str, float]:
+    """Returns updates per second through the ASGI app and through get_updates"""
+
+    results: Dict[str, float] = {}
+
+    async def send(message: Dict[str, Any]) -> None:
+        pass
+
+    async def handle_asgi(scope: Dict[str, Any], body: bytes) -> None:
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await app(scope, receive, send)
+
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN)
+    crypto.register_pay_handler(lambda update: None)
+    app = crypto.get_asgi_app()
+    results["webhook.dispatch.asgi_app"] = await measure_dispatch(handle_asgi)
+    await crypto.close()
+
+    try:
+        from starlette.requests import Request
+    except ImportError:
+        return results
+
+    async def handle_starlette(scope: Dict[str, Any], body: bytes) -> None:
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await crypto.get_updates(Request(scope, receive))
+
+    crypto = ICryptoPay(token=TOKEN)
+    crypto.register_pay_handler(lambda update: None)
+    results["webhook.dispatch.get_updates"] = await measure_dispatch(handle_starlette)
+    await crypto.close()
+
+    return results
+
+
+async def run_verify() -> Dict[str, float]:
+    """Returns verifications per second"""
+
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN)
+    body: bytes = make_update_body()
+    signature: str = sign(body)
+
+    results: Dict[str, float] = {
+        "webhook.legacy_verify": NUMBER / min(timeit.repeat(
+            lambda: legacy_verify(body=body, signature=signature), number=NUMBER, repeat=5
+        )),
+        "webhook.parse_update": NUMBER / min(timeit.repeat(
+            lambda: crypto.parse_update(body=body, crypto_pay_signature=signature), number=NUMBER, repeat=5
+        )),
+        "webhook.parse_update.bad_signature": NUMBER / min(timeit.repeat(
+            lambda: crypto.parse_update(body=body, crypto_pay_signature="0" * 64), number=NUMBER, repeat=5
+        )),
+    }
+    await crypto.close()
+
+    return results
+
+
+def run() -> Dict[str, float]:
+    """Returns verifications per second and updates dispatched per second"""
+
+    results: Dict[str, float] = asyncio.run(run_verify())
+    results.update(asyncio.run(run_dispatch()))
+
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value:,.0f}/s")
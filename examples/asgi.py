@@ -0,0 +1,19 @@
+import uvicorn
+
+from icryptopay import ICryptoPay
+from icryptopay.types.update import Update
+
+crypto: ICryptoPay = ICryptoPay(
+    token="TOKEN",
+    use_test_network=True
+)
+
+
+@crypto.pay_handler()
+async def invoice_paid(update: Update) -> None:
+    print("PAID")
+    print(update)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app=crypto.get_asgi_app(path="/"), host="localhost", port=3001)
@@ -0,0 +1,21 @@
+import asyncio
+
+from icryptopay import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+
+
+async def main() -> None:
+    async with CryptoPayEmulator(token="TOKEN", latency=0.05) as emulator:
+        crypto: ICryptoPay = ICryptoPay(token="TOKEN", base_url=emulator.base_url)
+
+        invoice = await crypto.create_invoice(asset="TON", amount=1.5)
+        await emulator.pay_invoice(invoice.invoice_id)
+
+        print(await crypto.get_invoice(invoice.invoice_id))
+        print(await crypto.get_balance())
+
+        await crypto.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+from icryptopay import SyncICryptoPay
+from icryptopay.types.invoice import Invoice
+
+crypto: SyncICryptoPay = SyncICryptoPay(
+    token="TOKEN",
+    use_test_network=True
+)
+
+
+def create_invoice(amount: float) -> str:
+    """Can be called from any thread, e.g. a Django view or a Celery task"""
+
+    invoice: Invoice = crypto.create_invoice(asset="TON", amount=amount)
+
+    return invoice.bot_invoice_url
+
+
+if __name__ == "__main__":
+    print(create_invoice(amount=1))
+
+    for invoice in crypto.iter_invoices(status="active", limit=10):
+        print(invoice.invoice_id, invoice.amount)
+
+    crypto.close()
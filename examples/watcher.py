@@ -0,0 +1,34 @@
+import asyncio
+
+from icryptopay import ICryptoPay
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.update import Update
+from icryptopay.webhook import InvoiceWatcher
+
+crypto: ICryptoPay = ICryptoPay(
+    token="TOKEN",
+    use_test_network=True
+)
+
+
+@crypto.pay_handler()
+async def invoice_paid(update: Update) -> None:
+    print("PAID")
+    print(update)
+
+
+async def main() -> None:
+    async with InvoiceWatcher(client=crypto) as watcher:
+        invoice: Invoice = await crypto.create_invoice(asset="TON", amount=1, expires_in=600)
+        watcher.watch(invoice)
+
+        print(invoice.bot_invoice_url)
+
+        while len(watcher):
+            await asyncio.sleep(1)
+
+    await crypto.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,36 @@
-from .api import ICryptoPay
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .api import ICryptoPay
+    from .pool import CryptoPayPool
+    from .sync import SyncICryptoPay
 
 __version__ = "0.3.6"
+__all__ = ["ICryptoPay", "CryptoPayPool", "SyncICryptoPay"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the client on first access, so importing the package doesn't load aiohttp and pydantic"""
+
+    if name == "ICryptoPay":
+        from .api import ICryptoPay
+
+        globals()[name] = ICryptoPay
+
+        return ICryptoPay
+
+    if name == "CryptoPayPool":
+        from .pool import CryptoPayPool
+
+        globals()[name] = CryptoPayPool
+
+        return CryptoPayPool
+
+    if name == "SyncICryptoPay":
+        from .sync import SyncICryptoPay
+
+        globals()[name] = SyncICryptoPay
+
+        return SyncICryptoPay
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,27 @@
+import asyncio
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
 from hashlib import sha256
-from hmac import HMAC
-from typing import Optional, Union, List, Callable, Dict, Any
-
-from fastapi.openapi.models import Response
-from starlette.requests import Request
-from starlette.responses import JSONResponse
+from hmac import HMAC, compare_digest
+from itertools import islice
+from typing import (
+    Optional,
+    Union,
+    List,
+    Callable,
+    Dict,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Iterable,
+    Iterator,
+    Set,
+    Tuple,
+    TypeVar,
+    TYPE_CHECKING
+)
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
 
 from icryptopay.enums.button import PaidButton
 from icryptopay.enums.method import APIMethod
@@ -16,34 +32,123 @@ from icryptopay.enums.currency import CurrencyType
 from icryptopay.enums.http import HTTPMethod
 from icryptopay.enums.invoice import InvoiceStatus
 from icryptopay.enums.network import NetworkType
+from icryptopay.enums.priority import RequestPriority
+from icryptopay.exceptions import CodeErrorFactory
 from icryptopay.types.app_stats import AppStats
 from icryptopay.types.balance import Balance
+from icryptopay.types.bulk import BulkInvoiceReport, BulkInvoiceResult
 from icryptopay.types.check import Check
 from icryptopay.types.currencies import Currency
 from icryptopay.types.invoice import Invoice
+from icryptopay.types.lite import LiteBalance, LiteCheck, LiteInvoice, LiteResult, LiteTransfer
 from icryptopay.types.profile import Profile
 from icryptopay.types.rates import ExchangeRate
+from icryptopay.types.response import ItemsPage
+from icryptopay.types.stats import BalanceTrackerStats, CacheStats, DispatcherStats
 from icryptopay.types.transfer import Transfer
 from icryptopay.types.update import Update
-from icryptopay.utils.exchange import get_rate, get_rate_summ
+from icryptopay.utils.balance import BalanceTracker
+from icryptopay.utils.batching import ID_CHUNK_SIZE, BatchLoader, gather_chunks
+from icryptopay.utils.cache import TTLCache
+from icryptopay.utils.decoder import JSONDecoder
+from icryptopay.utils.exchange import RateTable
+from icryptopay.utils.instrumentation import InstrumentationArg
+from icryptopay.utils.money import format_amount, quantize_amount
+from icryptopay.utils.pagination import paginate
+from icryptopay.utils.ratelimit import RateLimiter
+from icryptopay.utils.retry import RetryPolicy
+from icryptopay.webhook.dispatcher import UpdateDispatcher
+
+if TYPE_CHECKING:
+    from icryptopay.webhook.asgi import WebhookApp
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+
+T = TypeVar("T")
 
 
 class ICryptoPay(BaseClient):
     """ICryptoPay API client"""
 
-    __network: NetworkType = NetworkType.MAIN
-    __headers: Dict[str, Any] = {}
-    __handlers = []
+    __network: Union[NetworkType, str] = NetworkType.MAIN
+
+    def __init__(
+            self,
+            token: str,
+            use_test_network: bool = False,
+            pool_size: int = 100,
+            pool_size_per_host: int = 0,
+            keepalive_timeout: float = 15.0,
+            dns_cache_ttl: Optional[int] = 10,
+            timeout: Optional[ClientTimeout] = None,
+            session: Optional[ClientSession] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            cache: Optional[TTLCache] = None,
+            use_decimal: bool = False,
+            decoder: Optional[JSONDecoder] = None,
+            dispatcher: Optional[UpdateDispatcher] = None,
+            lite_models: bool = False,
+            base_url: Optional[str] = None,
+            instrumentation: InstrumentationArg = None,
+            balance_tracker: Optional[BalanceTracker] = None
+    ) -> None:
+        """
+        :param token: Crypto Pay API token
+        :param use_test_network: Use testnet
+        :param pool_size: Total number of simultaneous connections, 0 for no limit
+        :param pool_size_per_host: Number of simultaneous connections to one host, 0 for no limit
+        :param keepalive_timeout: Seconds an idle connection is kept in the pool
+        :param dns_cache_ttl: Seconds resolved addresses are cached, None to cache forever
+        :param timeout: HTTP timeouts, aiohttp defaults if not passed
+        :param session: Shared session. It is used as is and is not closed by the client
+        :param retry_policy: Retry policy, idempotent methods are retried up to 3 times by default
+        :param rate_limiter: Client-side rate limiter, requests are not limited if not passed
+        :param cache: Cache for exchange rates and currencies, they are fetched on every call if not passed
+        :param use_decimal: Parse amounts and rates to Decimal, without a float intermediate
+        :param decoder: Response body decoder, e.g. icryptopay.utils.decoder.OrjsonDecoder.
+        By default pydantic validates the body straight from bytes
+        :param dispatcher: Webhook updates dispatcher, pay handlers are called inline if not passed
+        :param lite_models: Return lite `__slots__` models from get_balance, get_invoices, get_transfers and
+        get_checks by default, see icryptopay.types.lite
+        :param base_url: API server URL instead of the main or test network, e.g. icryptopay.emulator
+        :param instrumentation: Request hooks, see icryptopay.utils.instrumentation
+        :param balance_tracker: Balance snapshot with local accounting of transfers and checks.
+        get_balance is served from it and payouts over the available balance are rejected without a request
+        """
 
-    def __init__(self, token: str, use_test_network: bool = False) -> None:
-        super().__init__()
+        super().__init__(
+            pool_size=pool_size,
+            pool_size_per_host=pool_size_per_host,
+            keepalive_timeout=keepalive_timeout,
+            dns_cache_ttl=dns_cache_ttl,
+            timeout=timeout,
+            session=session,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            use_decimal=use_decimal,
+            decoder=decoder,
+            instrumentation=instrumentation
+        )
 
         self.__token = token
+        self.__headers: Dict[str, Any] = {"Crypto-Pay-API-Token": token}
+        self.__webhook_key: bytes = sha256(token.encode("UTF-8")).digest()
+        self._cache = cache
+        self._rate_table: Optional[Tuple[List[ExchangeRate], RateTable]] = None
+        self._dispatcher = dispatcher or UpdateDispatcher()
+        self._lite_models = lite_models
+        self._balance_tracker = balance_tracker
+
+        self._invoice_loader: BatchLoader[int, Invoice] = BatchLoader(fetch=self._load_invoices)
+        self._transfer_loader: BatchLoader[int, Transfer] = BatchLoader(fetch=self._load_transfers)
+        self._check_loader: BatchLoader[int, Check] = BatchLoader(fetch=self._load_checks)
 
         if use_test_network:
             self.__network = NetworkType.TEST
 
-        self.__headers["Crypto-Pay-API-Token"] = token
+        if base_url is not None:
+            self.__network = base_url.rstrip("/")
 
     async def __aenter__(self) -> None:
         return self
@@ -51,6 +156,9 @@ class ICryptoPay(BaseClient):
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.close()
 
+    def _is_lite(self, lite: Optional[bool]) -> bool:
+        return self._lite_models if lite is None else lite
+
     def _build_request_url(self, method: APIMethod) -> str:
         """
         Returns a URL for the request
@@ -67,14 +175,14 @@ class ICryptoPay(BaseClient):
         https://help.crypt.bot/crypto-pay-api#getMe
         """
 
-        response = await self._make_request(
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_ME),
+            api_method=APIMethod.GET_ME,
+            result_type=Profile,
             headers=self.__headers
         )
 
-        return Profile(**response["result"])
-
     async def get_stats(
             self,
             start_at: Optional[Union[datetime, str]] = None,
@@ -99,60 +207,115 @@ class ICryptoPay(BaseClient):
             if value is None:
                 del params[key]
 
-        response = await self._make_request(
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_STATS),
+            api_method=APIMethod.GET_STATS,
             params=params,
+            result_type=AppStats,
             headers=self.__headers
         )
 
-        return AppStats(**response["result"])
-
-    async def get_balance(self) -> List[Balance]:
+    async def get_balance(self, lite: Optional[bool] = None) -> Union[List[Balance], List[LiteBalance]]:
         """
         Use this method to get a balance of your app.
         https://help.crypt.bot/crypto-pay-api#getBalance
+
+        :param lite: Return lite models, the client default if not passed.
+        Lite models are always fetched, without the balance tracker
         """
 
-        response = await self._make_request(
+        if self._is_lite(lite):
+            return await self._make_request(
+                method=HTTPMethod.GET,
+                url=self._build_request_url(method=APIMethod.GET_BALANCE),
+                api_method=APIMethod.GET_BALANCE,
+                result_type=LiteResult(LiteBalance),
+                headers=self.__headers
+            )
+
+        if self._balance_tracker is not None:
+            return await self._balance_tracker.get_balances(fetch=self._fetch_balance)
+
+        return await self._fetch_balance()
+
+    async def _fetch_balance(self) -> List[Balance]:
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_BALANCE),
+            api_method=APIMethod.GET_BALANCE,
+            result_type=List[Balance],
             headers=self.__headers
         )
 
-        return [Balance(**balance) for balance in response["result"]]
+    async def _spend(
+            self,
+            asset: Union[Asset, str],
+            amount: Union[int, float, Decimal],
+            send: Callable[[], Awaitable[T]],
+            hold: bool = False
+    ) -> T:
+        """Send a payout request, reserving the amount in the balance tracker if the client has one"""
+
+        if self._balance_tracker is None:
+            return await send()
+
+        async with self._balance_tracker.reserve(asset=asset, amount=amount, fetch=self._fetch_balance, hold=hold):
+            return await send()
 
     async def get_exchange_rates(self) -> List[ExchangeRate]:
         """
         Use this method to get exchange rates of supported currencies. Returns array of currencies.
+        Rates are served from the cache if the client has one.
         https://help.crypt.bot/crypto-pay-api#getExchangeRates
         """
 
-        response = await self._make_request(
+        if self._cache is None:
+            return await self._fetch_exchange_rates()
+
+        return list(await self._cache.get(key=APIMethod.GET_EXCHANGE_RATES, fetch=self._fetch_exchange_rates))
+
+    async def _fetch_exchange_rates(self) -> List[ExchangeRate]:
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_EXCHANGE_RATES),
+            api_method=APIMethod.GET_EXCHANGE_RATES,
+            result_type=List[ExchangeRate],
             headers=self.__headers
         )
 
-        return [ExchangeRate(**rate) for rate in response["result"]]
-
     async def get_currencies(self) -> List[Currency]:
         """
         Use this method to get a list of supported currencies. Returns array of currencies.
+        Currencies are served from the cache if the client has one.
         https://help.crypt.bot/crypto-pay-api#getCurrencies
         """
 
-        response = await self._make_request(
+        if self._cache is None:
+            return await self._fetch_currencies()
+
+        return list(await self._cache.get(key=APIMethod.GET_CURRENCIES, fetch=self._fetch_currencies))
+
+    async def _fetch_currencies(self) -> List[Currency]:
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_CURRENCIES),
+            api_method=APIMethod.GET_CURRENCIES,
+            result_type=List[Currency],
             headers=self.__headers
         )
 
-        return [Currency(**currency) for currency in response["result"]]
+    def get_cache_stats(self) -> Optional[CacheStats]:
+        """Returns reference data cache hits and misses, None if the client has no cache"""
+
+        if self._cache is None:
+            return None
+
+        return self._cache.get_stats()
 
     async def create_invoice(
             self,
-            amount: Union[int, float],
+            amount: Union[int, float, Decimal],
             asset: Optional[Union[Asset, str, List[Asset]]] = None,
             description: Optional[str] = None,
             hidden_message: Optional[str] = None,
@@ -207,19 +370,118 @@ class ICryptoPay(BaseClient):
         for key, value in params.copy().items():
             if isinstance(value, bool):
                 params[key] = str(value).lower()
+            if isinstance(value, (float, Decimal)):
+                params[key] = format_amount(value)
             if value is None:
                 del params[key]
 
-        print(params)
-
-        response = await self._make_request(
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.CREATE_INVOICE),
+            api_method=APIMethod.CREATE_INVOICE,
             params=params,
+            result_type=Invoice,
             headers=self.__headers
         )
 
-        return Invoice(**response["result"])
+    async def create_invoices(
+            self,
+            specs: Iterable[Dict[str, Any]],
+            concurrency: int = 10,
+            resume: bool = False
+    ) -> BulkInvoiceReport:
+        """
+        Create invoices in bulk and report per-invoice success or failure, keyed by payload
+
+        :param specs: create_invoice keyword arguments, every spec must have a unique payload
+        :param concurrency: Maximum number of simultaneous createInvoice requests, at least 1
+        :param resume: Skip specs whose payload already has an active or paid invoice
+        """
+
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+        results: Dict[str, BulkInvoiceResult] = {}
+
+        async for result in self.iter_create_invoices(specs=specs, concurrency=concurrency, resume=resume):
+            results[result.payload] = result
+
+        return BulkInvoiceReport(results=results)
+
+    async def iter_create_invoices(
+            self,
+            specs: Iterable[Dict[str, Any]],
+            concurrency: int = 10,
+            resume: bool = False
+    ) -> AsyncIterator[BulkInvoiceResult]:
+        """
+        Create invoices in bulk and yield results as they complete.
+        Requests are sent in the LOW rate limiter lane, so they don't delay other requests.
+        With `resume`, invoices of the app are scanned first and specs whose payload already has
+        an active or paid invoice are not created again, so an interrupted batch can be restarted
+
+        :param specs: create_invoice keyword arguments, every spec must have a unique payload
+        :param concurrency: Maximum number of simultaneous createInvoice requests, at least 1
+        :param resume: Skip specs whose payload already has an active or paid invoice
+        """
+
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+        if resume:
+            specs = list(specs)
+            existing: Dict[str, Invoice] = await self._find_invoices_by_payload(
+                payloads={spec["payload"] for spec in specs}
+            )
+
+            for payload, invoice in existing.items():
+                yield BulkInvoiceResult(payload=payload, invoice=invoice, resumed=True)
+
+            specs = [spec for spec in specs if spec["payload"] not in existing]
+
+        async def create(spec: Dict[str, Any]) -> BulkInvoiceResult:
+            try:
+                with RateLimiter.priority(RequestPriority.LOW):
+                    invoice: Invoice = await self.create_invoice(**spec)
+            except CodeErrorFactory as error:
+                return BulkInvoiceResult(payload=spec["payload"], error_code=error.code, error=error.name)
+            except (ClientError, asyncio.TimeoutError) as error:
+                return BulkInvoiceResult(payload=spec["payload"], error=repr(error))
+
+            return BulkInvoiceResult(payload=spec["payload"], invoice=invoice)
+
+        pending: Set[asyncio.Task] = set()
+        specs_iterator: Iterator[Dict[str, Any]] = iter(specs)
+
+        try:
+            while True:
+                for spec in islice(specs_iterator, concurrency - len(pending)):
+                    pending.add(asyncio.ensure_future(create(spec)))
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _find_invoices_by_payload(self, payloads: Set[str]) -> Dict[str, Invoice]:
+        """Scan invoices of the app for active or paid invoices with the payloads"""
+
+        found: Dict[str, Invoice] = {}
+
+        async for invoice in self.iter_invoices(page_size=1000, prefetch=True, lite=False):
+            if invoice.payload in payloads and invoice.status != InvoiceStatus.EXPIRED:
+                found.setdefault(invoice.payload, invoice)
+
+                if len(found) == len(payloads):
+                    break
+
+        return found
 
     async def get_invoices(
             self,
@@ -227,20 +489,29 @@ class ICryptoPay(BaseClient):
             invoice_ids: Optional[Union[List[int], int]] = None,
             status: Optional[Union[InvoiceStatus, str]] = None,
             offset: Optional[int] = None,
-            count: Optional[int] = None
-    ) -> Optional[Union[Invoice, List[Invoice]]]:
+            count: Optional[int] = None,
+            lite: Optional[bool] = None
+    ) -> Optional[Union[Invoice, List[Invoice], List[LiteInvoice]]]:
         """
         Use this method to get invoices of your app.
         https://help.crypt.bot/crypto-pay-api#getInvoices
 
         :param asset: Asset
-        :param invoice_ids: List of invoice IDs
+        :param invoice_ids: List of invoice IDs. Long lists are split into parallel requests
         :param status: Status
         :param offset: Offset
         :param count: Count
+        :param lite: Return lite models, the client default if not passed
         """
 
         if invoice_ids and isinstance(invoice_ids, list):
+            if len(invoice_ids) > ID_CHUNK_SIZE:
+                return await gather_chunks(
+                    fetch=lambda chunk: self.get_invoices(asset=asset, invoice_ids=chunk, status=status, lite=lite),
+                    keys=invoice_ids
+                )
+
+            count = count or len(invoice_ids)
             invoice_ids = ",".join(map(str, invoice_ids))
 
         params: Dict[str, Union[str, int]] = {
@@ -255,14 +526,56 @@ class ICryptoPay(BaseClient):
             if value is None:
                 del params[key]
 
-        response = await self._make_request(
+        page: ItemsPage[Invoice] = await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_INVOICES),
+            api_method=APIMethod.GET_INVOICES,
             params=params,
+            result_type=LiteResult(LiteInvoice, page=True) if self._is_lite(lite) else ItemsPage[Invoice],
             headers=self.__headers
         )
 
-        return [Invoice(**invoice) for invoice in response["result"]["items"]]
+        return page.items
+
+    async def get_invoice(self, invoice_id: int) -> Optional[Invoice]:
+        """
+        Get invoice by ID. Lookups made at the same time are sent as one getInvoices request
+
+        :param invoice_id: Invoice ID
+        """
+
+        return await self._invoice_loader.load(invoice_id)
+
+    async def _load_invoices(self, invoice_ids: List[int]) -> Dict[int, Invoice]:
+        return {invoice.invoice_id: invoice for invoice in await self.get_invoices(invoice_ids=invoice_ids)}
+
+    def iter_invoices(
+            self,
+            asset: Optional[Union[Asset, str]] = None,
+            status: Optional[Union[InvoiceStatus, str]] = None,
+            page_size: int = 100,
+            prefetch: bool = False,
+            limit: Optional[int] = None,
+            lite: Optional[bool] = None
+    ) -> AsyncIterator[Union[Invoice, LiteInvoice]]:
+        """
+        Iterate over invoices of your app page by page
+
+            async for invoice in crypto.iter_invoices(status=InvoiceStatus.PAID):
+                ...
+
+        :param asset: Asset
+        :param status: Status
+        :param page_size: Invoices per request, up to 1000
+        :param prefetch: Fetch the next page while the current one is consumed
+        :param limit: Stop after this number of invoices
+        :param lite: Yield lite models, the client default if not passed
+        """
+
+        async def fetch(offset: int, count: int) -> List[Invoice]:
+            return await self.get_invoices(asset=asset, status=status, offset=offset, count=count, lite=lite)
+
+        return paginate(fetch=fetch, page_size=page_size, prefetch=prefetch, limit=limit)
 
     async def delete_invoice(self, invoice_id: int) -> bool:
         """
@@ -272,20 +585,20 @@ class ICryptoPay(BaseClient):
 
         params: Dict[str, int] = {"invoice_id": invoice_id}
 
-        response = await self._make_request(
+        return await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.DELETE_INVOICE),
+            api_method=APIMethod.DELETE_INVOICE,
             params=params,
+            result_type=bool,
             headers=self.__headers
         )
 
-        return response["result"]
-
     async def transfer(
             self,
             user_id: int,
             asset: Union[Asset, str],
-            amount: Union[int, float],
+            amount: Union[int, float, Decimal],
             spend_id: Union[str, int],
             comment: Optional[str] = None,
             disable_send_notification: Optional[bool] = None,
@@ -314,36 +627,51 @@ class ICryptoPay(BaseClient):
         for key, value in params.copy().items():
             if isinstance(value, bool):
                 params[key] = str(value).lower()
+            if isinstance(value, (float, Decimal)):
+                params[key] = format_amount(value)
             if value is None:
                 del params[key]
 
-        response = await self._make_request(
-            method=HTTPMethod.GET,
-            url=self._build_request_url(method=APIMethod.TRANSFER),
-            params=params,
-            headers=self.__headers
+        return await self._spend(
+            asset=asset,
+            amount=amount,
+            send=lambda: self._make_request(
+                method=HTTPMethod.GET,
+                url=self._build_request_url(method=APIMethod.TRANSFER),
+                api_method=APIMethod.TRANSFER,
+                params=params,
+                result_type=Transfer,
+                headers=self.__headers
+            )
         )
 
-        return Transfer(**response["result"])
-
     async def get_transfers(
             self,
             asset: Optional[Union[Asset, str]] = None,
             transfer_ids: Optional[Union[List[int], int]] = None,
             offset: Optional[int] = None,
             count: Optional[int] = None,
-    ) -> List[Transfer]:
+            lite: Optional[bool] = None
+    ) -> Union[List[Transfer], List[LiteTransfer]]:
         """
         Use this method to get transfers created by your app.
         http://help.crypt.bot/crypto-pay-api#RjDU
 
         :param asset: Asset
-        :param transfer_ids: List of transfer IDs
+        :param transfer_ids: List of transfer IDs. Long lists are split into parallel requests
         :param offset: Offset
         :param count: Count
+        :param lite: Return lite models, the client default if not passed
         """
 
         if transfer_ids and isinstance(transfer_ids, list):
+            if len(transfer_ids) > ID_CHUNK_SIZE:
+                return await gather_chunks(
+                    fetch=lambda chunk: self.get_transfers(asset=asset, transfer_ids=chunk, lite=lite),
+                    keys=transfer_ids
+                )
+
+            count = count or len(transfer_ids)
             transfer_ids = ",".join(map(str, transfer_ids))
 
         params: Dict[str, Union[str, int]] = {
@@ -357,19 +685,56 @@ class ICryptoPay(BaseClient):
             if value is None:
                 del params[key]
 
-        response = await self._make_request(
+        page: ItemsPage[Transfer] = await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_TRANSFERS),
+            api_method=APIMethod.GET_TRANSFERS,
             params=params,
+            result_type=LiteResult(LiteTransfer, page=True) if self._is_lite(lite) else ItemsPage[Transfer],
             headers=self.__headers
         )
 
-        return [Transfer(**transfer) for transfer in response["result"]["items"]]
+        return page.items
+
+    async def get_transfer(self, transfer_id: int) -> Optional[Transfer]:
+        """
+        Get transfer by ID. Lookups made at the same time are sent as one getTransfers request
+
+        :param transfer_id: Transfer ID
+        """
+
+        return await self._transfer_loader.load(transfer_id)
+
+    async def _load_transfers(self, transfer_ids: List[int]) -> Dict[int, Transfer]:
+        return {transfer.transfer_id: transfer for transfer in await self.get_transfers(transfer_ids=transfer_ids)}
+
+    def iter_transfers(
+            self,
+            asset: Optional[Union[Asset, str]] = None,
+            page_size: int = 100,
+            prefetch: bool = False,
+            limit: Optional[int] = None,
+            lite: Optional[bool] = None
+    ) -> AsyncIterator[Union[Transfer, LiteTransfer]]:
+        """
+        Iterate over transfers created by your app page by page
+
+        :param asset: Asset
+        :param page_size: Transfers per request, up to 1000
+        :param prefetch: Fetch the next page while the current one is consumed
+        :param limit: Stop after this number of transfers
+        :param lite: Yield lite models, the client default if not passed
+        """
+
+        async def fetch(offset: int, count: int) -> List[Transfer]:
+            return await self.get_transfers(asset=asset, offset=offset, count=count, lite=lite)
+
+        return paginate(fetch=fetch, page_size=page_size, prefetch=prefetch, limit=limit)
 
     async def create_check(
             self,
             asset: Union[Asset, str],
-            amount: Union[int, float],
+            amount: Union[int, float, Decimal],
             pin_to_user_id: Optional[int] = None,
             pin_to_username: Optional[str] = None,
     ) -> Check:
@@ -391,38 +756,54 @@ class ICryptoPay(BaseClient):
         }
 
         for key, value in params.copy().items():
+            if isinstance(value, (float, Decimal)):
+                params[key] = format_amount(value)
             if value is None:
                 del params[key]
 
-        response = await self._make_request(
-            method=HTTPMethod.GET,
-            url=self._build_request_url(method=APIMethod.CREATE_CHECK),
-            params=params,
-            headers=self.__headers
+        return await self._spend(
+            asset=asset,
+            amount=amount,
+            send=lambda: self._make_request(
+                method=HTTPMethod.GET,
+                url=self._build_request_url(method=APIMethod.CREATE_CHECK),
+                api_method=APIMethod.CREATE_CHECK,
+                params=params,
+                result_type=Check,
+                headers=self.__headers
+            ),
+            hold=True
         )
 
-        return Check(**response["result"])
-
     async def get_checks(
             self,
             asset: Optional[Union[Asset, str]] = None,
             check_ids: Optional[Union[List[int], int]] = None,
             status: Optional[Union[CheckStatus, str]] = None,
             offset: Optional[int] = None,
-            count: Optional[int] = None
-    ) -> List[Check]:
+            count: Optional[int] = None,
+            lite: Optional[bool] = None
+    ) -> Union[List[Check], List[LiteCheck]]:
         """
         Use this method to get checks created by your app
         http://help.crypt.bot/crypto-pay-api#nIwG
 
         :param asset: Asset
-        :param check_ids: List of check IDs
+        :param check_ids: List of check IDs. Long lists are split into parallel requests
         :param status: Status
         :param offset: Offset
         :param count: Count
+        :param lite: Return lite models, the client default if not passed
         """
 
         if check_ids and isinstance(check_ids, list):
+            if len(check_ids) > ID_CHUNK_SIZE:
+                return await gather_chunks(
+                    fetch=lambda chunk: self.get_checks(asset=asset, check_ids=chunk, status=status, lite=lite),
+                    keys=check_ids
+                )
+
+            count = count or len(check_ids)
             check_ids = ",".join(map(str, check_ids))
 
         params: Dict[str, Union[str, int]] = {
@@ -437,14 +818,53 @@ class ICryptoPay(BaseClient):
             if value is None:
                 del params[key]
 
-        response = await self._make_request(
+        page: ItemsPage[Check] = await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.GET_CHECKS),
+            api_method=APIMethod.GET_CHECKS,
             params=params,
+            result_type=LiteResult(LiteCheck, page=True) if self._is_lite(lite) else ItemsPage[Check],
             headers=self.__headers
         )
 
-        return [Check(**check) for check in response["result"]["items"]]
+        return page.items
+
+    async def get_check(self, check_id: int) -> Optional[Check]:
+        """
+        Get check by ID. Lookups made at the same time are sent as one getChecks request
+
+        :param check_id: Check ID
+        """
+
+        return await self._check_loader.load(check_id)
+
+    async def _load_checks(self, check_ids: List[int]) -> Dict[int, Check]:
+        return {check.check_id: check for check in await self.get_checks(check_ids=check_ids)}
+
+    def iter_checks(
+            self,
+            asset: Optional[Union[Asset, str]] = None,
+            status: Optional[Union[CheckStatus, str]] = None,
+            page_size: int = 100,
+            prefetch: bool = False,
+            limit: Optional[int] = None,
+            lite: Optional[bool] = None
+    ) -> AsyncIterator[Union[Check, LiteCheck]]:
+        """
+        Iterate over checks created by your app page by page
+
+        :param asset: Asset
+        :param status: Status
+        :param page_size: Checks per request, up to 1000
+        :param prefetch: Fetch the next page while the current one is consumed
+        :param limit: Stop after this number of checks
+        :param lite: Yield lite models, the client default if not passed
+        """
+
+        async def fetch(offset: int, count: int) -> List[Check]:
+            return await self.get_checks(asset=asset, status=status, offset=offset, count=count, lite=lite)
+
+        return paginate(fetch=fetch, page_size=page_size, prefetch=prefetch, limit=limit)
 
     async def delete_check(self, check_id: int) -> bool:
         """
@@ -454,82 +874,199 @@ class ICryptoPay(BaseClient):
         :param check_id: Check ID
         """
 
-        response = await self._make_request(
+        deleted: bool = await self._make_request(
             method=HTTPMethod.GET,
             url=self._build_request_url(method=APIMethod.DELETE_CHECK),
+            api_method=APIMethod.DELETE_CHECK,
             params={"check_id": check_id},
+            result_type=bool,
             headers=self.__headers
         )
 
-        return response["result"]
+        # The check amount is returned from onhold to available
+        if self._balance_tracker is not None:
+            self._balance_tracker.invalidate()
 
-    def __verify_signature(self, body_text: str, crypto_pay_signature: str) -> bool:
+        return deleted
+
+    def __verify_signature(self, body: bytes, crypto_pay_signature: str) -> bool:
         """
         Check the signature for webhook updates
         https://help.crypt.bot/crypto-pay-api#verifying-webhook-updates
 
-        :param body_text: Body text
+        :param body: Raw request body
         :param crypto_pay_signature: Crypto-Pay-Api-Signature header
         """
 
-        token: bytes = sha256(string=self.__token.encode("UTF-8")).digest()
-        signature: str = HMAC(
-            key=token,
-            msg=body_text.encode("UTF-8"),
-            digestmod=sha256
-        ).hexdigest()
+        signature: str = HMAC(key=self.__webhook_key, msg=body, digestmod=sha256).hexdigest()
 
-        return signature == crypto_pay_signature
+        return compare_digest(signature.encode("UTF-8"), crypto_pay_signature.encode("UTF-8"))
 
-    async def get_updates(self, request: Request) -> JSONResponse:
-        """WebHook updates route"""
+    async def get_updates(self, request: "Request") -> "JSONResponse":
+        """WebHook updates route for Starlette and FastAPI"""
         update: Optional[Update] = await self.verify_update(request=request)
 
         if update:
-            for handler in self.__handlers:
-                handler(update)
+            await self.feed_update(update)
 
         return self.get_ok_response()
 
-    async def verify_update(self, request: Request) -> Optional[Update]:
+    def get_asgi_app(self, path: Optional[str] = None) -> "WebhookApp":
+        """
+        Returns ASGI application receiving webhooks, doesn't require Starlette or FastAPI
+
+        :param path: Accept webhooks only on this path, any path if not passed
+        """
+
+        from icryptopay.webhook.asgi import WebhookApp
+
+        return WebhookApp(client=self, path=path)
+
+    async def feed_update(self, update: Update) -> None:
+        """
+        Pass verified update to pay handlers
+
+        :param update: Webhook update
+        """
+
+        # A paid invoice adds to the balance
+        if self._balance_tracker is not None:
+            self._balance_tracker.invalidate()
+
+        await self._dispatcher.feed_update(update)
+
+    async def verify_update(self, request: "Request") -> Optional[Update]:
         """Verify Webhook update"""
 
-        body: Dict[str, Any] = await request.json()
-        body_text: str = (await request.body()).decode("UTF-8")
-        crypto_pay_signature: str = request.headers.get("Crypto-Pay-Api-Signature", "No value")
-        signature: bool = self.__verify_signature(
-            body_text=body_text,
-            crypto_pay_signature=crypto_pay_signature
+        return self.parse_update(
+            body=await request.body(),
+            crypto_pay_signature=request.headers.get("Crypto-Pay-Api-Signature", "")
         )
 
-        if signature:
-            return Update(**body)
+    def parse_update(self, body: bytes, crypto_pay_signature: str) -> Optional[Update]:
+        """
+        Verify the signature of a raw webhook body and validate it into Update.
+        Returns None if the signature doesn't match, raises ValueError if the signed body is not an update
+
+        :param body: Raw request body
+        :param crypto_pay_signature: Crypto-Pay-Api-Signature header
+        """
+
+        if not self.__verify_signature(body=body, crypto_pay_signature=crypto_pay_signature):
+            return None
+
+        return self.validate_update(body)
+
+    def validate_update(self, body: bytes) -> Update:
+        """
+        Validate a raw webhook body into Update without checking the signature,
+        for bodies already verified by the caller, e.g. CryptoPayPool.
+        Raises ValueError if the body is not an update
+
+        :param body: Raw request body
+        """
+
+        if self._decoder is None:
+            return Update.model_validate_json(body, context=self._validation_context)
+
+        return Update.model_validate(self._decoder.decode(body), context=self._validation_context)
 
     @staticmethod
-    def get_ok_response() -> JSONResponse:
-        return JSONResponse(content={"msg": "Status OK!"})
+    def get_ok_response() -> "JSONResponse":
+        from icryptopay.webhook.starlette_adapter import get_ok_response
+
+        return get_ok_response()
 
     async def get_amount_by_fiat(
             self,
-            summ: Union[int, float],
+            summ: Union[int, float, Decimal],
             asset: Union[Asset, str],
             target: str
-    ) -> Union[int, float]:
-        """Get amount in crypto by fiat summ"""
+    ) -> Union[int, float, Decimal]:
+        """
+        Get amount in crypto by fiat summ.
+        Returns Decimal rounded to the asset precision if the client uses Decimal
+        """
+
+        rate_table: RateTable = await self.get_rate_table()
+        amount: Decimal = rate_table.convert(amount=summ, source=target, target=asset)
 
-        rates = await self.get_exchange_rates()
-        rate = get_rate(source=asset, target=target, rates=rates)
-        fiat_summ = get_rate_summ(summ=summ, rate=rate)
-        return fiat_summ
+        if self._use_decimal:
+            return await self.quantize_amount(amount=amount, asset=asset)
+
+        return float(amount)
+
+    async def quantize_amount(
+            self,
+            amount: Union[int, float, str, Decimal],
+            asset: Union[Asset, str],
+            rounding: str = ROUND_HALF_UP
+    ) -> Decimal:
+        """
+        Round amount to the asset precision from getCurrencies
+
+        :param amount: Amount
+        :param asset: Asset or fiat code
+        :param rounding: Decimal rounding mode
+        """
+
+        for currency in await self.get_currencies():
+            if currency.code == asset:
+                return quantize_amount(amount=amount, decimals=currency.decimals, rounding=rounding)
+
+        raise ValueError(f"Unknown currency {asset}")
+
+    async def get_rate_table(self) -> RateTable:
+        """
+        Returns exchange rates indexed by (source, target).
+        If the client has a cache, the table is built from the cached getExchangeRates result
+        and rebuilt only when the rates are refreshed
+        """
+
+        if self._cache is None:
+            return RateTable(rates=await self._fetch_exchange_rates())
+
+        rates: List[ExchangeRate] = await self._cache.get(
+            key=APIMethod.GET_EXCHANGE_RATES,
+            fetch=self._fetch_exchange_rates
+        )
+
+        if self._rate_table is None or self._rate_table[0] is not rates:
+            self._rate_table = (rates, RateTable(rates=rates))
+
+        return self._rate_table[1]
 
     def register_pay_handler(self, func: Callable) -> None:
         """Register handler when invoice paid"""
 
-        self.__handlers.append(func)
+        self._dispatcher.register(func)
 
     def pay_handler(self, func: Callable = None):
         def decorator(handler):
-            self.__handlers.append(handler)
-            return handler
+            return self._dispatcher.register(handler)
 
         return decorator
+
+    def get_balance_tracker_stats(self) -> Optional[BalanceTrackerStats]:
+        """Returns balance refreshes and locally rejected payouts, None if the client has no balance tracker"""
+
+        if self._balance_tracker is None:
+            return None
+
+        return self._balance_tracker.get_stats()
+
+    def get_dispatcher_stats(self) -> DispatcherStats:
+        """Returns webhook queue depth and pay handlers latency"""
+
+        return self._dispatcher.get_stats()
+
+    async def close(self) -> None:
+        """Process queued webhook updates and pending lookups, close the dedup store and the session"""
+
+        await self._dispatcher.close()
+        await asyncio.gather(
+            self._invoice_loader.close(),
+            self._transfer_loader.close(),
+            self._check_loader.close()
+        )
+        await super().close()
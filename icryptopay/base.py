@@ -1,25 +1,134 @@
 import asyncio
+import logging
 import ssl
-from asyncio import AbstractEventLoop
-from typing import Optional
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
 
-import certifi
-from aiohttp import ClientSession, TCPConnector
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionQueuedEndParams,
+    hdrs
+)
 from aiohttp.typedefs import StrOrURL
 
 from icryptopay.enums.http import HTTPMethod
-from icryptopay.exceptions import CryptoPayAPIError
+from icryptopay.enums.method import APIMethod
+from icryptopay.exceptions import CodeErrorFactory, CryptoPayAPIError
+from icryptopay.types.lite import LiteResult
+from icryptopay.types.response import APIResponse
+from icryptopay.types.stats import PoolStats, RateLimiterStats
+from icryptopay.utils.decoder import JSONDecoder, get_default_decoder, get_response_adapter
+from icryptopay.utils.instrumentation import (
+    Instrumentation,
+    InstrumentationArg,
+    RequestTrace,
+    get_trace_config,
+    normalize_instrumentation
+)
+from icryptopay.utils.ratelimit import RateLimiter
+from icryptopay.utils.retry import RetryPolicy, parse_retry_after
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context() -> ssl.SSLContext:
+    """SSL context with certifi CA bundle. Built once per process"""
+
+    import certifi
+
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def _count_connections(connector: Any, attribute: str, per_host: bool = False) -> Optional[int]:
+    """Counts items of a private connector attribute, None if this aiohttp version doesn't have it"""
+
+    value: Any = getattr(connector, attribute, None)
+
+    if value is None:
+        return None
+
+    try:
+        return sum(len(items) for items in value.values()) if per_host else len(value)
+    except (AttributeError, TypeError):
+        return None
 
 
 class BaseClient:
     """Base aiohttp client"""
 
     __session: Optional[ClientSession] = None
-    __loop: Optional[AbstractEventLoop] = None
 
-    def __init__(self) -> None:
-        self._loop = asyncio.get_event_loop()
-        self._session = None
+    def __init__(
+            self,
+            pool_size: int = 100,
+            pool_size_per_host: int = 0,
+            keepalive_timeout: float = 15.0,
+            dns_cache_ttl: Optional[int] = 10,
+            timeout: Optional[ClientTimeout] = None,
+            session: Optional[ClientSession] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            use_decimal: bool = False,
+            decoder: Optional[JSONDecoder] = None,
+            instrumentation: InstrumentationArg = None
+    ) -> None:
+        """
+        :param pool_size: Total number of simultaneous connections, 0 for no limit
+        :param pool_size_per_host: Number of simultaneous connections to one host, 0 for no limit
+        :param keepalive_timeout: Seconds an idle connection is kept in the pool
+        :param dns_cache_ttl: Seconds resolved addresses are cached, None to cache forever
+        :param timeout: HTTP timeouts, aiohttp defaults if not passed
+        :param session: Shared session. It is used as is and is not closed by the client
+        :param retry_policy: Retry policy, idempotent methods are retried up to 3 times by default
+        :param rate_limiter: Client-side rate limiter, requests are not limited if not passed
+        :param use_decimal: Parse amounts and rates to Decimal
+        :param decoder: Response body decoder. By default pydantic validates the body straight from bytes
+        :param instrumentation: Request hooks, e.g. icryptopay.contrib.prometheus.PrometheusInstrumentation.
+        Network timings need the client-created session
+        """
+
+        self._session = session
+        self._owns_session = session is None
+
+        self._pool_size = pool_size
+        self._pool_size_per_host = pool_size_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._timeout = timeout
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._rate_limiter = rate_limiter
+
+        self._use_decimal = use_decimal
+        self._validation_context: Optional[Dict[str, Any]] = {"use_decimal": True} if use_decimal else None
+        self._decoder: Optional[JSONDecoder] = decoder if decoder is not None else get_default_decoder(use_decimal)
+        self._dict_decoder: JSONDecoder = self._decoder or JSONDecoder()
+        self._instrumentation: Tuple[Instrumentation, ...] = normalize_instrumentation(instrumentation)
+
+        self._queued_count = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+
+    @property
+    def use_decimal(self) -> bool:
+        """Amounts and rates are parsed to Decimal"""
+
+        return self._use_decimal
+
+    @property
+    def validation_context(self) -> Optional[Dict[str, Any]]:
+        """pydantic validation context of the client, for validating stored models the way responses are"""
+
+        return self._validation_context
 
     def get_session(self, **kwargs) -> ClientSession:
         """Get cached session. One session per instance"""
@@ -27,28 +136,282 @@ class BaseClient:
         if isinstance(self._session, ClientSession) and not self._session.closed:
             return self._session
 
-        ssl_context: ssl.SSLContext = ssl.create_default_context(cafile=certifi.where())
-        connector: TCPConnector = TCPConnector(ssl=ssl_context)
+        connector: TCPConnector = TCPConnector(
+            ssl=get_ssl_context(),
+            limit=self._pool_size,
+            limit_per_host=self._pool_size_per_host,
+            keepalive_timeout=self._keepalive_timeout,
+            ttl_dns_cache=self._dns_cache_ttl,
+            use_dns_cache=True
+        )
+
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+
+        kwargs.setdefault("trace_configs", []).append(self._get_pool_trace_config())
+
+        if self._instrumentation:
+            kwargs["trace_configs"].append(get_trace_config())
 
         self._session = ClientSession(connector=connector, **kwargs)
+        self._owns_session = True
 
         return self._session
 
-    async def _make_request(self, url: StrOrURL, method: str = HTTPMethod.GET, **kwargs) -> dict:
+    def _get_pool_trace_config(self) -> TraceConfig:
+        """Trace config measuring the time requests wait for a free pool connection"""
+
+        async def on_queued_start(session: ClientSession, context: SimpleNamespace, params) -> None:
+            context.queued_at = time.monotonic()
+
+        async def on_queued_end(
+                session: ClientSession,
+                context: SimpleNamespace,
+                params: TraceConnectionQueuedEndParams
+        ) -> None:
+            wait: float = time.monotonic() - context.queued_at
+
+            self._queued_count += 1
+            self._queue_wait_total += wait
+            self._queue_wait_max = max(self._queue_wait_max, wait)
+
+        trace_config: TraceConfig = TraceConfig()
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+
+        return trace_config
+
+    def get_pool_stats(self) -> PoolStats:
+        """
+        Returns connection pool usage of the current session.
+        limit and limit_per_host come from the public connector API. aiohttp has no public API for
+        in_use, idle and waiting, so they are best-effort counts of connector internals
+        and are None if the installed aiohttp keeps them differently
+        """
+
+        connector = self._session.connector if isinstance(self._session, ClientSession) else None
+        in_use: Optional[int]
+        idle: Optional[int]
+        waiting: Optional[int]
+
+        if connector is None or connector.closed:
+            in_use, idle, waiting = 0, 0, 0
+        else:
+            in_use = _count_connections(connector, "_acquired")
+            idle = _count_connections(connector, "_conns", per_host=True)
+            waiting = _count_connections(connector, "_waiters", per_host=True)
+
+        return PoolStats(
+            limit=connector.limit if connector else self._pool_size,
+            limit_per_host=connector.limit_per_host if connector else self._pool_size_per_host,
+            in_use=in_use,
+            idle=idle,
+            waiting=waiting,
+            queued_count=self._queued_count,
+            queue_wait_total=self._queue_wait_total,
+            queue_wait_max=self._queue_wait_max
+        )
+
+    def get_rate_limiter_stats(self) -> Optional[RateLimiterStats]:
+        """Returns rate limiter queue depth and waiting time, None if requests are not limited"""
+
+        if self._rate_limiter is None:
+            return None
+
+        return self._rate_limiter.get_stats()
+
+    async def _make_request(
+            self,
+            url: StrOrURL,
+            method: str = HTTPMethod.GET,
+            api_method: Optional[APIMethod] = None,
+            result_type: Any = None,
+            **kwargs
+    ) -> Any:
         """
-        Make a request.
+        Make a request. Failed attempts are retried according to the retry policy
             :param method: HTTP Method
             :param url: endpoint link
+            :param api_method: API method, used to decide if the request can be retried
+            :param result_type: Type of the result. If passed, the result is validated and returned
+            instead of the response dict
             :param kwargs: data, params, json and other...
             :return: status and result or exception
         """
 
+        if not self._instrumentation:
+            return await self._retry_request(
+                url=url,
+                method=method,
+                api_method=api_method,
+                result_type=result_type,
+                **kwargs
+            )
+
+        trace: RequestTrace = RequestTrace(api_method=api_method, http_method=method, url=str(url))
+        self._call_hooks("on_request_start", trace)
+
+        try:
+            result: Any = await self._retry_request(
+                url=url,
+                method=method,
+                api_method=api_method,
+                result_type=result_type,
+                trace=trace,
+                **kwargs
+            )
+        except (Exception, asyncio.CancelledError) as error:
+            trace.finish(error=error)
+            self._call_hooks("on_request_error", trace, error)
+            raise
+
+        trace.finish()
+        self._call_hooks("on_request_end", trace)
+
+        return result
+
+    def _call_hooks(self, hook: str, *args: Any) -> None:
+        for instrumentation in self._instrumentation:
+            try:
+                getattr(instrumentation, hook)(*args)
+            except Exception:
+                logger.exception("Instrumentation hook %s failed", hook)
+
+    async def _retry_request(
+            self,
+            url: StrOrURL,
+            method: str,
+            api_method: Optional[APIMethod] = None,
+            result_type: Any = None,
+            trace: Optional[RequestTrace] = None,
+            **kwargs
+    ) -> Any:
+        """Send the request until it succeeds or the retry policy gives up"""
+
+        self._retry_policy.budget.record_request()
+        attempt: int = 0
+
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(api_method=api_method)
+
+            if trace is not None:
+                trace.start_attempt()
+
+            try:
+                return await self._send_request(url=url, method=method, result_type=result_type, trace=trace, **kwargs)
+            except (CodeErrorFactory, ClientError, asyncio.TimeoutError) as error:
+                if self._rate_limiter is not None and getattr(error, "code", None) == 429:
+                    self._rate_limiter.penalize(api_method=api_method, seconds=error.retry_after or 1.0)
+
+                if not self._retry_policy.should_retry(api_method=api_method, error=error, attempt=attempt):
+                    raise
+
+                delay: float = self._retry_policy.get_delay(
+                    attempt=attempt,
+                    retry_after=getattr(error, "retry_after", None)
+                )
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_request(
+            self,
+            url: StrOrURL,
+            method: str,
+            result_type: Any = None,
+            trace: Optional[RequestTrace] = None,
+            **kwargs
+    ) -> Any:
+        """Make a single request attempt"""
+
         session: ClientSession = self.get_session()
 
+        if trace is not None:
+            kwargs["trace_request_ctx"] = trace
+
         async with session.request(method=method, url=url, **kwargs) as response:
-            response = await response.json(content_type="application/json")
+            retry_after: Optional[float] = parse_retry_after(response.headers.get(hdrs.RETRY_AFTER))
+            body: bytes = await response.read()
+
+        if trace is not None:
+            trace.status = response.status
+            trace.response_size = len(body)
+
+        try:
+            return self._parse_response(
+                body=body,
+                status=response.status,
+                reason=response.reason,
+                result_type=result_type,
+                trace=trace
+            )
+        except CodeErrorFactory as error:
+            error.retry_after = retry_after
+            raise
+
+    def _parse_response(
+            self,
+            body: bytes,
+            status: int,
+            reason: Optional[str],
+            result_type: Any = None,
+            trace: Optional[RequestTrace] = None
+    ) -> Any:
+        """
+        Decode and validate response body
+
+        :param body: Response body
+        :param status: HTTP status
+        :param reason: HTTP reason, used as error name if the body is not a Crypto Pay response
+        :param result_type: Type of the result or LiteResult, the response dict is returned if not passed
+        :param trace: Trace receiving decode and validate timings
+        """
+
+        started_at: float = time.perf_counter() if trace is not None else 0.0
+        decoded_at: Optional[float] = None
+
+        try:
+            if result_type is None or isinstance(result_type, LiteResult):
+                data: Any = self._dict_decoder.decode(body)
+
+                if trace is not None:
+                    decoded_at = time.perf_counter()
+
+                response_dict: dict = self._validate_response(data)
+                result: Any = (
+                    response_dict if result_type is None
+                    else result_type.parse(response_dict["result"], use_decimal=self._use_decimal)
+                )
+            else:
+                adapter: "TypeAdapter" = get_response_adapter(result_type)
+
+                if self._decoder is None:
+                    response: APIResponse = adapter.validate_json(body, context=self._validation_context)
+                else:
+                    data = self._decoder.decode(body)
+
+                    if trace is not None:
+                        decoded_at = time.perf_counter()
+
+                    response = adapter.validate_python(data, context=self._validation_context)
+
+                if not response.ok:
+                    raise CryptoPayAPIError.exception_to_raise(code=response.error.code, name=response.error.name)
+
+                result = response.result
+        except ValueError:
+            if status < 400:
+                raise
+
+            raise CryptoPayAPIError.exception_to_raise(code=status, name=reason)
+
+        if trace is not None:
+            validated_at: float = time.perf_counter()
+            trace.decode_time = None if decoded_at is None else decoded_at - started_at
+            trace.validate_time = validated_at - (decoded_at or started_at)
 
-        return self._validate_response(response)
+        return result
 
     @staticmethod
     def _validate_response(response: dict) -> dict:
@@ -57,16 +420,16 @@ class BaseClient:
         if not response.get("ok"):
             name = response["error"]["name"]
             code = response["error"]["code"]
-            raise CryptoPayAPIError(code, name)
+            raise CryptoPayAPIError.exception_to_raise(code=code, name=name)
         return response
 
     async def close(self):
-        """Close the session graceful."""
+        """Close the session graceful. Shared sessions are left open"""
 
         if not isinstance(self._session, ClientSession):
             return
 
-        if self._session.closed:
+        if self._session.closed or not self._owns_session:
             return
 
         await self._session.close()
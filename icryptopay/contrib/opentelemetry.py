@@ -0,0 +1,92 @@
+from typing import Any, Dict, Optional
+
+from icryptopay.utils.instrumentation import Instrumentation, RequestTrace
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Creates a client span for every API call and records call duration.
+    Requires `pip install ICryptoPay[opentelemetry]`
+
+        crypto = ICryptoPay(token="TOKEN", instrumentation=OpenTelemetryInstrumentation())
+    """
+
+    def __init__(self, tracer_provider: Optional[Any] = None, meter_provider: Optional[Any] = None) -> None:
+        """
+        :param tracer_provider: TracerProvider, the global provider if not passed
+        :param meter_provider: MeterProvider, the global provider if not passed
+        """
+
+        from opentelemetry import metrics, trace
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        self._span_kind = SpanKind.CLIENT
+        self._status = Status
+        self._status_code = StatusCode
+
+        self.tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider)
+        self.meter = metrics.get_meter(__name__, meter_provider=meter_provider)
+        self.duration = self.meter.create_histogram(
+            name="icryptopay.request.duration",
+            unit="s",
+            description="Crypto Pay API call duration including retries"
+        )
+
+        self._spans: Dict[int, Any] = {}
+
+    def on_request_start(self, trace: RequestTrace) -> None:
+        self._spans[id(trace)] = self.tracer.start_span(
+            name=f"CryptoPay {trace.method_name}",
+            kind=self._span_kind,
+            attributes={
+                "http.request.method": str(trace.http_method),
+                "url.full": trace.url,
+                "icryptopay.method": trace.method_name,
+            }
+        )
+
+    def on_request_end(self, trace: RequestTrace) -> None:
+        self._end_span(trace)
+
+    def on_request_error(self, trace: RequestTrace, error: BaseException) -> None:
+        span: Optional[Any] = self._spans.get(id(trace))
+
+        if span is not None:
+            span.record_exception(error)
+            span.set_status(self._status(self._status_code.ERROR, trace.error_name))
+
+        self._end_span(trace)
+
+    def _end_span(self, trace: RequestTrace) -> None:
+        attributes: Dict[str, Any] = {"icryptopay.method": trace.method_name}
+
+        if trace.error is not None:
+            attributes["error.type"] = trace.error_name
+
+        self.duration.record(trace.duration, attributes=attributes)
+
+        span: Optional[Any] = self._spans.pop(id(trace), None)
+
+        if span is None:
+            return
+
+        timings: Dict[str, Optional[float]] = {
+            "icryptopay.dns_time": trace.dns_time,
+            "icryptopay.connect_time": trace.connect_time,
+            "icryptopay.ttfb": trace.ttfb,
+            "icryptopay.decode_time": trace.decode_time,
+            "icryptopay.validate_time": trace.validate_time,
+        }
+
+        if trace.status is not None:
+            span.set_attribute("http.response.status_code", trace.status)
+
+        span.set_attribute("icryptopay.attempts", trace.attempts)
+        span.set_attribute("http.request.body.size", trace.request_size)
+        span.set_attribute("http.response.body.size", trace.response_size)
+
+        for name, value in timings.items():
+            if value is not None:
+                span.set_attribute(name, value)
+
+        span.end()
@@ -0,0 +1,100 @@
+from typing import Any, Optional, Sequence, Tuple
+
+from icryptopay.utils.instrumentation import Instrumentation, RequestTrace
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES: Tuple[str, ...] = ("dns", "connect", "ttfb", "decode", "validate")
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """
+    Exports request metrics to Prometheus. Requires `pip install ICryptoPay[prometheus]`
+
+        crypto = ICryptoPay(token="TOKEN", instrumentation=PrometheusInstrumentation())
+    """
+
+    def __init__(
+            self,
+            registry: Optional[Any] = None,
+            namespace: str = "icryptopay",
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        """
+        :param registry: prometheus_client CollectorRegistry, the default registry if not passed
+        :param namespace: Metric name prefix
+        :param buckets: Latency histogram buckets in seconds
+        """
+
+        from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+        registry = registry or REGISTRY
+
+        self.requests = Counter(
+            "requests_total",
+            "Crypto Pay API calls by method and HTTP status",
+            ["method", "status"],
+            namespace=namespace,
+            registry=registry
+        )
+        self.errors = Counter(
+            "errors_total",
+            "Failed Crypto Pay API calls by method and error name",
+            ["method", "error"],
+            namespace=namespace,
+            registry=registry
+        )
+        self.retries = Counter(
+            "retries_total",
+            "Retried Crypto Pay API attempts",
+            ["method"],
+            namespace=namespace,
+            registry=registry
+        )
+        self.in_flight = Gauge(
+            "requests_in_flight",
+            "Crypto Pay API calls in progress",
+            ["method"],
+            namespace=namespace,
+            registry=registry
+        )
+        self.duration = Histogram(
+            "request_duration_seconds",
+            "Crypto Pay API call duration including retries",
+            ["method"],
+            namespace=namespace,
+            registry=registry,
+            buckets=buckets
+        )
+        self.phases = Histogram(
+            "request_phase_seconds",
+            "Duration of the last attempt phases: dns, connect, ttfb, decode and validate",
+            ["method", "phase"],
+            namespace=namespace,
+            registry=registry,
+            buckets=buckets
+        )
+
+    def on_request_start(self, trace: RequestTrace) -> None:
+        self.in_flight.labels(method=trace.method_name).inc()
+
+    def on_request_end(self, trace: RequestTrace) -> None:
+        self._observe(trace)
+
+    def on_request_error(self, trace: RequestTrace, error: BaseException) -> None:
+        self.errors.labels(method=trace.method_name, error=trace.error_name).inc()
+        self._observe(trace)
+
+    def _observe(self, trace: RequestTrace) -> None:
+        method: str = trace.method_name
+
+        self.in_flight.labels(method=method).dec()
+        self.requests.labels(method=method, status=str(trace.status or 0)).inc()
+        self.duration.labels(method=method).observe(trace.duration)
+
+        if trace.retries:
+            self.retries.labels(method=method).inc(trace.retries)
+
+        for phase, value in zip(PHASES, (trace.dns_time, trace.connect_time, trace.ttfb,
+                                         trace.decode_time, trace.validate_time)):
+            if value is not None:
+                self.phases.labels(method=method, phase=phase).observe(value)
@@ -0,0 +1,2 @@
+from .server import CryptoPayEmulator
+from .state import EmulatorError, EmulatorState
@@ -0,0 +1,47 @@
+"""
+Run the Crypto Pay API emulator
+
+    python -m icryptopay.emulator --port 8080 --token TOKEN --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import logging
+
+from aiohttp import web
+
+from icryptopay.emulator.server import CryptoPayEmulator
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Local Crypto Pay API emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token", default="emulator", help="API token accepted by the emulator")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every response is delayed")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Random extra delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 5xx")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second")
+    parser.add_argument("--rate-burst", type=int, default=None, help="Rate limit bucket capacity")
+    parser.add_argument("--webhook-url", default=None, help="URL receiving signed invoice_paid updates")
+    parser.add_argument("--auto-pay-after", type=float, default=None, help="Pay invoices after N seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    args: argparse.Namespace = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    emulator: CryptoPayEmulator = CryptoPayEmulator(
+        token=args.token,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        webhook_url=args.webhook_url,
+        auto_pay_after=args.auto_pay_after,
+        seed=args.seed
+    )
+    web.run_app(emulator.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from hashlib import sha256
+from hmac import HMAC
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from aiohttp import ClientError, ClientSession, hdrs, web
+
+from icryptopay.emulator.state import EmulatorError, EmulatorState
+from icryptopay.enums.method import APIMethod
+from icryptopay.utils.ratelimit import TokenBucket
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+TOKEN_HEADER: str = "Crypto-Pay-API-Token"
+SIGNATURE_HEADER: str = "Crypto-Pay-API-Signature"
+
+
+class CryptoPayEmulator:
+    """
+    Local Crypto Pay API server with in-memory state, for load tests and offline integration tests
+
+        async with CryptoPayEmulator(token="TOKEN") as emulator:
+            crypto = ICryptoPay(token="TOKEN", base_url=emulator.base_url)
+            invoice = await crypto.create_invoice(asset="TON", amount=1)
+            await emulator.pay_invoice(invoice.invoice_id)
+    """
+
+    def __init__(
+            self,
+            token: str = "emulator",
+            state: Optional[EmulatorState] = None,
+            latency: float = 0.0,
+            latency_jitter: float = 0.0,
+            error_rate: float = 0.0,
+            error_statuses: Tuple[int, ...] = (500, 502, 503),
+            rate_limit: Optional[float] = None,
+            rate_burst: Optional[int] = None,
+            webhook_url: Optional[str] = None,
+            auto_pay_after: Optional[float] = None,
+            seed: Optional[int] = None
+    ) -> None:
+        """
+        :param token: API token accepted by the emulator
+        :param state: App state, a new app with 1000 of every asset if not passed
+        :param latency: Seconds every response is delayed
+        :param latency_jitter: Random extra delay up to this number of seconds
+        :param error_rate: Share of requests answered with one of `error_statuses`
+        :param error_statuses: HTTP statuses of injected errors
+        :param rate_limit: Requests per second, exceeding requests get 429 with Retry-After
+        :param rate_burst: Rate limit bucket capacity, defaults to rate_limit
+        :param webhook_url: URL receiving signed invoice_paid updates
+        :param auto_pay_after: Pay every created invoice after this number of seconds
+        :param seed: Random seed for latency jitter and error injection
+        """
+
+        self.token = token
+        self.state = state or EmulatorState()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.webhook_url = webhook_url
+        self.auto_pay_after = auto_pay_after
+
+        self._random: random.Random = random.Random(seed)
+        self._bucket: Optional[TokenBucket] = None
+
+        if rate_limit is not None:
+            self._bucket = TokenBucket(rate=rate_limit, capacity=rate_burst or max(int(rate_limit), 1))
+
+        self._webhook_key: bytes = sha256(token.encode("UTF-8")).digest()
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            APIMethod.GET_ME: lambda params: self.state.get_me(),
+            APIMethod.GET_STATS: self.state.get_stats,
+            APIMethod.GET_BALANCE: lambda params: self.state.get_balance(),
+            APIMethod.GET_EXCHANGE_RATES: lambda params: self.state.get_exchange_rates(),
+            APIMethod.GET_CURRENCIES: lambda params: self.state.get_currencies(),
+            APIMethod.CREATE_INVOICE: self._create_invoice,
+            APIMethod.GET_INVOICES: self.state.get_invoices,
+            APIMethod.DELETE_INVOICE: self.state.delete_invoice,
+            APIMethod.TRANSFER: self.state.transfer,
+            APIMethod.GET_TRANSFERS: self.state.get_transfers,
+            APIMethod.CREATE_CHECK: self.state.create_check,
+            APIMethod.GET_CHECKS: self.state.get_checks,
+            APIMethod.DELETE_CHECK: self.state.delete_check,
+        }
+
+        self.request_counts: Dict[str, int] = {}
+        self.webhook_statuses: Dict[int, int] = {}
+
+        self._runner: Optional[web.AppRunner] = None
+        self._session: Optional[ClientSession] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.base_url: Optional[str] = None
+
+    async def __aenter__(self) -> "CryptoPayEmulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def make_app(self) -> web.Application:
+        """Returns aiohttp application serving /api/<method> with GET and POST"""
+
+        app: web.Application = web.Application()
+        app.router.add_route(hdrs.METH_ANY, "/api/{method}", self._handle)
+        app.on_cleanup.append(lambda _: self._close())
+
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving and return the base URL for `ICryptoPay(base_url=...)`
+
+        :param host: Interface to listen on
+        :param port: Port to listen on, a free port if 0
+        """
+
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=host, port=port).start()
+
+        address: Tuple[str, int] = self._runner.addresses[0][:2]
+        self.base_url = f"http://{address[0]}:{address[1]}"
+
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving. Pending auto payments are cancelled"""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _read_params(self, request: web.Request) -> Dict[str, Any]:
+        params: Dict[str, Any] = dict(request.query)
+
+        if request.method == hdrs.METH_POST and request.can_read_body:
+            if request.content_type == "application/json":
+                params.update(await request.json())
+            else:
+                params.update(await request.post())
+
+        return params
+
+    @staticmethod
+    def _error(status: int, code: int, name: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+        return web.json_response({"ok": False, "error": {"code": code, "name": name}}, status=status, headers=headers)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        api_method: str = f"/api/{request.match_info['method']}"
+        self.request_counts[api_method] = self.request_counts.get(api_method, 0) + 1
+
+        if self.latency or self.latency_jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.latency_jitter))
+
+        if request.headers.get(TOKEN_HEADER) != self.token:
+            return self._error(status=401, code=401, name="UNAUTHORIZED")
+
+        if self._bucket is not None:
+            delay: float = self._bucket.get_delay(time.monotonic())
+
+            if delay > 0:
+                return self._error(
+                    status=429,
+                    code=429,
+                    name="TOO_MANY_REQUESTS",
+                    headers={hdrs.RETRY_AFTER: str(math.ceil(delay))}
+                )
+
+            self._bucket.consume()
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            status: int = self._random.choice(self.error_statuses)
+            name: str = HTTPStatus(status).phrase.upper().replace(" ", "_")
+
+            return self._error(status=status, code=status, name=name)
+
+        handler: Optional[Callable[[Dict[str, Any]], Any]] = self._handlers.get(api_method)
+
+        if handler is None:
+            return self._error(status=405, code=405, name="METHOD_NOT_FOUND")
+
+        try:
+            result: Any = handler(await self._read_params(request))
+        except EmulatorError as error:
+            return self._error(status=error.code, code=error.code, name=error.name)
+        except (ValueError, KeyError):
+            return self._error(status=400, code=400, name="PARAMS_INVALID")
+
+        return web.json_response({"ok": True, "result": result})
+
+    def _create_invoice(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        invoice: Dict[str, Any] = self.state.create_invoice(params)
+
+        if self.auto_pay_after is not None:
+            task: asyncio.Task = asyncio.get_running_loop().create_task(
+                self._pay_later(invoice_id=invoice["invoice_id"], delay=self.auto_pay_after)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        return invoice
+
+    async def _pay_later(self, invoice_id: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        try:
+            await self.pay_invoice(invoice_id=invoice_id)
+        except EmulatorError as error:
+            logger.debug("Invoice %s is not paid: %s", invoice_id, error.name)
+
+    async def pay_invoice(
+            self,
+            invoice_id: int,
+            paid_asset: Optional[str] = None,
+            comment: Optional[str] = None,
+            paid_anonymously: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Pay an active invoice and send invoice_paid update to `webhook_url`
+
+        :param invoice_id: Invoice ID
+        :param paid_asset: Asset a fiat invoice is paid in, the first accepted asset if not passed
+        :param comment: Payer comment
+        :param paid_anonymously: Payer is hidden
+        """
+
+        invoice: Dict[str, Any] = self.state.pay_invoice(
+            invoice_id=invoice_id,
+            paid_asset=paid_asset,
+            comment=comment,
+            paid_anonymously=paid_anonymously
+        )
+
+        if self.webhook_url is not None:
+            await self.send_update(self.state.make_update(invoice))
+
+        return invoice
+
+    def activate_check(self, check_id: int) -> Dict[str, Any]:
+        """
+        Activate an active check
+
+        :param check_id: Check ID
+        """
+
+        return self.state.activate_check(check_id)
+
+    def sign(self, body: bytes) -> str:
+        """Returns Crypto-Pay-API-Signature header value for the body"""
+
+        return HMAC(key=self._webhook_key, msg=body, digestmod=sha256).hexdigest()
+
+    async def send_update(self, update: Dict[str, Any], url: Optional[str] = None) -> Optional[int]:
+        """
+        Send a signed webhook update. Returns HTTP status, None if the request failed
+
+        :param update: Update dict
+        :param url: Target URL, `webhook_url` if not passed
+        """
+
+        body: bytes = json.dumps(update).encode("UTF-8")
+        headers: Dict[str, str] = {hdrs.CONTENT_TYPE: "application/json", SIGNATURE_HEADER: self.sign(body)}
+
+        if self._session is None or self._session.closed:
+            self._session = ClientSession()
+
+        try:
+            async with self._session.post(url or self.webhook_url, data=body, headers=headers) as response:
+                status: int = response.status
+        except (ClientError, asyncio.TimeoutError):
+            logger.exception("Webhook update %s is not delivered", update.get("update_id"))
+            return None
+
+        self.webhook_statuses[status] = self.webhook_statuses.get(status, 0) + 1
+
+        return status
@@ -0,0 +1,528 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional
+
+from icryptopay.enums.asset import Asset
+from icryptopay.enums.check import CheckStatus
+from icryptopay.enums.currency import CurrencyType
+from icryptopay.enums.fiat import FiatType
+from icryptopay.enums.invoice import InvoiceStatus
+
+DEFAULT_RATES: Dict[str, str] = {
+    Asset.BTC: "60000",
+    Asset.TON: "5.5",
+    Asset.ETH: "2600",
+    Asset.USDT: "1",
+    Asset.USDC: "1",
+    Asset.BNB: "550",
+    Asset.TRX: "0.15",
+    Asset.LTC: "65",
+    Asset.GRAM: "0.003",
+    Asset.NOT: "0.008",
+    Asset.MY: "0.05",
+    Asset.SOL: "140",
+}
+"""USD price of every asset"""
+
+FIAT_RATES: Dict[str, str] = {
+    FiatType.USD: "1",
+    FiatType.EUR: "0.92",
+    FiatType.RUB: "92",
+    FiatType.GBP: "0.78",
+}
+"""Price of one USD in fiat currencies"""
+
+DECIMALS: Dict[str, int] = {Asset.BTC: 8, Asset.ETH: 18, Asset.TON: 9, Asset.SOL: 9}
+FEE: Decimal = Decimal("0.03")
+MAX_COUNT: int = 1000
+
+
+class EmulatorError(Exception):
+    """Error returned by the emulator as a Crypto Pay error response"""
+
+    def __init__(self, code: int, name: str) -> None:
+        self.code = code
+        self.name = name
+
+        super().__init__(code, name)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _parse_datetime(value: str) -> datetime:
+    parsed: datetime = datetime.fromisoformat(value)
+
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _format_amount(value: Decimal) -> str:
+    return format(value.normalize(), "f")
+
+
+def _parse_amount(value: Any) -> Decimal:
+    try:
+        amount: Decimal = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise EmulatorError(400, "AMOUNT_INVALID")
+
+    if not amount.is_finite():
+        raise EmulatorError(400, "AMOUNT_INVALID")
+
+    if amount <= 0:
+        raise EmulatorError(400, "AMOUNT_TOO_SMALL")
+
+    return amount
+
+
+def _parse_bool(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+
+    if isinstance(value, bool):
+        return value
+
+    return str(value).lower() == "true"
+
+
+def _parse_ids(value: Any) -> Optional[List[int]]:
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, list):
+        return [int(item) for item in value]
+
+    return [int(item) for item in str(value).split(",")]
+
+
+def _parse_page(items: List[Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    offset: int = int(params.get("offset") or 0)
+    count: int = min(int(params.get("count") or 100), MAX_COUNT)
+
+    return {"items": items[offset:offset + count]}
+
+
+class EmulatorState:
+    """
+    In-memory state of one emulated Crypto Pay app.
+    Objects are kept as API response dicts, amounts are kept as strings like the API returns them
+    """
+
+    def __init__(
+            self,
+            app_id: int = 1,
+            name: str = "Emulator",
+            balances: Optional[Dict[str, Any]] = None,
+            rates: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        :param app_id: App ID returned by getMe
+        :param name: App name returned by getMe
+        :param balances: Initial available balance per asset, 1000 of every asset by default
+        :param rates: USD price per asset, DEFAULT_RATES by default
+        """
+
+        self.app_id = app_id
+        self.name = name
+
+        self.available: Dict[str, Decimal] = {asset.value: Decimal(1000) for asset in Asset}
+        self.onhold: Dict[str, Decimal] = {asset.value: Decimal(0) for asset in Asset}
+        self.available.update({str(asset): Decimal(str(amount)) for asset, amount in (balances or {}).items()})
+
+        self.rates: Dict[str, Decimal] = {
+            str(asset): Decimal(str(rate)) for asset, rate in (rates or DEFAULT_RATES).items()
+        }
+
+        self.invoices: Dict[int, Dict[str, Any]] = {}
+        self.checks: Dict[int, Dict[str, Any]] = {}
+        self.transfers: Dict[int, Dict[str, Any]] = {}
+        self.spend_ids: Dict[str, int] = {}
+
+        self._last_invoice_id = 0
+        self._last_check_id = 0
+        self._last_transfer_id = 0
+        self._last_update_id = 0
+
+    def _get_asset(self, value: Any) -> str:
+        asset: str = str(value or "")
+
+        if asset not in self.rates:
+            raise EmulatorError(400, "ASSET_INVALID")
+
+        return asset
+
+    def _withdraw(self, asset: str, amount: Decimal) -> None:
+        if self.available.get(asset, Decimal(0)) < amount:
+            raise EmulatorError(400, "INSUFFICIENT_FUNDS")
+
+        self.available[asset] -= amount
+
+    def get_me(self) -> Dict[str, Any]:
+        return {"app_id": self.app_id, "name": self.name, "payment_processing_bot_username": "CryptoBot"}
+
+    def get_balance(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "currency_code": asset,
+                "available": _format_amount(self.available.get(asset, Decimal(0))),
+                "onhold": _format_amount(self.onhold.get(asset, Decimal(0))),
+            }
+            for asset in self.rates
+        ]
+
+    def get_exchange_rates(self) -> List[Dict[str, Any]]:
+        rates: List[Dict[str, Any]] = []
+
+        for asset, usd_rate in self.rates.items():
+            for fiat, fiat_rate in FIAT_RATES.items():
+                rates.append({
+                    "is_valid": True,
+                    "is_crypto": True,
+                    "is_fiat": False,
+                    "source": asset,
+                    "target": fiat,
+                    "rate": _format_amount(usd_rate * Decimal(fiat_rate)),
+                })
+
+        for fiat, fiat_rate in FIAT_RATES.items():
+            rates.append({
+                "is_valid": True,
+                "is_crypto": False,
+                "is_fiat": True,
+                "source": fiat,
+                "target": FiatType.USD.value,
+                "rate": _format_amount(1 / Decimal(fiat_rate)),
+            })
+
+        return rates
+
+    def get_currencies(self) -> List[Dict[str, Any]]:
+        currencies: List[Dict[str, Any]] = [
+            {
+                "is_blockchain": True,
+                "is_stablecoin": asset in (Asset.USDT, Asset.USDC),
+                "is_fiat": False,
+                "name": asset,
+                "code": asset,
+                "url": None,
+                "decimals": DECIMALS.get(asset, 8),
+            }
+            for asset in self.rates
+        ]
+        currencies.extend(
+            {
+                "is_blockchain": False,
+                "is_stablecoin": False,
+                "is_fiat": True,
+                "name": fiat,
+                "code": fiat,
+                "url": None,
+                "decimals": 2,
+            }
+            for fiat in FIAT_RATES
+        )
+
+        return currencies
+
+    def get_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        end_at: datetime = _parse_datetime(params["end_at"]) if params.get("end_at") else _now()
+        start_at: datetime = (
+            _parse_datetime(params["start_at"]) if params.get("start_at") else end_at - timedelta(days=1)
+        )
+
+        created: List[Dict[str, Any]] = [
+            invoice for invoice in self.invoices.values()
+            if start_at <= _parse_datetime(invoice["created_at"]) <= end_at
+        ]
+        paid: List[Dict[str, Any]] = [invoice for invoice in created if invoice["status"] == InvoiceStatus.PAID]
+        volume: Decimal = sum(
+            (Decimal(invoice["paid_amount"]) * Decimal(invoice["paid_usd_rate"]) for invoice in paid),
+            Decimal(0)
+        )
+
+        return {
+            "volume": _format_amount(volume),
+            "conversion": len(paid) / len(created) if created else 0,
+            "unique_users_count": len(paid),
+            "created_invoice_count": len(created),
+            "paid_invoice_count": len(paid),
+            "start_at": _format_datetime(start_at),
+            "end_at": _format_datetime(end_at),
+        }
+
+    def create_invoice(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        currency_type: str = params.get("currency_type") or CurrencyType.CRYPTO
+        amount: Decimal = _parse_amount(params.get("amount"))
+
+        if currency_type == CurrencyType.CRYPTO:
+            asset: Optional[str] = self._get_asset(params.get("asset"))
+            fiat: Optional[str] = None
+            accepted_assets: Optional[List[str]] = None
+        elif currency_type == CurrencyType.FIAT:
+            asset = None
+            fiat = str(params.get("fiat") or "")
+
+            if fiat not in FIAT_RATES:
+                raise EmulatorError(400, "FIAT_INVALID")
+
+            accepted_assets = (
+                [self._get_asset(item) for item in str(params["accepted_assets"]).split(",")]
+                if params.get("accepted_assets") else list(self.rates)
+            )
+        else:
+            raise EmulatorError(400, "CURRENCY_TYPE_INVALID")
+
+        self._last_invoice_id += 1
+        invoice_id: int = self._last_invoice_id
+        invoice_hash: str = f"IV{secrets.token_hex(6).upper()}"
+        created_at: datetime = _now()
+        expires_in: Optional[str] = params.get("expires_in")
+
+        invoice: Dict[str, Any] = {
+            "invoice_id": invoice_id,
+            "hash": invoice_hash,
+            "currency_type": currency_type,
+            "asset": asset,
+            "fiat": fiat,
+            "amount": _format_amount(amount),
+            "accepted_assets": accepted_assets,
+            "bot_invoice_url": f"https://t.me/CryptoBot?start={invoice_hash}",
+            "mini_app_invoice_url": f"https://t.me/CryptoBot/app?startapp=invoice-{invoice_hash}",
+            "web_app_invoice_url": f"https://app.send.tg/invoices/{invoice_hash}",
+            "description": params.get("description"),
+            "status": InvoiceStatus.ACTIVE.value,
+            "created_at": _format_datetime(created_at),
+            "allow_comments": _parse_bool(params.get("allow_comments"), default=True),
+            "allow_anonymous": _parse_bool(params.get("allow_anonymous"), default=True),
+            "expiration_date": (
+                _format_datetime(created_at + timedelta(seconds=int(expires_in))) if expires_in else None
+            ),
+            "hidden_message": params.get("hidden_message"),
+            "payload": params.get("payload"),
+            "paid_btn_name": params.get("paid_btn_name"),
+            "paid_btn_url": params.get("paid_btn_url"),
+        }
+        self.invoices[invoice_id] = invoice
+
+        return invoice
+
+    def get_invoices(self, params: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        self.expire_invoices()
+
+        invoice_ids: Optional[List[int]] = _parse_ids(params.get("invoice_ids"))
+        invoices: Iterable[Dict[str, Any]] = (
+            [self.invoices[invoice_id] for invoice_id in invoice_ids if invoice_id in self.invoices]
+            if invoice_ids is not None else reversed(self.invoices.values())
+        )
+
+        return _parse_page(
+            items=[
+                invoice for invoice in invoices
+                if (not params.get("asset") or invoice["asset"] == params["asset"])
+                and (not params.get("fiat") or invoice["fiat"] == params["fiat"])
+                and (not params.get("status") or invoice["status"] == params["status"])
+            ],
+            params=params
+        )
+
+    def delete_invoice(self, params: Dict[str, Any]) -> bool:
+        invoice_id: int = int(params.get("invoice_id") or 0)
+
+        if self.invoices.pop(invoice_id, None) is None:
+            raise EmulatorError(400, "INVOICE_NOT_FOUND")
+
+        return True
+
+    def expire_invoices(self) -> None:
+        now: str = _format_datetime(_now())
+
+        for invoice in self.invoices.values():
+            expiration_date: Optional[str] = invoice["expiration_date"]
+
+            if invoice["status"] == InvoiceStatus.ACTIVE and expiration_date and expiration_date <= now:
+                invoice["status"] = InvoiceStatus.EXPIRED.value
+
+    def pay_invoice(
+            self,
+            invoice_id: int,
+            paid_asset: Optional[str] = None,
+            comment: Optional[str] = None,
+            paid_anonymously: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Mark an active invoice paid and credit the app balance
+
+        :param invoice_id: Invoice ID
+        :param paid_asset: Asset a fiat invoice is paid in, the first accepted asset if not passed
+        :param comment: Payer comment
+        :param paid_anonymously: Payer is hidden
+        """
+
+        self.expire_invoices()
+        invoice: Optional[Dict[str, Any]] = self.invoices.get(invoice_id)
+
+        if invoice is None:
+            raise EmulatorError(400, "INVOICE_NOT_FOUND")
+
+        if invoice["status"] != InvoiceStatus.ACTIVE:
+            raise EmulatorError(400, "INVOICE_NOT_ACTIVE")
+
+        amount: Decimal = Decimal(invoice["amount"])
+
+        if invoice["currency_type"] == CurrencyType.FIAT:
+            paid_asset = self._get_asset(paid_asset or invoice["accepted_assets"][0])
+            fiat_rate: Decimal = self.rates[paid_asset] * Decimal(FIAT_RATES[invoice["fiat"]])
+            invoice["paid_fiat_rate"] = _format_amount(fiat_rate)
+            amount = amount / fiat_rate
+        else:
+            paid_asset = invoice["asset"]
+
+        fee: Decimal = amount * FEE
+        usd_rate: Decimal = self.rates[paid_asset]
+
+        invoice.update({
+            "status": InvoiceStatus.PAID.value,
+            "paid_asset": paid_asset,
+            "paid_amount": _format_amount(amount),
+            "paid_usd_rate": _format_amount(usd_rate),
+            "fee_asset": paid_asset,
+            "fee_amount": _format_amount(fee),
+            "fee_in_usd": _format_amount(fee * usd_rate),
+            "paid_at": _format_datetime(_now()),
+            "paid_anonymously": paid_anonymously,
+            "comment": comment if invoice["allow_comments"] else None,
+        })
+        self.available[paid_asset] = self.available.get(paid_asset, Decimal(0)) + amount - fee
+
+        return invoice
+
+    def transfer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        spend_id: str = str(params.get("spend_id") or "")
+
+        if not spend_id or len(spend_id) > 64:
+            raise EmulatorError(400, "SPEND_ID_INVALID")
+
+        if spend_id in self.spend_ids:
+            return self.transfers[self.spend_ids[spend_id]]
+
+        asset: str = self._get_asset(params.get("asset"))
+        amount: Decimal = _parse_amount(params.get("amount"))
+        self._withdraw(asset=asset, amount=amount)
+
+        self._last_transfer_id += 1
+        transfer: Dict[str, Any] = {
+            "transfer_id": self._last_transfer_id,
+            "spend_id": spend_id,
+            "user_id": int(params.get("user_id") or 0),
+            "asset": asset,
+            "amount": _format_amount(amount),
+            "status": "completed",
+            "completed_at": _format_datetime(_now()),
+            "comment": params.get("comment"),
+        }
+        self.transfers[transfer["transfer_id"]] = transfer
+        self.spend_ids[spend_id] = transfer["transfer_id"]
+
+        return transfer
+
+    def get_transfers(self, params: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        transfer_ids: Optional[List[int]] = _parse_ids(params.get("transfer_ids"))
+        transfers: Iterable[Dict[str, Any]] = (
+            [self.transfers[transfer_id] for transfer_id in transfer_ids if transfer_id in self.transfers]
+            if transfer_ids is not None else reversed(self.transfers.values())
+        )
+
+        return _parse_page(
+            items=[
+                transfer for transfer in transfers
+                if (not params.get("asset") or transfer["asset"] == params["asset"])
+                and (not params.get("spend_id") or transfer["spend_id"] == params["spend_id"])
+            ],
+            params=params
+        )
+
+    def create_check(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        asset: str = self._get_asset(params.get("asset"))
+        amount: Decimal = _parse_amount(params.get("amount"))
+        self._withdraw(asset=asset, amount=amount)
+        self.onhold[asset] = self.onhold.get(asset, Decimal(0)) + amount
+
+        self._last_check_id += 1
+        check_hash: str = f"CQ{secrets.token_hex(6).upper()}"
+        check: Dict[str, Any] = {
+            "check_id": self._last_check_id,
+            "hash": check_hash,
+            "asset": asset,
+            "amount": _format_amount(amount),
+            "bot_check_url": f"https://t.me/CryptoBot?start={check_hash}",
+            "status": CheckStatus.ACTIVE.value,
+            "created_at": _format_datetime(_now()),
+        }
+        self.checks[check["check_id"]] = check
+
+        return check
+
+    def get_checks(self, params: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        check_ids: Optional[List[int]] = _parse_ids(params.get("check_ids"))
+        checks: Iterable[Dict[str, Any]] = (
+            [self.checks[check_id] for check_id in check_ids if check_id in self.checks]
+            if check_ids is not None else reversed(self.checks.values())
+        )
+
+        return _parse_page(
+            items=[
+                check for check in checks
+                if (not params.get("asset") or check["asset"] == params["asset"])
+                and (not params.get("status") or check["status"] == params["status"])
+            ],
+            params=params
+        )
+
+    def delete_check(self, params: Dict[str, Any]) -> bool:
+        check: Optional[Dict[str, Any]] = self.checks.get(int(params.get("check_id") or 0))
+
+        if check is None or check["status"] != CheckStatus.ACTIVE:
+            raise EmulatorError(400, "CHECK_NOT_FOUND")
+
+        del self.checks[check["check_id"]]
+        amount: Decimal = Decimal(check["amount"])
+        self.onhold[check["asset"]] -= amount
+        self.available[check["asset"]] += amount
+
+        return True
+
+    def activate_check(self, check_id: int) -> Dict[str, Any]:
+        """
+        Mark an active check activated and release the held amount
+
+        :param check_id: Check ID
+        """
+
+        check: Optional[Dict[str, Any]] = self.checks.get(check_id)
+
+        if check is None or check["status"] != CheckStatus.ACTIVE:
+            raise EmulatorError(400, "CHECK_NOT_FOUND")
+
+        check["status"] = CheckStatus.ACTIVATED.value
+        check["activated_at"] = _format_datetime(_now())
+        self.onhold[check["asset"]] -= Decimal(check["amount"])
+
+        return check
+
+    def make_update(self, invoice: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns invoice_paid webhook update for the invoice"""
+
+        self._last_update_id += 1
+
+        return {
+            "update_id": self._last_update_id,
+            "update_type": "invoice_paid",
+            "request_date": _format_datetime(_now()),
+            "payload": invoice,
+        }
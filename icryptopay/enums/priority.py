@@ -0,0 +1,9 @@
+from enum import IntEnum
+
+
+class RequestPriority(IntEnum):
+    """Rate limiter lanes, lower value is served first"""
+
+    HIGH: int = 0
+    NORMAL: int = 1
+    LOW: int = 2
@@ -6,3 +6,7 @@ Docs https://help.crypt.bot/crypto-pay-api
 """
 
 CryptoPayAPIError = CodeErrorFactory()
+
+UnauthorizedError = CryptoPayAPIError.exception_to_handle(code=401, name="UNAUTHORIZED")
+InsufficientFundsError = CryptoPayAPIError.exception_to_handle(code=400, name="INSUFFICIENT_FUNDS")
+AmountTooSmallError = CryptoPayAPIError.exception_to_handle(code=400, name="AMOUNT_TOO_SMALL")
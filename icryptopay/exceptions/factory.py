@@ -1,5 +1,4 @@
-import gc
-from typing import Optional, Type, Union
+from typing import Dict, Optional, Tuple, Type, Union
 
 
 class CodeErrorFactory(Exception):
@@ -7,6 +6,8 @@ class CodeErrorFactory(Exception):
 
     __error_code: Optional[int] = None
     __error_name: Optional[str] = None
+    retry_after: Optional[float] = None
+    __registry: Dict[Tuple[type, Optional[int], Optional[str]], Type["CodeErrorFactory"]] = {}
 
     def __init__(self, code: Optional[int] = None, name: Optional[str] = None) -> None:
         self.code = code
@@ -22,30 +23,63 @@ class CodeErrorFactory(Exception):
         return cls.exception_to_handle(code=code)
 
     @classmethod
-    def exception_to_handle(cls, code: Optional[int] = None) -> Type["CodeErrorFactory"]:
+    def exception_to_handle(cls, code: Optional[int] = None, name: Optional[str] = None) -> Type["CodeErrorFactory"]:
+        """
+        Returns the cached exception class for the error code (and error name)
+
+        :param code: Error code
+        :param name: Error name, e.g. INSUFFICIENT_FUNDS
+        """
+
         if code is None:
             return cls
 
-        catch_exc_classname = cls.generate_exc_classname(code=code)
+        return cls.get_exception_class(code=code, name=name)
 
-        for obj in gc.get_objects():
-            if obj.__class__.__name__ == catch_exc_classname:
-                return obj.__class__
+    @classmethod
+    def exception_to_raise(cls, code: int, name: Optional[str] = None) -> "CodeErrorFactory":
+        """
+        Returns an error with error code and error name.
+        Unlike `CryptoPayAPIError(code, name)` it returns an instance even if the name is empty
 
-        return type(catch_exc_classname, (cls,), {})
+        :param code: Error code
+        :param name: Error name, the error is an instance of the code class if not passed
+        """
+
+        exception_type = cls.get_exception_class(code=code, name=name or None)
+        return exception_type(code, name or None)
 
     @classmethod
-    def exception_to_raise(cls, code: int, name: str) -> "CodeErrorFactory":
-        """Returns an error with error code and error_name"""
+    def get_exception_class(cls, code: int, name: Optional[str] = None) -> Type["CodeErrorFactory"]:
+        """
+        Returns the exception class registered for the error code and name.
+        Classes are created once, so the raised class and the handled class are the same object.
+        Named classes are subclasses of the code class: `except CryptoPayAPIError(400)`
+        also catches `CryptoPayAPIError_400_INSUFFICIENT_FUNDS`
+
+        :param code: Error code
+        :param name: Error name
+        """
 
-        exception_type = type(cls.generate_exc_classname(code=code), (cls,), {})
-        return exception_type(code, name)
+        key = (cls, code, name)
+        exception_type = cls.__registry.get(key)
+
+        if exception_type is not None:
+            return exception_type
+
+        base = cls if name is None else cls.get_exception_class(code=code)
+        exception_type = type(cls.generate_exc_classname(code=code, name=name), (base,), {})
+
+        return cls.__registry.setdefault(key, exception_type)
 
     @classmethod
-    def generate_exc_classname(cls, code: Optional[int]) -> str:
-        """Generates unique exception classname based on error code"""
+    def generate_exc_classname(cls, code: Optional[int], name: Optional[str] = None) -> str:
+        """Generates unique exception classname based on error code and error name"""
+
+        if name is None:
+            return f"{cls.__name__}_{code}"
 
-        return f"{cls.__name__}_{code}"
+        return f"{cls.__name__}_{code}_{name}"
 
     def __str__(self):
         return f"[{self.code}] {self.name}\n"
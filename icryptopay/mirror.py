@@ -0,0 +1,577 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    TYPE_CHECKING
+)
+
+from icryptopay.enums.asset import Asset
+from icryptopay.enums.check import CheckStatus
+from icryptopay.enums.invoice import InvoiceStatus
+from icryptopay.types.app_stats import AppStats
+from icryptopay.types.check import Check
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.stats import SyncResult
+from icryptopay.types.transfer import Transfer
+from icryptopay.types.update import Update
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from icryptopay.api import ICryptoPay
+
+DateArg = Optional[Union[datetime, str]]
+
+
+def _timestamp(value: Optional[Union[datetime, str]]) -> Optional[float]:
+    if value is None:
+        return None
+
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return value.timestamp()
+
+
+def _datetime(value: Union[datetime, str]) -> datetime:
+    return datetime.fromtimestamp(_timestamp(value), tz=timezone.utc)
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class _Table:
+    """Mirrored entity: table name, ID column, model and indexed columns taken from the model"""
+
+    def __init__(
+            self,
+            name: str,
+            id_column: str,
+            model: Any,
+            columns: Dict[str, Callable[[Any], Any]],
+            date_column: str,
+            indexes: Sequence[str]
+    ) -> None:
+        self.name = name
+        self.id_column = id_column
+        self.model = model
+        self.columns = columns
+        self.date_column = date_column
+        self.indexes = indexes
+
+        names: List[str] = [id_column, *columns, "data"]
+        updates: str = ", ".join(f"{column} = excluded.{column}" for column in names[1:])
+
+        self.upsert: str = (
+            f"INSERT INTO {name} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT ({id_column}) DO UPDATE SET {updates}"
+        )
+
+    def get_schema(self) -> List[str]:
+        return [
+            f"CREATE TABLE IF NOT EXISTS {self.name} "
+            f"({self.id_column} INTEGER PRIMARY KEY, {', '.join(self.columns)}, data TEXT NOT NULL)",
+            *(
+                f"CREATE INDEX IF NOT EXISTS {self.name}_{index.replace(', ', '_')} ON {self.name} ({index})"
+                for index in self.indexes
+            ),
+        ]
+
+    def get_row(self, item: Any) -> Tuple[Any, ...]:
+        return (
+            getattr(item, self.id_column),
+            *(get(item) for get in self.columns.values()),
+            item.model_dump_json()
+        )
+
+
+INVOICES: _Table = _Table(
+    name="invoices",
+    id_column="invoice_id",
+    model=Invoice,
+    columns={
+        "status": lambda invoice: str(invoice.status),
+        "asset": lambda invoice: _text(invoice.asset),
+        "fiat": lambda invoice: _text(invoice.fiat),
+        "paid_asset": lambda invoice: _text(invoice.paid_asset),
+        "payload": lambda invoice: invoice.payload,
+        "paid_amount": lambda invoice: _text(invoice.paid_amount),
+        "paid_usd_rate": lambda invoice: _text(invoice.paid_usd_rate),
+        "created_at": lambda invoice: _timestamp(invoice.created_at),
+        "paid_at": lambda invoice: _timestamp(invoice.paid_at),
+    },
+    date_column="created_at",
+    indexes=("status, created_at", "asset, created_at", "payload", "created_at")
+)
+CHECKS: _Table = _Table(
+    name="checks",
+    id_column="check_id",
+    model=Check,
+    columns={
+        "status": lambda check: str(check.status),
+        "asset": lambda check: str(check.asset),
+        "created_at": lambda check: _timestamp(check.created_at),
+        "activated_at": lambda check: _timestamp(check.activated_at),
+    },
+    date_column="created_at",
+    indexes=("status, created_at", "asset, created_at", "created_at")
+)
+TRANSFERS: _Table = _Table(
+    name="transfers",
+    id_column="transfer_id",
+    model=Transfer,
+    columns={
+        "user_id": lambda transfer: transfer.user_id,
+        "asset": lambda transfer: str(transfer.asset),
+        "status": lambda transfer: transfer.status,
+        "completed_at": lambda transfer: _timestamp(transfer.completed_at),
+    },
+    date_column="completed_at",
+    indexes=("user_id, completed_at", "asset, completed_at", "completed_at")
+)
+
+
+class CryptoPayMirror:
+    """
+    Invoices, checks and transfers of an app in an SQLite database, for reports and dashboards
+    that would otherwise page through the API.
+    sync() fetches items created since the last sync and refreshes the status of active invoices and checks,
+    sync(full=True) compares every item with the API and catches any other change.
+    Paid invoices from webhooks are saved as they arrive.
+    Queries run in a thread, so they don't block the event loop
+
+        mirror = CryptoPayMirror(client=crypto, path="crypto.db")
+        await mirror.sync()
+        paid = await mirror.get_invoices(status=InvoiceStatus.PAID, asset=Asset.TON)
+        stats = await mirror.get_stats(start_at=datetime(2024, 1, 1))
+    """
+
+    def __init__(
+            self,
+            client: "ICryptoPay",
+            path: str,
+            page_size: int = 1000,
+            apply_updates: bool = True
+    ) -> None:
+        """
+        :param client: Client to sync with
+        :param path: Database file path, ":memory:" for an in-memory database
+        :param page_size: Items per request when new items are fetched, up to 1000
+        :param apply_updates: Register a pay handler saving paid invoices from webhook updates
+        """
+
+        self.client = client
+        self.page_size = page_size
+
+        import sqlite3
+
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        # Newest ID seen by sync per table. Webhook updates may store newer invoices, so MAX(id) can't be used
+        self._connection.execute("CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, last_id INTEGER)")
+
+        for table in (INVOICES, CHECKS, TRANSFERS):
+            for statement in table.get_schema():
+                self._connection.execute(statement)
+
+        if apply_updates:
+            client.register_pay_handler(self.apply_update)
+
+    def _execute(self, query: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def _write(
+            self,
+            table: _Table,
+            items: Sequence[Any],
+            deleted_ids: Sequence[int] = (),
+            last_id: Optional[int] = None
+    ) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN")
+
+            try:
+                self._connection.executemany(table.upsert, [table.get_row(item) for item in items])
+                self._connection.executemany(
+                    f"DELETE FROM {table.name} WHERE {table.id_column} = ?",
+                    [(item_id,) for item_id in deleted_ids]
+                )
+
+                if last_id is not None:
+                    self._connection.execute(
+                        "INSERT INTO sync_state (name, last_id) VALUES (?, ?) "
+                        "ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id",
+                        (table.name, last_id)
+                    )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+            self._connection.execute("COMMIT")
+
+    async def _sync(
+            self,
+            table: _Table,
+            iterate: Callable[[], AsyncIterator[Any]],
+            fetch: Optional[Callable[[List[int]], Awaitable[List[Any]]]] = None,
+            active_status: Optional[str] = None,
+            full: bool = False
+    ) -> SyncResult:
+        rows: List[Tuple[Any, ...]] = await asyncio.to_thread(
+            self._execute,
+            "SELECT last_id FROM sync_state WHERE name = ?",
+            (table.name,)
+        )
+        last_id: int = rows[0][0] if rows else 0
+
+        if full:
+            return await self._reconcile(table=table, iterate=iterate, fetch=fetch, last_id=last_id)
+
+        added: List[Any] = []
+        stored_in_row: int = 0
+
+        # Items are listed from the newest. The scan stops after a whole page of stored items,
+        # so a new item listed after older ones is still found
+        async for item in iterate():
+            if getattr(item, table.id_column) <= last_id:
+                stored_in_row += 1
+
+                if stored_in_row >= self.page_size:
+                    break
+
+                continue
+
+            stored_in_row = 0
+            added.append(item)
+
+        refreshed: List[Any] = []
+        deleted_ids: Set[int] = set()
+
+        if fetch is not None:
+            rows = await asyncio.to_thread(
+                self._execute,
+                f"SELECT {table.id_column} FROM {table.name} WHERE status = ?",
+                (active_status,)
+            )
+            active_ids: List[int] = [row[0] for row in rows]
+
+            if active_ids:
+                found: List[Any] = await fetch(active_ids)
+                refreshed = [item for item in found if item.status != active_status]
+                deleted_ids = set(active_ids) - {getattr(item, table.id_column) for item in found}
+
+        if added:
+            last_id = max(getattr(item, table.id_column) for item in added)
+
+        await asyncio.to_thread(self._write, table, added + refreshed, list(deleted_ids), last_id)
+
+        return SyncResult(added=len(added), updated=len(refreshed), deleted=len(deleted_ids))
+
+    async def _reconcile(
+            self,
+            table: _Table,
+            iterate: Callable[[], AsyncIterator[Any]],
+            fetch: Optional[Callable[[List[int]], Awaitable[List[Any]]]],
+            last_id: int
+    ) -> SyncResult:
+        rows: List[Tuple[Any, ...]] = await asyncio.to_thread(
+            self._execute,
+            f"SELECT {table.id_column}, status FROM {table.name}"
+        )
+        stored: Dict[int, Any] = dict(rows)
+        get_status: Callable[[Any], Any] = table.columns["status"]
+        changed: List[Any] = []
+        seen_ids: Set[int] = set()
+        added: int = 0
+
+        async for item in iterate():
+            item_id: int = getattr(item, table.id_column)
+            seen_ids.add(item_id)
+
+            if item_id not in stored:
+                added += 1
+                changed.append(item)
+            elif get_status(item) != stored[item_id]:
+                changed.append(item)
+
+        deleted_ids: Set[int] = set()
+
+        # Items missing from the listing are fetched by ID before they are deleted,
+        # the list may shift while it is paged through
+        missing_ids: List[int] = list(set(stored) - seen_ids)
+
+        if fetch is not None and missing_ids:
+            found: List[Any] = await fetch(missing_ids)
+            changed.extend(item for item in found if get_status(item) != stored[getattr(item, table.id_column)])
+            deleted_ids = set(missing_ids) - {getattr(item, table.id_column) for item in found}
+
+        last_id = max(seen_ids | {last_id})
+
+        await asyncio.to_thread(self._write, table, changed, list(deleted_ids), last_id)
+
+        return SyncResult(added=added, updated=len(changed) - added, deleted=len(deleted_ids))
+
+    async def sync_invoices(self, full: bool = False) -> SyncResult:
+        """
+        Fetch new invoices and refresh active ones. Invoices deleted in the app are deleted
+
+        :param full: Compare every invoice with the API instead
+        """
+
+        return await self._sync(
+            table=INVOICES,
+            iterate=lambda: self.client.iter_invoices(page_size=self.page_size, lite=False),
+            fetch=lambda invoice_ids: self.client.get_invoices(invoice_ids=invoice_ids, lite=False),
+            active_status=InvoiceStatus.ACTIVE,
+            full=full
+        )
+
+    async def sync_checks(self, full: bool = False) -> SyncResult:
+        """
+        Fetch new checks and refresh active ones. Checks deleted in the app are deleted
+
+        :param full: Compare every check with the API instead
+        """
+
+        return await self._sync(
+            table=CHECKS,
+            iterate=lambda: self.client.iter_checks(page_size=self.page_size, lite=False),
+            fetch=lambda check_ids: self.client.get_checks(check_ids=check_ids, lite=False),
+            active_status=CheckStatus.ACTIVE,
+            full=full
+        )
+
+    async def sync_transfers(self, full: bool = False) -> SyncResult:
+        """
+        Fetch new transfers. Transfers don't change, so stored ones are not refreshed
+
+        :param full: Fetch every transfer instead, e.g. to fill gaps
+        """
+
+        return await self._sync(
+            table=TRANSFERS,
+            iterate=lambda: self.client.iter_transfers(page_size=self.page_size, lite=False),
+            full=full
+        )
+
+    async def sync(self, full: bool = False) -> Dict[str, SyncResult]:
+        """
+        Sync invoices, checks and transfers. Returns results by table name
+
+        :param full: Compare every item with the API instead of fetching new items and refreshing active ones.
+        Slower, but catches changes the incremental sync doesn't look for
+        """
+
+        results: List[SyncResult] = await asyncio.gather(
+            self.sync_invoices(full=full),
+            self.sync_checks(full=full),
+            self.sync_transfers(full=full)
+        )
+
+        return dict(zip((INVOICES.name, CHECKS.name, TRANSFERS.name), results))
+
+    async def apply_update(self, update: Update) -> None:
+        """
+        Save the invoice of a webhook update
+
+        :param update: Webhook update
+        """
+
+        await asyncio.to_thread(self._write, INVOICES, [update.payload])
+
+    def _select(
+            self,
+            table: _Table,
+            filters: Dict[str, Any],
+            start_at: DateArg,
+            end_at: DateArg,
+            offset: int,
+            count: Optional[int]
+    ) -> List[Any]:
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        for column, value in filters.items():
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value if isinstance(value, int) else str(value))
+
+        if start_at is not None:
+            conditions.append(f"{table.date_column} >= ?")
+            params.append(_timestamp(start_at))
+
+        if end_at is not None:
+            conditions.append(f"{table.date_column} <= ?")
+            params.append(_timestamp(end_at))
+
+        where: str = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows: List[Tuple[Any, ...]] = self._execute(
+            f"SELECT data FROM {table.name} {where}ORDER BY {table.id_column} DESC LIMIT ? OFFSET ?",
+            (*params, -1 if count is None else count, offset)
+        )
+
+        return [
+            table.model.model_validate_json(row[0], context=self.client.validation_context)
+            for row in rows
+        ]
+
+    async def get_invoices(
+            self,
+            status: Optional[Union[InvoiceStatus, str]] = None,
+            asset: Optional[Union[Asset, str]] = None,
+            payload: Optional[str] = None,
+            start_at: DateArg = None,
+            end_at: DateArg = None,
+            offset: int = 0,
+            count: Optional[int] = None
+    ) -> List[Invoice]:
+        """
+        Stored invoices from the newest
+
+        :param status: Status
+        :param asset: Asset
+        :param payload: Payload
+        :param start_at: Created at or after this date
+        :param end_at: Created at or before this date
+        :param offset: Offset
+        :param count: Count, all if not passed
+        """
+
+        return await asyncio.to_thread(
+            self._select,
+            INVOICES,
+            {"status": status, "asset": asset, "payload": payload},
+            start_at,
+            end_at,
+            offset,
+            count
+        )
+
+    async def get_checks(
+            self,
+            status: Optional[Union[CheckStatus, str]] = None,
+            asset: Optional[Union[Asset, str]] = None,
+            start_at: DateArg = None,
+            end_at: DateArg = None,
+            offset: int = 0,
+            count: Optional[int] = None
+    ) -> List[Check]:
+        """
+        Stored checks from the newest
+
+        :param status: Status
+        :param asset: Asset
+        :param start_at: Created at or after this date
+        :param end_at: Created at or before this date
+        :param offset: Offset
+        :param count: Count, all if not passed
+        """
+
+        return await asyncio.to_thread(
+            self._select,
+            CHECKS,
+            {"status": status, "asset": asset},
+            start_at,
+            end_at,
+            offset,
+            count
+        )
+
+    async def get_transfers(
+            self,
+            asset: Optional[Union[Asset, str]] = None,
+            user_id: Optional[int] = None,
+            start_at: DateArg = None,
+            end_at: DateArg = None,
+            offset: int = 0,
+            count: Optional[int] = None
+    ) -> List[Transfer]:
+        """
+        Stored transfers from the newest
+
+        :param asset: Asset
+        :param user_id: Telegram user ID
+        :param start_at: Completed at or after this date
+        :param end_at: Completed at or before this date
+        :param offset: Offset
+        :param count: Count, all if not passed
+        """
+
+        return await asyncio.to_thread(
+            self._select,
+            TRANSFERS,
+            {"asset": asset, "user_id": user_id},
+            start_at,
+            end_at,
+            offset,
+            count
+        )
+
+    def _get_stats(self, start_at: datetime, end_at: datetime) -> AppStats:
+        period: Tuple[float, float] = (_timestamp(start_at), _timestamp(end_at))
+        created_count: int = self._execute(
+            "SELECT COUNT(*) FROM invoices WHERE created_at BETWEEN ? AND ?",
+            period
+        )[0][0]
+        paid: List[Tuple[Any, ...]] = self._execute(
+            "SELECT paid_amount, paid_usd_rate FROM invoices WHERE status = ? AND created_at BETWEEN ? AND ?",
+            (InvoiceStatus.PAID.value, *period)
+        )
+        volume: Decimal = sum(
+            (Decimal(amount) * Decimal(rate) for amount, rate in paid if amount and rate),
+            Decimal(0)
+        )
+
+        return AppStats(
+            volume=volume if self.client.use_decimal else float(volume),
+            conversion=len(paid) / created_count if created_count else 0,
+            unique_users_count=len(paid),
+            created_invoice_count=created_count,
+            paid_invoice_count=len(paid),
+            start_at=start_at,
+            end_at=end_at
+        )
+
+    async def get_stats(self, start_at: DateArg = None, end_at: DateArg = None) -> AppStats:
+        """
+        App statistics of stored invoices, like getStats: the period defaults to the last day,
+        volume is in USD at the rate of payment. Payers are not returned by the API,
+        so unique_users_count is the number of paid invoices
+
+        :param start_at: Start date
+        :param end_at: End date
+        """
+
+        end: datetime = _datetime(end_at) if end_at else datetime.now(tz=timezone.utc)
+        start: datetime = _datetime(start_at) if start_at else end - timedelta(days=1)
+
+        return await asyncio.to_thread(self._get_stats, start, end)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,360 @@
+import asyncio
+import hmac
+import time
+from collections import OrderedDict
+from functools import partial
+from hashlib import sha256
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
+
+from aiohttp import ClientSession, ClientTimeout
+
+from icryptopay.api import ICryptoPay
+from icryptopay.base import BaseClient
+from icryptopay.types.stats import PoolStats
+from icryptopay.types.update import Update
+from icryptopay.webhook.dedup import DedupStore, MemoryDedupStore
+from icryptopay.webhook.dispatcher import UpdateDispatcher
+
+if TYPE_CHECKING:
+    from icryptopay.webhook.asgi import PoolWebhookApp
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+
+
+# Client options whose objects keep state, they are reused when the client of a tenant is recreated
+_KEPT_OPTIONS: Tuple[str, ...] = ("rate_limiter", "cache", "balance_tracker")
+
+
+class _Tenant:
+    __slots__ = ("tenant_id", "token", "webhook_key", "dedup_store", "kept_options")
+
+    def __init__(self, tenant_id: Hashable, token: str) -> None:
+        self.tenant_id = tenant_id
+        self.token = token
+        self.webhook_key: bytes = sha256(token.encode("UTF-8")).digest()
+        self.dedup_store: DedupStore = MemoryDedupStore()
+        self.kept_options: Dict[str, Any] = {}
+
+    def verify(self, body: bytes, signature: bytes) -> bool:
+        digest: str = hmac.digest(self.webhook_key, body, "sha256").hex()
+
+        return hmac.compare_digest(digest.encode("UTF-8"), signature)
+
+
+class CryptoPayPool:
+    """
+    Registry of Crypto Pay apps (tenants) sharing one connection pool.
+    Every tenant gets its own client with its own token, pay handlers, rate limiter and cache.
+    Clients are created on first use and closed after `idle_timeout` seconds without use.
+    Seen update IDs, rate limiter, cache and balance tracker of a tenant are kept when its client is closed,
+    so a recreated client doesn't accept redelivered webhooks or lose the balance reservations
+
+        pool = CryptoPayPool()
+        pool.add_tenant("shop", token="TOKEN")
+
+        @pool.pay_handler()
+        async def invoice_paid(tenant_id, update):
+            ...
+
+        invoice = await pool.get_client("shop").create_invoice(asset="TON", amount=1)
+    """
+
+    def __init__(
+            self,
+            use_test_network: bool = False,
+            base_url: Optional[str] = None,
+            pool_size: int = 100,
+            pool_size_per_host: int = 0,
+            keepalive_timeout: float = 15.0,
+            dns_cache_ttl: Optional[int] = 10,
+            timeout: Optional[ClientTimeout] = None,
+            idle_timeout: float = 600.0,
+            max_clients: Optional[int] = None,
+            client_options: Optional[Callable[[Hashable], Dict[str, Any]]] = None
+    ) -> None:
+        """
+        :param use_test_network: Use the test network for all tenants
+        :param base_url: API server URL instead of the main or test network
+        :param pool_size: Total number of simultaneous connections of all tenants, 0 for no limit
+        :param pool_size_per_host: Number of simultaneous connections to one host, 0 for no limit
+        :param keepalive_timeout: Seconds an idle connection is kept in the pool
+        :param dns_cache_ttl: Seconds resolved addresses are cached, None to cache forever
+        :param timeout: HTTP timeouts, aiohttp defaults if not passed
+        :param idle_timeout: Seconds a tenant client is kept without use
+        :param max_clients: Maximum number of tenant clients, the least recently used is closed first
+        :param client_options: Returns extra ICryptoPay arguments for a tenant, e.g. rate_limiter and cache.
+        It is called every time the tenant client is created, so the objects are not shared between tenants.
+        rate_limiter, cache and balance_tracker of the first client are reused by the recreated ones.
+        A dispatcher is created with the tenant dedup store if not passed
+        """
+
+        self.use_test_network = use_test_network
+        self.base_url = base_url
+        self.idle_timeout = idle_timeout
+        self.max_clients = max_clients
+        self.client_options = client_options
+
+        self._connection: BaseClient = BaseClient(
+            pool_size=pool_size,
+            pool_size_per_host=pool_size_per_host,
+            keepalive_timeout=keepalive_timeout,
+            dns_cache_ttl=dns_cache_ttl,
+            timeout=timeout
+        )
+
+        self._tenants: Dict[Hashable, _Tenant] = {}
+        self._clients: "OrderedDict[Hashable, Tuple[ICryptoPay, float]]" = OrderedDict()
+        self._handlers: List[Tuple[Optional[Hashable], Callable]] = []
+        self._closing: List[asyncio.Task] = []
+        self._unclosed: List[ICryptoPay] = []
+
+    async def __aenter__(self) -> "CryptoPayPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, tenant_id: Hashable) -> bool:
+        return tenant_id in self._tenants
+
+    def add_tenant(self, tenant_id: Hashable, token: str) -> None:
+        """
+        Register a tenant. The client of a tenant whose token changed is recreated with a new state
+
+        :param tenant_id: Tenant ID
+        :param token: Crypto Pay API token of the tenant app
+        """
+
+        tenant: Optional[_Tenant] = self._tenants.get(tenant_id)
+
+        if tenant is not None and tenant.token == token:
+            return
+
+        self._evict(tenant_id)
+        self._tenants[tenant_id] = _Tenant(tenant_id=tenant_id, token=token)
+
+    async def remove_tenant(self, tenant_id: Hashable) -> None:
+        """
+        Unregister a tenant and close its client
+
+        :param tenant_id: Tenant ID
+        """
+
+        self._tenants.pop(tenant_id, None)
+        entry: Optional[Tuple[ICryptoPay, float]] = self._clients.pop(tenant_id, None)
+
+        if entry is not None:
+            await entry[0].close()
+
+    def get_client(self, tenant_id: Hashable) -> ICryptoPay:
+        """
+        Returns client of the tenant, creating it if it was not used or was evicted.
+        Don't keep the client for long: it is closed when the tenant is idle
+
+        :param tenant_id: Tenant ID
+        """
+
+        now: float = time.monotonic()
+        entry: Optional[Tuple[ICryptoPay, float]] = self._clients.get(tenant_id)
+
+        if entry is not None:
+            client: ICryptoPay = entry[0]
+            self._clients.move_to_end(tenant_id)
+        else:
+            tenant: Optional[_Tenant] = self._tenants.get(tenant_id)
+
+            if tenant is None:
+                raise KeyError(f"Unknown tenant {tenant_id!r}")
+
+            client = self._create_client(tenant)
+
+        self._clients[tenant_id] = (client, now)
+        self.evict_idle()
+
+        return client
+
+    def _create_client(self, tenant: _Tenant) -> ICryptoPay:
+        options: Dict[str, Any] = self.client_options(tenant.tenant_id) if self.client_options is not None else {}
+
+        for name in _KEPT_OPTIONS:
+            if name in tenant.kept_options:
+                options[name] = tenant.kept_options[name]
+            elif options.get(name) is not None:
+                tenant.kept_options[name] = options[name]
+
+        options.setdefault("dispatcher", UpdateDispatcher(dedup_store=tenant.dedup_store))
+
+        client: ICryptoPay = ICryptoPay(
+            token=tenant.token,
+            use_test_network=self.use_test_network,
+            base_url=self.base_url,
+            session=self._connection.get_session(),
+            **options
+        )
+
+        for tenant_id, handler in self._handlers:
+            if tenant_id is None or tenant_id == tenant.tenant_id:
+                client.register_pay_handler(partial(handler, tenant.tenant_id))
+
+        return client
+
+    def evict_idle(self) -> int:
+        """
+        Close clients unused for `idle_timeout` seconds and the least recently used over `max_clients`.
+        Called on every get_client, returns number of closed clients
+        """
+
+        now: float = time.monotonic()
+        evicted: int = 0
+
+        while self._clients:
+            tenant_id, (client, used_at) = next(iter(self._clients.items()))
+
+            if now - used_at < self.idle_timeout and (
+                    self.max_clients is None or len(self._clients) <= self.max_clients
+            ):
+                break
+
+            self._evict(tenant_id)
+            evicted += 1
+
+        return evicted
+
+    def _evict(self, tenant_id: Hashable) -> None:
+        entry: Optional[Tuple[ICryptoPay, float]] = self._clients.pop(tenant_id, None)
+
+        if entry is None:
+            return
+
+        # The session is shared, so closing only drains the dispatcher queue of the tenant
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside of the loop, the client is closed by close()
+            self._unclosed.append(entry[0])
+            return
+
+        task: asyncio.Task = loop.create_task(entry[0].close())
+        self._closing.append(task)
+        task.add_done_callback(self._closing.remove)
+
+    def register_pay_handler(self, func: Callable, tenant_id: Optional[Hashable] = None) -> None:
+        """
+        Register handler called with (tenant_id, update) when an invoice is paid
+
+        :param func: Handler
+        :param tenant_id: Call the handler only for this tenant, for all tenants if not passed
+        """
+
+        self._handlers.append((tenant_id, func))
+
+        for client_tenant_id, (client, _) in self._clients.items():
+            if tenant_id is None or tenant_id == client_tenant_id:
+                client.register_pay_handler(partial(func, client_tenant_id))
+
+    def pay_handler(self, tenant_id: Optional[Hashable] = None):
+        def decorator(handler):
+            self.register_pay_handler(handler, tenant_id=tenant_id)
+            return handler
+
+        return decorator
+
+    def find_tenant(self, body: bytes, crypto_pay_signature: str) -> Optional[Hashable]:
+        """
+        Returns ID of the tenant whose token signed the webhook body, None if no tenant did
+
+        :param body: Raw request body
+        :param crypto_pay_signature: Crypto-Pay-Api-Signature header
+        """
+
+        tenant: Optional[_Tenant] = self._find_tenant(body=body, signature=crypto_pay_signature.encode("UTF-8"))
+
+        return tenant.tenant_id if tenant is not None else None
+
+    def _find_tenant(self, body: bytes, signature: bytes) -> Optional[_Tenant]:
+        for tenant in self._tenants.values():
+            if tenant.verify(body=body, signature=signature):
+                return tenant
+
+        return None
+
+    async def feed_webhook(
+            self,
+            body: bytes,
+            crypto_pay_signature: str,
+            tenant_id: Optional[Hashable] = None
+    ) -> Optional[Hashable]:
+        """
+        Verify a raw webhook body and pass the update to pay handlers of its tenant.
+        Returns the tenant ID, None if the signature doesn't match any tenant.
+        Raises ValueError if the signed body is not an update
+
+        :param body: Raw request body
+        :param crypto_pay_signature: Crypto-Pay-Api-Signature header
+        :param tenant_id: Verify with this tenant only, e.g. when tenants have their own webhook URLs
+        """
+
+        signature: bytes = crypto_pay_signature.encode("UTF-8")
+
+        if tenant_id is None:
+            tenant: Optional[_Tenant] = self._find_tenant(body=body, signature=signature)
+        else:
+            tenant = self._tenants.get(tenant_id)
+
+            if tenant is not None and not tenant.verify(body=body, signature=signature):
+                tenant = None
+
+        if tenant is None:
+            return None
+
+        # The signature is verified once, here
+        client: ICryptoPay = self.get_client(tenant.tenant_id)
+        update: Update = client.validate_update(body)
+
+        await client.feed_update(update)
+
+        return tenant.tenant_id
+
+    async def get_updates(self, request: "Request") -> "JSONResponse":
+        """WebHook updates route for Starlette and FastAPI"""
+
+        await self.feed_webhook(
+            body=await request.body(),
+            crypto_pay_signature=request.headers.get("Crypto-Pay-Api-Signature", "")
+        )
+
+        return ICryptoPay.get_ok_response()
+
+    def get_asgi_app(self, path: Optional[str] = None) -> "PoolWebhookApp":
+        """
+        Returns ASGI application receiving webhooks of all tenants
+
+        :param path: Accept webhooks only on this path, any path if not passed
+        """
+
+        from icryptopay.webhook.asgi import PoolWebhookApp
+
+        return PoolWebhookApp(pool=self, path=path)
+
+    def get_session(self) -> ClientSession:
+        """Returns the session shared by all tenants"""
+
+        return self._connection.get_session()
+
+    def get_pool_stats(self) -> PoolStats:
+        """Returns usage of the shared connection pool"""
+
+        return self._connection.get_pool_stats()
+
+    async def close(self) -> None:
+        """Close all tenant clients and the shared session"""
+
+        clients: List[ICryptoPay] = [client for client, _ in self._clients.values()] + self._unclosed
+        self._clients.clear()
+        self._unclosed = []
+
+        await asyncio.gather(*(client.close() for client in clients), *self._closing)
+        await self._connection.close()
@@ -0,0 +1,157 @@
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+from icryptopay.api import ICryptoPay
+
+T = TypeVar("T")
+
+
+class SyncICryptoPay:
+    """
+    Blocking facade of ICryptoPay for threaded code (Django, Celery, scripts).
+    The async client runs on an event loop in a background thread, so the session and its connections
+    are reused by all calls. Calls may be made from any number of threads
+
+        crypto = SyncICryptoPay(token="TOKEN")
+        invoice = crypto.create_invoice(asset="TON", amount=1)
+
+        futures = [crypto.submit(crypto.client.get_invoice(invoice_id)) for invoice_id in invoice_ids]
+        invoices = [future.result() for future in futures]
+
+        crypto.close()
+
+    Coroutine methods of the client block until the result is ready, async iterators become iterators,
+    other attributes are returned as is. Sync pay handlers run on the loop thread and must use
+    the async `client` instead of the facade
+    """
+
+    def __init__(self, token: str, call_timeout: Optional[float] = None, **kwargs: Any) -> None:
+        """
+        :param token: Crypto Pay API token
+        :param call_timeout: Seconds a blocking call waits for the result, no limit if not passed.
+        The request is cancelled on timeout
+        :param kwargs: ICryptoPay arguments
+        """
+
+        self.client: ICryptoPay = ICryptoPay(token=token, **kwargs)
+        self.call_timeout = call_timeout
+
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="icryptopay-loop",
+            daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+    def __enter__(self) -> "SyncICryptoPay":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "client":
+            raise AttributeError(name)
+
+        attribute: Any = getattr(self.client, name)
+
+        if inspect.iscoroutinefunction(attribute):
+            @functools.wraps(attribute)
+            def call(*args: Any, **kwargs: Any) -> Any:
+                return self.run(attribute(*args, **kwargs))
+
+            return call
+
+        if inspect.ismethod(attribute) and name.startswith("iter_"):
+            @functools.wraps(attribute)
+            def iterate(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                return self.iterate(attribute(*args, **kwargs))
+
+            return iterate
+
+        return attribute
+
+    def submit(self, awaitable: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """
+        Schedule a coroutine on the client loop and return a concurrent future without waiting
+
+        :param awaitable: Coroutine, e.g. `crypto.client.get_me()`
+        """
+
+        if self._closed:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+
+            raise RuntimeError("SyncICryptoPay is closed")
+
+        return asyncio.run_coroutine_threadsafe(self._await(awaitable), self._loop)
+
+    @staticmethod
+    async def _await(awaitable: Awaitable[T]) -> T:
+        return await awaitable
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the client loop and wait for the result
+
+        :param awaitable: Coroutine, e.g. `crypto.client.get_me()`
+        """
+
+        if threading.current_thread() is self._thread:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+
+            raise RuntimeError("Blocking call from the client loop thread, await the async client instead")
+
+        future: concurrent.futures.Future = self.submit(awaitable)
+
+        try:
+            return future.result(timeout=self.call_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """
+        Iterate over an async iterator of the client, every item is fetched on the client loop
+
+        :param iterator: Async iterator, e.g. `crypto.client.iter_invoices()`
+        """
+
+        try:
+            while True:
+                try:
+                    yield self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if hasattr(iterator, "aclose") and not self._closed:
+                self.run(iterator.aclose())
+
+    def close(self) -> None:
+        """
+        Close the client and stop the loop thread. Safe to call more than once.
+        Raises RuntimeError if called from the loop thread, e.g. from a sync pay handler,
+        because the thread can't wait for itself
+        """
+
+        if self._closed:
+            return
+
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Can't close SyncICryptoPay from the client loop thread, close it from another thread")
+
+        try:
+            self.run(self.client.close())
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
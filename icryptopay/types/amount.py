@@ -0,0 +1,39 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, Union
+
+from pydantic import ValidationInfo, ValidatorFunctionWrapHandler, WrapValidator
+
+Number = Union[int, float, str, Decimal]
+
+
+def to_decimal(value: Number) -> Decimal:
+    """Convert a number to Decimal without binary float artifacts"""
+
+    if isinstance(value, Decimal):
+        return value
+
+    if isinstance(value, float):
+        return Decimal(repr(value))
+
+    return Decimal(value)
+
+
+def _validate_amount(value: Any, handler: ValidatorFunctionWrapHandler, info: ValidationInfo) -> Any:
+    if value is not None and info.context and info.context.get("use_decimal"):
+        # pydantic turns only ValueError into ValidationError, so the parse errors of Decimal are re-raised as it
+        if isinstance(value, bool):
+            raise ValueError("Amount must be a number, got bool")
+
+        try:
+            return to_decimal(value)
+        except (InvalidOperation, TypeError) as error:
+            raise ValueError(f"Invalid amount {value!r}") from error
+
+    return handler(value)
+
+
+DecimalMode = WrapValidator(_validate_amount)
+"""
+Parses the field to Decimal when the model is validated with `context={"use_decimal": True}`
+and with the annotated type otherwise
+"""
@@ -1,11 +1,16 @@
 from datetime import datetime
+from decimal import Decimal
 
-from pydantic import BaseModel
-from typing import Union
+from pydantic import BaseModel, ConfigDict
+from typing import Union, Annotated
+
+from icryptopay.types.amount import DecimalMode
 
 
 class AppStats(BaseModel):
-    volume: Union[int, float]
+    model_config = ConfigDict(defer_build=True)
+
+    volume: Annotated[Union[int, float, Decimal], DecimalMode]
     conversion: Union[int, float]
     unique_users_count: int
     created_invoice_count: int
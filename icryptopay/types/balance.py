@@ -1,11 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from typing import Union
+from typing import Union, Annotated
+from decimal import Decimal
 
 from icryptopay.enums.asset import Asset
+from icryptopay.types.amount import DecimalMode
 
 
 class Balance(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     currency_code: Union[Asset, str]
-    available: Union[float]
-    onhold: Union[float]
+    available: Annotated[Union[float, Decimal], DecimalMode]
+    onhold: Annotated[Union[float, Decimal], DecimalMode]
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, ConfigDict
+
+from typing import Dict, Optional
+
+from icryptopay.types.invoice import Invoice
+
+
+class BulkInvoiceResult(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    payload: str
+    invoice: Optional[Invoice] = None
+    error_code: Optional[int] = None
+    error: Optional[str] = None
+    resumed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.invoice is not None
+
+
+class BulkInvoiceReport(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    results: Dict[str, BulkInvoiceResult]
+
+    @property
+    def succeeded(self) -> Dict[str, Invoice]:
+        return {payload: result.invoice for payload, result in self.results.items() if result.ok}
+
+    @property
+    def failed(self) -> Dict[str, BulkInvoiceResult]:
+        return {payload: result for payload, result in self.results.items() if not result.ok}
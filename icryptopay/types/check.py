@@ -1,17 +1,21 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from typing import Union, Optional
+from typing import Union, Optional, Annotated
 from datetime import datetime
+from decimal import Decimal
 
 from icryptopay.enums.check import CheckStatus
 from icryptopay.enums.asset import Asset
+from icryptopay.types.amount import DecimalMode
 
 
 class Check(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     check_id: int
     hash: str
     asset: Union[Asset, str]
-    amount: Union[int, float]
+    amount: Annotated[Union[int, float, Decimal], DecimalMode]
     bot_check_url: str
     status: Union[CheckStatus, str]
     created_at: datetime
@@ -1,9 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from typing import Optional
 
 
 class Currency(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     is_blockchain: bool
     is_stablecoin: bool
     is_fiat: bool
@@ -1,36 +1,40 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from typing import Union, Optional, List, Literal
+from typing import Union, Optional, List, Literal, Annotated
 from datetime import datetime
+from decimal import Decimal
 
 from icryptopay.enums.button import PaidButton
 from icryptopay.enums.asset import Asset
 from icryptopay.enums.currency import CurrencyType
 from icryptopay.enums.fiat import FiatType
 from icryptopay.enums.invoice import InvoiceStatus
+from icryptopay.types.amount import DecimalMode
 
 
 class Invoice(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     invoice_id: int
     hash: str
     currency_type: Union[CurrencyType, Literal["crypto", "fiat"]]
     asset: Optional[Union[Asset, str]] = None
     fiat: Optional[Union[FiatType, str]] = None
-    amount: Union[int, float, str]
+    amount: Annotated[Union[int, float, str, Decimal], DecimalMode]
     paid_asset: Optional[Union[Asset, str]] = None
-    paid_amount: Optional[Union[int, float]] = None
-    paid_fiat_rate: Optional[str] = None
+    paid_amount: Annotated[Optional[Union[int, float, Decimal]], DecimalMode] = None
+    paid_fiat_rate: Annotated[Optional[Union[str, Decimal]], DecimalMode] = None
     accepted_assets: Optional[List[Union[Asset, str]]] = None
     fee_asset: Optional[Union[Asset, str]] = None
-    fee_amount: Optional[Union[int, float]] = None
-    fee_in_usd: Optional[Union[int, float]] = None
+    fee_amount: Annotated[Optional[Union[int, float, Decimal]], DecimalMode] = None
+    fee_in_usd: Annotated[Optional[Union[int, float, Decimal]], DecimalMode] = None
     bot_invoice_url: str
     mini_app_invoice_url: str
     web_app_invoice_url: str
     description: Optional[str] = None
     status: Union[InvoiceStatus, str]
     created_at: str
-    paid_usd_rate: Optional[Union[int, float]] = None
+    paid_usd_rate: Annotated[Optional[Union[int, float, Decimal]], DecimalMode] = None
     allow_comments: bool
     allow_anonymous: bool
     expiration_date: Optional[str] = None
@@ -0,0 +1,265 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar, Union
+
+from icryptopay.enums.asset import Asset
+from icryptopay.enums.button import PaidButton
+from icryptopay.enums.check import CheckStatus
+from icryptopay.enums.currency import CurrencyType
+from icryptopay.enums.fiat import FiatType
+from icryptopay.enums.invoice import InvoiceStatus
+from icryptopay.types.amount import to_decimal
+
+L = TypeVar("L", bound="LiteModel")
+
+
+def _members(enum_type: Type[Enum]) -> Dict[Any, Enum]:
+    return {member.value: member for member in enum_type}
+
+
+_ASSETS: Dict[Any, Enum] = _members(Asset)
+_FIATS: Dict[Any, Enum] = _members(FiatType)
+_BUTTONS: Dict[Any, Enum] = _members(PaidButton)
+_CHECK_STATUSES: Dict[Any, Enum] = _members(CheckStatus)
+_CURRENCY_TYPES: Dict[Any, Enum] = _members(CurrencyType)
+_INVOICE_STATUSES: Dict[Any, Enum] = _members(InvoiceStatus)
+
+
+def _amount(value: Any, use_decimal: bool) -> Optional[Union[float, Decimal]]:
+    if value is None:
+        return None
+
+    return to_decimal(value) if use_decimal else float(value)
+
+
+def _text_amount(value: Any, use_decimal: bool) -> Optional[Union[str, Decimal]]:
+    if value is None or not use_decimal:
+        return value
+
+    return to_decimal(value)
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+
+    # datetime.fromisoformat accepts the Z suffix only since Python 3.11
+    return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+
+
+class LiteModel(ABC):
+    """
+    Plain `__slots__` object built straight from the response dict, without pydantic validation.
+    Fields have the types of the full pydantic models, except:
+
+    - known enum values are enum members (equal to the str the full model may hold), unknown values are str
+    - whole amounts are float where the full model returns int, e.g. 10.0 instead of 10
+
+    Amounts the full model keeps as str stay str. In Decimal mode all amounts are Decimal
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls: Type[L], data: Dict[str, Any], use_decimal: bool = False) -> L:
+        """
+        :param data: Object from the API response
+        :param use_decimal: Parse amounts to Decimal
+        """
+
+    @classmethod
+    def from_list(cls: Type[L], items: Iterable[Dict[str, Any]], use_decimal: bool = False) -> List[L]:
+        """
+        :param items: Objects from the API response
+        :param use_decimal: Parse amounts to Decimal
+        """
+
+        return [cls.from_dict(item, use_decimal) for item in items]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+
+        return f"{type(self).__name__}({fields})"
+
+
+class LiteInvoice(LiteModel):
+    """Lite representation of :class:`icryptopay.types.invoice.Invoice`"""
+
+    __slots__ = (
+        "invoice_id",
+        "hash",
+        "currency_type",
+        "asset",
+        "fiat",
+        "amount",
+        "paid_asset",
+        "paid_amount",
+        "paid_fiat_rate",
+        "accepted_assets",
+        "fee_asset",
+        "fee_amount",
+        "fee_in_usd",
+        "bot_invoice_url",
+        "mini_app_invoice_url",
+        "web_app_invoice_url",
+        "description",
+        "status",
+        "created_at",
+        "paid_usd_rate",
+        "allow_comments",
+        "allow_anonymous",
+        "expiration_date",
+        "paid_at",
+        "paid_anonymously",
+        "comment",
+        "hidden_message",
+        "payload",
+        "paid_btn_name",
+        "paid_btn_url",
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], use_decimal: bool = False) -> "LiteInvoice":
+        get = data.get
+        invoice: LiteInvoice = cls.__new__(cls)
+
+        asset: Optional[str] = get("asset")
+        fiat: Optional[str] = get("fiat")
+        paid_asset: Optional[str] = get("paid_asset")
+        fee_asset: Optional[str] = get("fee_asset")
+        accepted_assets: Optional[List[str]] = get("accepted_assets")
+        paid_btn_name: Optional[str] = get("paid_btn_name")
+
+        invoice.invoice_id = data["invoice_id"]
+        invoice.hash = data["hash"]
+        invoice.currency_type = _CURRENCY_TYPES.get(data["currency_type"], data["currency_type"])
+        invoice.asset = _ASSETS.get(asset, asset)
+        invoice.fiat = _FIATS.get(fiat, fiat)
+        invoice.amount = _text_amount(data["amount"], use_decimal)
+        invoice.paid_asset = _ASSETS.get(paid_asset, paid_asset)
+        invoice.paid_amount = _amount(get("paid_amount"), use_decimal)
+        invoice.paid_fiat_rate = _text_amount(get("paid_fiat_rate"), use_decimal)
+        invoice.accepted_assets = (
+            None if accepted_assets is None else [_ASSETS.get(item, item) for item in accepted_assets]
+        )
+        invoice.fee_asset = _ASSETS.get(fee_asset, fee_asset)
+        invoice.fee_amount = _amount(get("fee_amount"), use_decimal)
+        invoice.fee_in_usd = _amount(get("fee_in_usd"), use_decimal)
+        invoice.bot_invoice_url = data["bot_invoice_url"]
+        invoice.mini_app_invoice_url = data["mini_app_invoice_url"]
+        invoice.web_app_invoice_url = data["web_app_invoice_url"]
+        invoice.description = get("description")
+        invoice.status = _INVOICE_STATUSES.get(data["status"], data["status"])
+        invoice.created_at = data["created_at"]
+        invoice.paid_usd_rate = _amount(get("paid_usd_rate"), use_decimal)
+        invoice.allow_comments = data["allow_comments"]
+        invoice.allow_anonymous = data["allow_anonymous"]
+        invoice.expiration_date = get("expiration_date")
+        invoice.paid_at = _datetime(get("paid_at"))
+        invoice.paid_anonymously = get("paid_anonymously")
+        invoice.comment = get("comment")
+        invoice.hidden_message = get("hidden_message")
+        invoice.payload = get("payload")
+        invoice.paid_btn_name = _BUTTONS.get(paid_btn_name, paid_btn_name)
+        invoice.paid_btn_url = get("paid_btn_url")
+
+        return invoice
+
+
+class LiteCheck(LiteModel):
+    """Lite representation of :class:`icryptopay.types.check.Check`"""
+
+    __slots__ = ("check_id", "hash", "asset", "amount", "bot_check_url", "status", "created_at", "activated_at")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], use_decimal: bool = False) -> "LiteCheck":
+        check: LiteCheck = cls.__new__(cls)
+
+        check.check_id = data["check_id"]
+        check.hash = data["hash"]
+        check.asset = _ASSETS.get(data["asset"], data["asset"])
+        check.amount = _amount(data["amount"], use_decimal)
+        check.bot_check_url = data["bot_check_url"]
+        check.status = _CHECK_STATUSES.get(data["status"], data["status"])
+        check.created_at = _datetime(data["created_at"])
+        check.activated_at = _datetime(data.get("activated_at"))
+
+        return check
+
+
+class LiteTransfer(LiteModel):
+    """Lite representation of :class:`icryptopay.types.transfer.Transfer`"""
+
+    __slots__ = ("transfer_id", "user_id", "asset", "amount", "status", "completed_at", "comment")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], use_decimal: bool = False) -> "LiteTransfer":
+        transfer: LiteTransfer = cls.__new__(cls)
+
+        transfer.transfer_id = data["transfer_id"]
+        transfer.user_id = data["user_id"]
+        transfer.asset = _ASSETS.get(data["asset"], data["asset"])
+        transfer.amount = _amount(data["amount"], use_decimal)
+        transfer.status = data["status"]
+        transfer.completed_at = _datetime(data["completed_at"])
+        transfer.comment = data.get("comment")
+
+        return transfer
+
+
+class LiteBalance(LiteModel):
+    """Lite representation of :class:`icryptopay.types.balance.Balance`"""
+
+    __slots__ = ("currency_code", "available", "onhold")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], use_decimal: bool = False) -> "LiteBalance":
+        balance: LiteBalance = cls.__new__(cls)
+
+        balance.currency_code = _ASSETS.get(data["currency_code"], data["currency_code"])
+        balance.available = _amount(data["available"], use_decimal)
+        balance.onhold = _amount(data["onhold"], use_decimal)
+
+        return balance
+
+
+class LitePage:
+    """getInvoices/getChecks/getTransfers result with lite items"""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[LiteModel]) -> None:
+        self.items = items
+
+
+class LiteResult:
+    """
+    Result type for `BaseClient._make_request` selecting lite parsing
+
+    :param model: Lite model of the result items
+    :param page: The result is an {"items": [...]} page, otherwise a list
+    """
+
+    __slots__ = ("model", "page")
+
+    def __init__(self, model: Type[LiteModel], page: bool = False) -> None:
+        self.model = model
+        self.page = page
+
+    def parse(self, result: Any, use_decimal: bool = False) -> Union[LitePage, List[LiteModel]]:
+        if self.page:
+            return LitePage(items=self.model.from_list(result["items"], use_decimal))
+
+        return self.model.from_list(result, use_decimal)
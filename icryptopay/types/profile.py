@@ -1,7 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Profile(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     app_id: int
     name: str
     payment_processing_bot_username: str
@@ -1,15 +1,19 @@
-from typing import Union
+from decimal import Decimal
+from typing import Union, Annotated
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from icryptopay.enums.asset import Asset
 from icryptopay.enums.fiat import FiatType
+from icryptopay.types.amount import DecimalMode
 
 
 class ExchangeRate(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     is_valid: bool
     is_crypto: bool
     is_fiat: bool
     source: Union[Asset, FiatType]
     target: FiatType
-    rate: Union[float]
+    rate: Annotated[Union[float, Decimal], DecimalMode]
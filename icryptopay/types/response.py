@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict
+
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class APIError(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    code: int
+    name: str
+
+
+class APIResponse(BaseModel, Generic[T]):
+    model_config = ConfigDict(defer_build=True)
+
+    ok: bool
+    result: Optional[T] = None
+    error: Optional[APIError] = None
+
+
+class ItemsPage(BaseModel, Generic[T]):
+    model_config = ConfigDict(defer_build=True)
+
+    items: List[T]
@@ -0,0 +1,82 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PoolStats(BaseModel):
+    """in_use, idle and waiting are read from aiohttp internals and are None if they are not available"""
+
+    model_config = ConfigDict(defer_build=True)
+
+    limit: int
+    limit_per_host: int
+    in_use: Optional[int] = None
+    idle: Optional[int] = None
+    waiting: Optional[int] = None
+    queued_count: int
+    queue_wait_total: float
+    queue_wait_max: float
+
+
+class RateLimiterStats(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    queue_depth: Dict[str, int]
+    acquired_count: int
+    waited_count: int
+    wait_total: float
+    wait_max: float
+
+
+class CacheStats(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    hits: int
+    stale_hits: int
+    misses: int
+    coalesced: int
+    refreshes: int
+    refresh_errors: int
+
+
+class DispatcherStats(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    queue_depth: int
+    queue_size: int
+    received_count: int
+    duplicates_count: int
+    processed_count: int
+    failed_count: int
+    handler_time_total: float
+    handler_time_max: float
+
+
+class WatcherStats(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    watched: int
+    requests_count: int
+    failed_requests_count: int
+    polled_count: int
+    paid_count: int
+    expired_count: int
+    poll_lag_max: float
+
+
+class SyncResult(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    added: int
+    updated: int
+    deleted: int
+
+
+class BalanceTrackerStats(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    refreshes: int
+    invalidations: int
+    rejected_count: int
+    in_flight: int
+    snapshot_age: Optional[float]
@@ -1,16 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from typing import Union, Optional
+from typing import Union, Optional, Annotated
 from datetime import datetime
+from decimal import Decimal
 
 from icryptopay.enums.asset import Asset
+from icryptopay.types.amount import DecimalMode
 
 
 class Transfer(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     transfer_id: int
     user_id: int
     asset: Union[Asset, str]
-    amount: Union[int, float]
+    amount: Annotated[Union[int, float, Decimal], DecimalMode]
     status: str
     completed_at: datetime
     comment: Optional[str] = None
@@ -1,11 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from typing import Optional
 
 from icryptopay.types.invoice import Invoice
 
 
 class Update(BaseModel):
-    update_id: int
+    """Webhook update. update_id is None for updates made by InvoiceWatcher from polled invoices"""
+
+    model_config = ConfigDict(defer_build=True)
+
+    update_id: Optional[int] = None
     update_type: str
     request_date: datetime
     payload: Invoice
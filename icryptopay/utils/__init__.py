@@ -1 +1 @@
-from .exchange import get_rate, get_rate_summ
+from .exchange import RateTable, get_rate, get_rate_summ
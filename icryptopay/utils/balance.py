@@ -0,0 +1,192 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from icryptopay.enums.asset import Asset
+from icryptopay.exceptions import CodeErrorFactory, CryptoPayAPIError
+from icryptopay.types.amount import Number, to_decimal
+from icryptopay.types.balance import Balance
+from icryptopay.types.stats import BalanceTrackerStats
+
+
+class BalanceTracker:
+    """
+    Balance snapshot with local accounting of payouts.
+    The snapshot is fetched with getBalance at most every `ttl` seconds. Amounts of transfers and checks
+    in flight are reserved, so concurrent payouts can't spend the same funds, and a payout larger
+    than the available balance is rejected with INSUFFICIENT_FUNDS without a request.
+    Completed payouts are applied to the snapshot, failed ones of unknown outcome invalidate it
+
+        crypto = ICryptoPay(token="TOKEN", balance_tracker=BalanceTracker())
+    """
+
+    def __init__(self, ttl: float = 30.0) -> None:
+        """
+        :param ttl: Seconds the snapshot is used before it is reconciled with getBalance
+        """
+
+        self.ttl = ttl
+
+        self._balances: Dict[str, Tuple[Decimal, Decimal]] = {}
+        self._types: Dict[str, type] = {}
+        self._reserved: Dict[str, Decimal] = {}
+        self._fetched_at: Optional[float] = None
+        self._generation = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self._refreshes = 0
+        self._invalidations = 0
+        self._rejected_count = 0
+        self._in_flight = 0
+
+    def invalidate(self) -> None:
+        """Reconcile with getBalance before the next payout, e.g. after an invoice is paid"""
+
+        if self._fetched_at is not None:
+            self._invalidations += 1
+
+        self._fetched_at = None
+
+    async def refresh(self, fetch: Callable[[], Awaitable[List[Balance]]]) -> None:
+        """
+        Replace the snapshot with getBalance. Concurrent refreshes share one request
+
+        :param fetch: Coroutine function returning the balance
+        """
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh(fetch))
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+
+        await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self, fetch: Callable[[], Awaitable[List[Balance]]]) -> None:
+        balances: List[Balance] = await fetch()
+
+        self._refreshes += 1
+        self._generation += 1
+        self._fetched_at = time.monotonic()
+        self._balances = {
+            str(balance.currency_code): (to_decimal(balance.available), to_decimal(balance.onhold))
+            for balance in balances
+        }
+        self._types = {str(balance.currency_code): type(balance.available) for balance in balances}
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_task = None
+
+        if not task.cancelled():
+            task.exception()
+
+    async def _ensure_fresh(
+            self,
+            fetch: Callable[[], Awaitable[List[Balance]]]
+    ) -> Dict[str, Tuple[Decimal, Decimal]]:
+        if self._fetched_at is None or time.monotonic() - self._fetched_at >= self.ttl:
+            await self.refresh(fetch)
+
+        # invalidate() may be called while the refresh is awaited, the snapshot is fetched again then
+        while self._fetched_at is None:
+            await self.refresh(fetch)
+
+        return self._balances
+
+    async def get_balances(self, fetch: Callable[[], Awaitable[List[Balance]]]) -> List[Balance]:
+        """
+        Returns the balance with reserved amounts moved from available to onhold
+
+        :param fetch: Coroutine function returning the balance
+        """
+
+        snapshot: Dict[str, Tuple[Decimal, Decimal]] = await self._ensure_fresh(fetch)
+        balances: List[Balance] = []
+
+        for asset, (available, onhold) in snapshot.items():
+            reserved: Decimal = self._reserved.get(asset, Decimal(0))
+            number_type: type = self._types.get(asset, Decimal)
+
+            balances.append(Balance(
+                currency_code=asset,
+                available=number_type(available - reserved),
+                onhold=number_type(onhold + reserved)
+            ))
+
+        return balances
+
+    def get_available(self, asset: Union[Asset, str]) -> Optional[Decimal]:
+        """
+        Returns the available amount minus reservations, None if there is no snapshot
+
+        :param asset: Asset
+        """
+
+        if self._fetched_at is None:
+            return None
+
+        available, _ = self._balances.get(str(asset), (Decimal(0), Decimal(0)))
+
+        return available - self._reserved.get(str(asset), Decimal(0))
+
+    @asynccontextmanager
+    async def reserve(
+            self,
+            asset: Union[Asset, str],
+            amount: Number,
+            fetch: Callable[[], Awaitable[List[Balance]]],
+            hold: bool = False
+    ) -> AsyncIterator[None]:
+        """
+        Reserve the amount while the payout request is in flight
+
+        :param asset: Asset
+        :param amount: Amount
+        :param fetch: Coroutine function returning the balance
+        :param hold: The amount goes on hold instead of leaving the balance, like a created check
+        """
+
+        asset = str(asset)
+        amount = to_decimal(amount)
+
+        snapshot: Dict[str, Tuple[Decimal, Decimal]] = await self._ensure_fresh(fetch)
+        available, _ = snapshot.get(asset, (Decimal(0), Decimal(0)))
+
+        if amount > available - self._reserved.get(asset, Decimal(0)):
+            self._rejected_count += 1
+            raise CryptoPayAPIError(400, "INSUFFICIENT_FUNDS")
+
+        self._reserved[asset] = self._reserved.get(asset, Decimal(0)) + amount
+        self._in_flight += 1
+        generation: int = self._generation
+
+        try:
+            yield
+        except CodeErrorFactory as error:
+            # Other API errors mean the payout was rejected and the balance didn't change
+            if error.name == "INSUFFICIENT_FUNDS":
+                self.invalidate()
+            raise
+        except BaseException:
+            # Network errors and cancellation: the payout may have been made
+            self.invalidate()
+            raise
+        else:
+            # A snapshot fetched while the request was in flight may already include the payout
+            if generation != self._generation:
+                self.invalidate()
+            elif asset in self._balances:
+                available, onhold = self._balances[asset]
+                self._balances[asset] = (available - amount, onhold + amount if hold else onhold)
+        finally:
+            self._reserved[asset] -= amount
+            self._in_flight -= 1
+
+    def get_stats(self) -> BalanceTrackerStats:
+        return BalanceTrackerStats(
+            refreshes=self._refreshes,
+            invalidations=self._invalidations,
+            rejected_count=self._rejected_count,
+            in_flight=self._in_flight,
+            snapshot_age=time.monotonic() - self._fetched_at if self._fetched_at is not None else None
+        )
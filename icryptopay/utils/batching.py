@@ -0,0 +1,124 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterator, List, Optional, Sequence, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+ID_CHUNK_SIZE: int = 100
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Split a sequence into chunks of `size` items"""
+
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def gather_chunks(
+        fetch: Callable[[List[K]], Awaitable[List[T]]],
+        keys: Sequence[K],
+        chunk_size: int = ID_CHUNK_SIZE,
+        concurrency: int = 4
+) -> List[T]:
+    """
+    Fetch items by a long list of IDs in parallel bounded requests
+
+    :param fetch: Coroutine function fetching items by a list of IDs
+    :param keys: IDs
+    :param chunk_size: IDs per request
+    :param concurrency: Maximum number of simultaneous requests, at least 1
+    """
+
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk: Sequence[K]) -> List[T]:
+        async with semaphore:
+            return await fetch(list(chunk))
+
+    pages: List[List[T]] = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunked(keys, chunk_size)))
+
+    return [item for page in pages for item in page]
+
+
+class BatchLoader(Generic[K, T]):
+    """
+    Coalesces lookups by ID made within `window` seconds into one request
+
+        loader = BatchLoader(fetch=fetch_invoices_by_ids)
+        invoice = await loader.load(invoice_id)
+    """
+
+    def __init__(
+            self,
+            fetch: Callable[[List[K]], Awaitable[Dict[K, T]]],
+            window: float = 0.005,
+            max_batch_size: int = ID_CHUNK_SIZE
+    ) -> None:
+        """
+        :param fetch: Coroutine function returning found items by ID
+        :param window: Seconds to wait for more lookups before the request is sent
+        :param max_batch_size: Send the request as soon as the batch has this number of IDs
+        """
+
+        self.fetch = fetch
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        self._batch: Dict[K, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop keeps only weak references to tasks, so requests in flight are referenced here
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[T]:
+        """
+        Returns item by ID, None if it is not found
+
+        :param key: ID
+        """
+
+        future: Optional[asyncio.Future] = self._batch.get(key)
+
+        if future is None:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            future = self._batch[key] = loop.create_future()
+
+            if len(self._batch) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._batch = self._batch, {}
+        task: asyncio.Task = asyncio.ensure_future(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[K, asyncio.Future]) -> None:
+        try:
+            items: Dict[K, T] = await self.fetch(list(batch))
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(items.get(key))
+
+    async def close(self) -> None:
+        """Send the pending batch and wait for requests in flight"""
+
+        if self._batch:
+            self._dispatch()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from icryptopay.types.stats import CacheStats
+
+
+class TTLCache:
+    """
+    Async cache for reference data (exchange rates, currencies).
+    Fresh values are returned for `ttl` seconds, then for `stale_ttl` more seconds the stale value
+    is returned while it is refreshed in the background. Concurrent misses share one fetch
+    """
+
+    def __init__(self, ttl: float = 60.0, stale_ttl: float = 300.0) -> None:
+        """
+        :param ttl: Seconds a value is fresh
+        :param stale_ttl: Seconds a stale value may be returned while it is refreshed
+        """
+
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns cached value or fetches it
+
+        :param key: Cache key
+        :param fetch: Coroutine function fetching the value
+        """
+
+        entry: Optional[Tuple[Any, float]] = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age: float = time.monotonic() - fetched_at
+
+            if age < self.ttl:
+                self._hits += 1
+                return value
+
+            if age < self.ttl + self.stale_ttl:
+                self._stale_hits += 1
+
+                if key not in self._inflight:
+                    self._refreshes += 1
+                    self._fetch(key=key, fetch=fetch).add_done_callback(self._on_refresh_done)
+
+                return value
+
+        task: Optional[asyncio.Task] = self._inflight.get(key)
+
+        if task is None:
+            self._misses += 1
+            task = self._fetch(key=key, fetch=fetch)
+        else:
+            self._coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        async def run() -> Any:
+            try:
+                value: Any = await fetch()
+                self._entries[key] = (value, time.monotonic())
+                return value
+            finally:
+                del self._inflight[key]
+
+        task: asyncio.Task = asyncio.get_running_loop().create_task(run())
+        self._inflight[key] = task
+
+        return task
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self._refresh_errors += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop cached value
+
+        :param key: Cache key, all values are dropped if not passed
+        """
+
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            stale_hits=self._stale_hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            refreshes=self._refreshes,
+            refresh_errors=self._refresh_errors
+        )
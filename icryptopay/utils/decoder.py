@@ -0,0 +1,78 @@
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional, TYPE_CHECKING
+
+from icryptopay.types.response import APIResponse
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+
+class JSONDecoder:
+    """Decodes response body with the stdlib json module"""
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class DecimalJSONDecoder(JSONDecoder):
+    """Decodes JSON numbers with a fraction to Decimal"""
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data, parse_float=Decimal)
+
+
+class OrjsonDecoder(JSONDecoder):
+    """
+    Decodes response body with orjson. Requires `pip install orjson`.
+    Speeds up dict responses (lite models, webhooks), typed responses are faster without a decoder
+    """
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._loads = orjson.loads
+
+    def decode(self, data: bytes) -> Any:
+        return self._loads(data)
+
+
+class MsgspecDecoder(JSONDecoder):
+    """Decodes response body with msgspec. Requires `pip install msgspec`"""
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+
+    def decode(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+def get_default_decoder(use_decimal: bool = False) -> Optional[JSONDecoder]:
+    """
+    Returns decoder for typed responses: None, which means the body is validated by pydantic
+    straight from bytes. It is faster than decoding with orjson or msgspec and validating the dict,
+    so those decoders are only used when passed explicitly.
+    In Decimal mode numbers must not pass through float, so the body is decoded with DecimalJSONDecoder
+    """
+
+    if use_decimal:
+        return DecimalJSONDecoder()
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_response_adapter(result_type: Any) -> "TypeAdapter":
+    """
+    Returns cached TypeAdapter validating the whole response envelope.
+    The adapter and the models it uses are built on the first request of the result type
+
+    :param result_type: Type of the response result
+    """
+
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(APIResponse[result_type])
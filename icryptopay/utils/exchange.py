@@ -1,11 +1,14 @@
-from typing import List, Union
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
+from icryptopay.types.amount import Number, to_decimal
 from icryptopay.types.rates import ExchangeRate
 
 
 def get_rate(source: str, target: str, rates: List[ExchangeRate]) -> ExchangeRate:
     """
-    Get rate by source and target
+    Get rate by source and target. Scans the list, use RateTable for repeated lookups.
+    Raises ValueError if there is no such rate
 
     :param source: Source asset
     :param target: Target asset
@@ -16,6 +19,8 @@ def get_rate(source: str, target: str, rates: List[ExchangeRate]) -> ExchangeRat
         if rate.source == source and rate.target == target:
             return rate
 
+    raise ValueError(f"No exchange rate for {source}/{target}")
+
 
 def get_rate_summ(summ: Union[int, float], rate: ExchangeRate) -> Union[int, float]:
     """
@@ -26,3 +31,108 @@ def get_rate_summ(summ: Union[int, float], rate: ExchangeRate) -> Union[int, flo
     """
 
     return summ / rate.rate
+
+
+class RateTable:
+    """
+    Exchange rates indexed by (source, target).
+    Pairs missing in the getExchangeRates response are derived from inverse rates
+    and cross rates through the pivot currency
+    """
+
+    def __init__(self, rates: Iterable[ExchangeRate], pivot: str = "USD") -> None:
+        """
+        :param rates: getExchangeRates result
+        :param pivot: Currency used for cross rates
+        """
+
+        self.pivot = pivot
+        self._rates: Dict[Tuple[str, str], Decimal] = {}
+        self._derived: Dict[Tuple[str, str], Optional[Decimal]] = {}
+
+        for rate in rates:
+            if rate.is_valid and rate.rate:
+                self._rates[(str(rate.source), str(rate.target))] = to_decimal(rate.rate)
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def __contains__(self, pair: Tuple[str, str]) -> bool:
+        return self._find(source=str(pair[0]), target=str(pair[1])) is not None
+
+    def _find_direct(self, source: str, target: str) -> Optional[Decimal]:
+        if source == target:
+            return Decimal(1)
+
+        rate: Optional[Decimal] = self._rates.get((source, target))
+
+        if rate is not None:
+            return rate
+
+        inverse: Optional[Decimal] = self._rates.get((target, source))
+
+        if inverse is not None:
+            return 1 / inverse
+
+        return None
+
+    def _find(self, source: str, target: str) -> Optional[Decimal]:
+        rate: Optional[Decimal] = self._rates.get((source, target))
+
+        if rate is not None:
+            return rate
+
+        if (source, target) in self._derived:
+            return self._derived[(source, target)]
+
+        rate = self._find_direct(source=source, target=target)
+
+        if rate is None:
+            to_pivot: Optional[Decimal] = self._find_direct(source=source, target=self.pivot)
+            from_pivot: Optional[Decimal] = self._find_direct(source=self.pivot, target=target)
+
+            if to_pivot is not None and from_pivot is not None:
+                rate = to_pivot * from_pivot
+
+        self._derived[(source, target)] = rate
+
+        return rate
+
+    def get_rate(self, source: str, target: str) -> Decimal:
+        """
+        Returns price of one `source` in `target`
+
+        :param source: Source asset or fiat
+        :param target: Target asset or fiat
+        """
+
+        rate: Optional[Decimal] = self._find(source=str(source), target=str(target))
+
+        if rate is None:
+            raise ValueError(f"No exchange rate for {source}/{target}")
+
+        return rate
+
+    def convert(self, amount: Number, source: str, target: str) -> Decimal:
+        """
+        Convert amount of `source` to `target`
+
+        :param amount: Amount in source
+        :param source: Source asset or fiat
+        :param target: Target asset or fiat
+        """
+
+        return to_decimal(amount) * self.get_rate(source=source, target=target)
+
+    def convert_many(self, amounts: Iterable[Number], source: str, target: str) -> List[Decimal]:
+        """
+        Convert amounts of `source` to `target` with a single rate lookup
+
+        :param amounts: Amounts in source
+        :param source: Source asset or fiat
+        :param target: Target asset or fiat
+        """
+
+        rate: Decimal = self.get_rate(source=source, target=target)
+
+        return [to_decimal(amount) * rate for amount in amounts]
@@ -0,0 +1,187 @@
+import time
+from types import SimpleNamespace
+from typing import Optional, Sequence, Tuple, Union
+
+from aiohttp import (
+    ClientSession,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceDnsResolveHostEndParams,
+    TraceRequestChunkSentParams,
+    TraceRequestEndParams
+)
+
+from icryptopay.enums.method import APIMethod
+
+
+class RequestTrace:
+    """
+    One API call, including its retries. Timings are in seconds and describe the last attempt,
+    network timings are None if the phase didn't happen (e.g. a pooled connection was reused)
+    or the session was passed by the user and has no tracing
+    """
+
+    __slots__ = (
+        "api_method",
+        "http_method",
+        "url",
+        "attempts",
+        "status",
+        "error",
+        "request_size",
+        "response_size",
+        "started_at",
+        "attempt_started_at",
+        "dns_time",
+        "connect_time",
+        "ttfb",
+        "decode_time",
+        "validate_time",
+        "duration",
+    )
+
+    def __init__(self, api_method: Optional[APIMethod], http_method: str, url: str) -> None:
+        self.api_method = api_method
+        self.http_method = http_method
+        self.url = url
+        self.attempts = 0
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.request_size = 0
+        self.response_size = 0
+        self.started_at: float = time.perf_counter()
+        self.attempt_started_at: float = self.started_at
+        self.dns_time: Optional[float] = None
+        self.connect_time: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.decode_time: Optional[float] = None
+        self.validate_time: Optional[float] = None
+        self.duration: Optional[float] = None
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    @property
+    def method_name(self) -> str:
+        """API method name, e.g. getInvoices"""
+
+        if self.api_method is None:
+            return "unknown"
+
+        return self.api_method.rsplit("/", 1)[-1]
+
+    @property
+    def error_name(self) -> Optional[str]:
+        """Crypto Pay error name (e.g. INSUFFICIENT_FUNDS) or exception class name"""
+
+        if self.error is None:
+            return None
+
+        return getattr(self.error, "name", None) or type(self.error).__name__
+
+    def start_attempt(self) -> None:
+        self.attempts += 1
+        self.attempt_started_at = time.perf_counter()
+        self.status = None
+        self.request_size = 0
+        self.response_size = 0
+        self.dns_time = None
+        self.connect_time = None
+        self.ttfb = None
+        self.decode_time = None
+        self.validate_time = None
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.duration = time.perf_counter() - self.started_at
+
+
+class Instrumentation:
+    """
+    Base class of request hooks. Override the hooks you need, they must not block.
+    Hooks are called once per API call, retries are counted in `trace.attempts`
+    """
+
+    def on_request_start(self, trace: RequestTrace) -> None:
+        pass
+
+    def on_request_end(self, trace: RequestTrace) -> None:
+        pass
+
+    def on_request_error(self, trace: RequestTrace, error: BaseException) -> None:
+        pass
+
+
+InstrumentationArg = Optional[Union[Instrumentation, Sequence[Instrumentation]]]
+
+
+def normalize_instrumentation(instrumentation: InstrumentationArg) -> Tuple[Instrumentation, ...]:
+    """Returns instrumentations as a tuple, empty if instrumentation is disabled"""
+
+    if instrumentation is None:
+        return ()
+
+    if isinstance(instrumentation, Instrumentation):
+        return (instrumentation,)
+
+    return tuple(instrumentation)
+
+
+def get_trace_config() -> TraceConfig:
+    """
+    Trace config filling RequestTrace network timings.
+    The trace is passed to the request as `trace_request_ctx`, requests without it are ignored
+    """
+
+    async def on_dns_start(session: ClientSession, context: SimpleNamespace, params) -> None:
+        context.dns_started_at = time.perf_counter()
+
+    async def on_dns_end(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceDnsResolveHostEndParams
+    ) -> None:
+        trace: Optional[RequestTrace] = context.trace_request_ctx
+
+        if isinstance(trace, RequestTrace):
+            trace.dns_time = time.perf_counter() - context.dns_started_at
+
+    async def on_connect_start(session: ClientSession, context: SimpleNamespace, params) -> None:
+        context.connect_started_at = time.perf_counter()
+
+    async def on_connect_end(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceConnectionCreateEndParams
+    ) -> None:
+        trace: Optional[RequestTrace] = context.trace_request_ctx
+
+        if isinstance(trace, RequestTrace):
+            trace.connect_time = time.perf_counter() - context.connect_started_at
+
+    async def on_chunk_sent(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceRequestChunkSentParams
+    ) -> None:
+        trace: Optional[RequestTrace] = context.trace_request_ctx
+
+        if isinstance(trace, RequestTrace):
+            trace.request_size += len(params.chunk)
+
+    async def on_request_end(session: ClientSession, context: SimpleNamespace, params: TraceRequestEndParams) -> None:
+        trace: Optional[RequestTrace] = context.trace_request_ctx
+
+        if isinstance(trace, RequestTrace):
+            trace.ttfb = time.perf_counter() - trace.attempt_started_at
+
+    trace_config: TraceConfig = TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connect_start)
+    trace_config.on_connection_create_end.append(on_connect_end)
+    trace_config.on_request_chunk_sent.append(on_chunk_sent)
+    trace_config.on_request_end.append(on_request_end)
+
+    return trace_config
@@ -0,0 +1,26 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from icryptopay.types.amount import Number, to_decimal
+
+
+def format_amount(amount: Number) -> str:
+    """
+    Format amount for request params without scientific notation
+
+    :param amount: Amount
+    """
+
+    return format(to_decimal(amount).normalize(), "f")
+
+
+def quantize_amount(amount: Number, decimals: int, rounding: str = ROUND_HALF_UP) -> Decimal:
+    """
+    Round amount to the currency precision
+
+    :param amount: Amount
+    :param decimals: Digits after the decimal point, Currency.decimals
+    :param rounding: Decimal rounding mode
+    """
+
+    return to_decimal(amount).quantize(Decimal(1).scaleb(-decimals), rounding=rounding)
+
@@ -0,0 +1,59 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE: int = 1000
+
+
+async def paginate(
+        fetch: Callable[[int, int], Awaitable[List[T]]],
+        page_size: int = 100,
+        prefetch: bool = False,
+        limit: Optional[int] = None
+) -> AsyncIterator[T]:
+    """
+    Iterate over offset paginated items page by page.
+    Only the current page (and the next one with prefetch) is held in memory
+
+    :param fetch: Coroutine function fetching a page by offset and count
+    :param page_size: Items per request, up to 1000
+    :param prefetch: Fetch the next page while the current one is consumed
+    :param limit: Stop after this number of items
+    """
+
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    offset: int = 0
+    yielded: int = 0
+    next_page: Optional[asyncio.Task] = None
+    page: List[T] = await fetch(offset, page_size)
+
+    try:
+        while True:
+            has_next: bool = len(page) >= page_size and (limit is None or yielded + len(page) < limit)
+
+            if has_next and prefetch:
+                next_page = asyncio.ensure_future(fetch(offset + page_size, page_size))
+
+            for item in page:
+                if limit is not None and yielded >= limit:
+                    return
+
+                yield item
+                yielded += 1
+
+            if not has_next:
+                return
+
+            offset += page_size
+
+            if next_page is not None:
+                page, next_page = await next_page, None
+            else:
+                page = await fetch(offset, page_size)
+    finally:
+        if next_page is not None:
+            next_page.cancel()
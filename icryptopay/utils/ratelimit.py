@@ -0,0 +1,235 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+from icryptopay.enums.method import APIMethod
+from icryptopay.enums.priority import RequestPriority
+from icryptopay.types.stats import RateLimiterStats
+
+READ_METHODS: Tuple[APIMethod, ...] = (
+    APIMethod.GET_ME,
+    APIMethod.GET_STATS,
+    APIMethod.GET_BALANCE,
+    APIMethod.GET_EXCHANGE_RATES,
+    APIMethod.GET_CURRENCIES,
+    APIMethod.GET_INVOICES,
+    APIMethod.GET_TRANSFERS,
+    APIMethod.GET_CHECKS,
+)
+
+_priority: ContextVar[Optional[RequestPriority]] = ContextVar("icryptopay_request_priority", default=None)
+
+
+class TokenBucket:
+    """Token bucket refilled with `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._tokens + (now - self._updated_at) * self.rate, self.capacity)
+        self._updated_at = now
+
+    def get_delay(self, now: float) -> float:
+        """Seconds until a token is available"""
+
+        self._refill(now)
+
+        if self._tokens >= 1:
+            return 0.0
+
+        return (1 - self._tokens) / self.rate
+
+    def consume(self) -> None:
+        self._tokens -= 1
+
+    def drain(self, seconds: float) -> None:
+        """Empty the bucket for `seconds`, e.g. after a 429 response"""
+
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    """
+    Client-side request scheduler.
+    Every request takes a token from the bucket of its API method (if configured) and from the global bucket.
+    Waiting requests are served by priority lanes, so reads are not queued behind bulk creates
+    """
+
+    def __init__(
+            self,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            method_limits: Optional[Dict[APIMethod, Tuple[float, int]]] = None,
+            priorities: Optional[Dict[APIMethod, RequestPriority]] = None
+    ) -> None:
+        """
+        :param rate: Requests per second for all methods, None for no global limit
+        :param burst: Global bucket capacity, defaults to rate
+        :param method_limits: Rate and burst per API method
+        :param priorities: Default lane per API method. Reads are HIGH, other methods are NORMAL
+        """
+
+        self._global: Optional[TokenBucket] = None
+
+        if rate is not None:
+            self._global = TokenBucket(rate=rate, capacity=burst or max(int(rate), 1))
+
+        self._buckets: Dict[APIMethod, TokenBucket] = {
+            method: TokenBucket(rate=method_rate, capacity=method_burst)
+            for method, (method_rate, method_burst) in (method_limits or {}).items()
+        }
+
+        self._priorities: Dict[APIMethod, RequestPriority] = dict.fromkeys(READ_METHODS, RequestPriority.HIGH)
+        self._priorities.update(priorities or {})
+
+        self._lanes: Dict[RequestPriority, Dict[Optional[APIMethod], Deque[asyncio.Future]]] = {
+            priority: {} for priority in RequestPriority
+        }
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self._acquired_count = 0
+        self._waited_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @staticmethod
+    @contextmanager
+    def priority(priority: RequestPriority) -> Iterator[None]:
+        """
+        Run requests made inside the block in the given lane
+
+            with RateLimiter.priority(RequestPriority.LOW):
+                await crypto.create_invoice(...)
+        """
+
+        token = _priority.set(priority)
+
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def _get_delay(self, api_method: Optional[APIMethod], now: float) -> float:
+        delay: float = 0.0
+
+        if self._global is not None:
+            delay = self._global.get_delay(now)
+
+        bucket: Optional[TokenBucket] = self._buckets.get(api_method)
+
+        if bucket is not None:
+            delay = max(delay, bucket.get_delay(now))
+
+        return delay
+
+    def _consume(self, api_method: Optional[APIMethod]) -> None:
+        if self._global is not None:
+            self._global.consume()
+
+        bucket: Optional[TokenBucket] = self._buckets.get(api_method)
+
+        if bucket is not None:
+            bucket.consume()
+
+        self._acquired_count += 1
+
+    def _has_waiters(self) -> bool:
+        return any(queue for lane in self._lanes.values() for queue in lane.values())
+
+    async def acquire(self, api_method: Optional[APIMethod] = None) -> None:
+        """
+        Wait for a token
+
+        :param api_method: API method of the request
+        """
+
+        now: float = time.monotonic()
+
+        if not self._has_waiters() and self._get_delay(api_method, now) == 0:
+            self._consume(api_method)
+            return
+
+        priority: Optional[RequestPriority] = _priority.get()
+
+        if priority is None:
+            priority = self._priorities.get(api_method, RequestPriority.NORMAL)
+
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._lanes[priority].setdefault(api_method, deque()).append(waiter)
+
+        self._dispatch()
+        await waiter
+
+        wait: float = time.monotonic() - now
+        self._waited_count += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+
+    def _dispatch(self) -> None:
+        """Grant tokens to waiters lane by lane and schedule the next wake up"""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now: float = time.monotonic()
+        next_delay: Optional[float] = None
+
+        for lane in self._lanes.values():
+            for api_method, queue in lane.items():
+                while queue:
+                    if queue[0].done():
+                        queue.popleft()
+                        continue
+
+                    delay: float = self._get_delay(api_method, now)
+
+                    if delay > 0:
+                        next_delay = delay if next_delay is None else min(next_delay, delay)
+                        break
+
+                    self._consume(api_method)
+                    queue.popleft().set_result(None)
+
+            if next_delay is not None and self._global is not None and self._global.get_delay(now) > 0:
+                # Lower lanes must not take global tokens before this lane
+                break
+
+        if next_delay is not None:
+            self._timer = asyncio.get_running_loop().call_later(next_delay, self._dispatch)
+
+    def penalize(self, api_method: Optional[APIMethod], seconds: float) -> None:
+        """
+        Stop sending requests of the API method for `seconds`, e.g. after a 429 response
+
+        :param api_method: API method
+        :param seconds: Pause duration
+        """
+
+        bucket: Optional[TokenBucket] = self._buckets.get(api_method, self._global)
+
+        if bucket is not None:
+            bucket.drain(seconds)
+
+    def get_stats(self) -> RateLimiterStats:
+        """Returns queue depth per lane and waiting time"""
+
+        return RateLimiterStats(
+            queue_depth={
+                priority.name: sum(len(queue) for queue in lane.values())
+                for priority, lane in self._lanes.items()
+            },
+            acquired_count=self._acquired_count,
+            waited_count=self._waited_count,
+            wait_total=self._wait_total,
+            wait_max=self._wait_max
+        )
@@ -0,0 +1,175 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+from aiohttp import ClientConnectionError
+
+from icryptopay.enums.method import APIMethod
+from icryptopay.exceptions import CodeErrorFactory
+
+IDEMPOTENT_METHODS: FrozenSet[APIMethod] = frozenset({
+    APIMethod.GET_ME,
+    APIMethod.GET_STATS,
+    APIMethod.GET_BALANCE,
+    APIMethod.GET_EXCHANGE_RATES,
+    APIMethod.GET_CURRENCIES,
+    APIMethod.GET_INVOICES,
+    APIMethod.GET_TRANSFERS,
+    APIMethod.GET_CHECKS,
+    APIMethod.TRANSFER,  # Deduplicated by spend_id
+})
+RETRY_STATUSES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse Retry-After header value into seconds
+
+    :param value: Delay in seconds or HTTP date
+    """
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((date - datetime.now(tz=timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryBudget:
+    """
+    Limits retries to a share of the requests, so retries can not amplify an outage.
+    Every request deposits `ratio` tokens, every retry withdraws one token.
+    `min_per_second` tokens are added over time to allow retries on low traffic
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+
+        self.exhausted_count = 0
+
+    def _refill(self) -> None:
+        now: float = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated_at) * self.min_per_second, self.max_tokens)
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        """Deposit tokens for a new request"""
+
+        self._refill()
+        self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_withdraw(self) -> bool:
+        """Withdraw a token for a retry. Returns False if the budget is exhausted"""
+
+        self._refill()
+
+        if self._tokens < 1:
+            self.exhausted_count += 1
+            return False
+
+        self._tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff and full jitter.
+    Override `is_retryable_method`, `is_retryable_error` or `get_delay` to customize
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            backoff_base: float = 0.5,
+            backoff_max: float = 10.0,
+            jitter: bool = True,
+            retry_after_max: float = 60.0,
+            methods: FrozenSet[APIMethod] = IDEMPOTENT_METHODS,
+            statuses: FrozenSet[int] = RETRY_STATUSES,
+            budget: Optional[RetryBudget] = None
+    ) -> None:
+        """
+        :param max_attempts: Attempts including the first one, 1 disables retries
+        :param backoff_base: Delay before the first retry
+        :param backoff_max: Maximum delay between attempts
+        :param jitter: Randomize delays between zero and the backoff
+        :param retry_after_max: Don't retry if the server asks to wait longer
+        :param methods: API methods safe to retry
+        :param statuses: HTTP statuses and API error codes to retry
+        :param budget: Retry budget, shared by all requests of the policy
+        """
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_after_max = retry_after_max
+        self.methods = methods
+        self.statuses = statuses
+        self.budget = budget or RetryBudget()
+
+    def is_retryable_method(self, api_method: Optional[APIMethod]) -> bool:
+        return api_method in self.methods
+
+    def is_retryable_error(self, error: BaseException) -> bool:
+        if isinstance(error, CodeErrorFactory):
+            return error.code in self.statuses
+
+        return isinstance(error, (ClientConnectionError, asyncio.TimeoutError))
+
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns delay before the next attempt
+
+        :param attempt: Number of the failed attempt, starting from 0
+        :param retry_after: Delay requested by the server
+        """
+
+        delay: float = min(self.backoff_base * 2 ** attempt, self.backoff_max)
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def should_retry(self, api_method: Optional[APIMethod], error: BaseException, attempt: int) -> bool:
+        """
+        Check if the failed attempt should be retried. Withdraws from the budget on success
+
+        :param api_method: API method
+        :param error: Raised error
+        :param attempt: Number of the failed attempt, starting from 0
+        """
+
+        if attempt + 1 >= self.max_attempts:
+            return False
+
+        if not self.is_retryable_method(api_method) or not self.is_retryable_error(error):
+            return False
+
+        retry_after: Optional[float] = getattr(error, "retry_after", None)
+
+        if retry_after is not None and retry_after > self.retry_after_max:
+            return False
+
+        return self.budget.try_withdraw()
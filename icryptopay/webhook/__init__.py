@@ -0,0 +1,3 @@
+from .dedup import DedupStore, MemoryDedupStore, SQLiteDedupStore
+from .dispatcher import UpdateDispatcher
+from .watcher import InvoiceWatcher
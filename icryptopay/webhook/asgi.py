@@ -0,0 +1,154 @@
+import json
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, MutableMapping, Optional, Tuple
+
+from icryptopay.types.update import Update
+
+if TYPE_CHECKING:
+    from icryptopay.api import ICryptoPay
+    from icryptopay.pool import CryptoPayPool
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+OK_CONTENT: Dict[str, str] = {"msg": "Status OK!"}
+SIGNATURE_HEADER: bytes = b"crypto-pay-api-signature"
+
+
+class _Disconnected(Exception):
+    """The client disconnected before the body was received"""
+
+
+class WebhookApp:
+    """
+    Dependency-free ASGI application receiving Crypto Pay webhooks.
+    Run it under any ASGI server or mount it into an ASGI framework
+
+        uvicorn.run(crypto.get_asgi_app(), host="localhost", port=3001)
+    """
+
+    def __init__(self, client: "ICryptoPay", path: Optional[str] = None, max_body_size: int = 1024 * 1024) -> None:
+        """
+        :param client: Client verifying and dispatching updates
+        :param path: Accept webhooks only on this path, any path if not passed
+        :param max_body_size: Maximum request body size in bytes
+        """
+
+        self.client = client
+        self.path = path
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive=receive, send=send)
+            return
+
+        if scope["type"] != "http":
+            return
+
+        if self.path is not None and scope["path"] != self.path:
+            await self._respond(send=send, status=404, content={"msg": "Not Found"})
+            return
+
+        if scope["method"] != "POST":
+            await self._respond(send=send, status=405, content={"msg": "Method Not Allowed"})
+            return
+
+        try:
+            body: Optional[bytes] = await self._read_body(receive=receive)
+        except _Disconnected:
+            return
+
+        if body is None:
+            await self._respond(send=send, status=413, content={"msg": "Payload Too Large"})
+            return
+
+        signature: str = ""
+
+        for name, value in scope["headers"]:
+            if name.lower() == SIGNATURE_HEADER:
+                signature = value.decode("latin-1")
+                break
+
+        try:
+            await self.handle_update(body=body, signature=signature)
+        except ValueError:
+            # Signed body that is not JSON or not an update
+            await self._respond(send=send, status=400, content={"msg": "Bad Request"})
+            return
+
+        await self._respond(send=send, status=200, content=OK_CONTENT)
+
+    async def handle_update(self, body: bytes, signature: str) -> None:
+        """
+        Verify the update and pass it to pay handlers.
+        Raises ValueError if the body is signed but is not a valid update
+
+        :param body: Raw request body
+        :param signature: Crypto-Pay-Api-Signature header
+        """
+
+        update: Optional[Update] = self.client.parse_update(body=body, crypto_pay_signature=signature)
+
+        if update:
+            await self.client.feed_update(update)
+
+    async def _read_body(self, receive: Receive) -> Optional[bytes]:
+        chunks: List[bytes] = []
+        size: int = 0
+
+        while True:
+            message: Message = await receive()
+
+            if message["type"] == "http.disconnect":
+                raise _Disconnected
+
+            chunk: bytes = message.get("body", b"")
+            size += len(chunk)
+
+            if size > self.max_body_size:
+                return None
+
+            chunks.append(chunk)
+
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message: Message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.client.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _respond(send: Send, status: int, content: Dict[str, str]) -> None:
+        body: bytes = json.dumps(content).encode("UTF-8")
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+class PoolWebhookApp(WebhookApp):
+    """ASGI application receiving webhooks of all pool tenants, updates are routed by signature"""
+
+    def __init__(self, pool: "CryptoPayPool", path: Optional[str] = None, max_body_size: int = 1024 * 1024) -> None:
+        """
+        :param pool: Tenant pool verifying and dispatching updates
+        :param path: Accept webhooks only on this path, any path if not passed
+        :param max_body_size: Maximum request body size in bytes
+        """
+
+        super().__init__(client=pool, path=path, max_body_size=max_body_size)
+
+    async def handle_update(self, body: bytes, signature: str) -> None:
+        await self.client.feed_webhook(body=body, crypto_pay_signature=signature)
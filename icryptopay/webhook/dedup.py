@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class DedupStore(ABC):
+    """Remembers update IDs, so redelivered webhooks are not processed twice"""
+
+    @abstractmethod
+    async def add(self, update_id: int) -> bool:
+        """
+        Remember the update ID. Returns False if it was already seen
+
+        :param update_id: Update ID
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryDedupStore(DedupStore):
+    """In-memory LRU of update IDs. IDs are forgotten after `ttl` seconds or when `max_size` is exceeded"""
+
+    def __init__(self, ttl: float = 86400.0, max_size: int = 100_000) -> None:
+        """
+        :param ttl: Seconds an update ID is remembered
+        :param max_size: Maximum number of remembered update IDs
+        """
+
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._expires_at: "OrderedDict[int, float]" = OrderedDict()
+
+    async def add(self, update_id: int) -> bool:
+        now: float = time.monotonic()
+
+        # IDs are ordered by expiration time, so expired IDs are at the beginning
+        while self._expires_at:
+            oldest_id, expires_at = next(iter(self._expires_at.items()))
+
+            if expires_at > now:
+                break
+
+            del self._expires_at[oldest_id]
+
+        if update_id in self._expires_at:
+            return False
+
+        self._expires_at[update_id] = now + self.ttl
+
+        if len(self._expires_at) > self.max_size:
+            self._expires_at.popitem(last=False)
+
+        return True
+
+
+class SQLiteDedupStore(DedupStore):
+    """
+    Update IDs in an SQLite database, shared by worker processes on one host.
+    Queries run in a thread, so they don't block the event loop
+    """
+
+    def __init__(self, path: str, ttl: float = 86400.0, cleanup_every: int = 1000) -> None:
+        """
+        :param path: Database file path
+        :param ttl: Seconds an update ID is remembered
+        :param cleanup_every: Delete expired IDs every N added IDs
+        """
+
+        self.ttl = ttl
+        self.cleanup_every = cleanup_every
+
+        import sqlite3
+
+        self._lock: threading.Lock = threading.Lock()
+        self._added_count = 0
+
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS updates (update_id INTEGER PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS updates_expires_at ON updates (expires_at)")
+
+    def _add(self, update_id: int) -> bool:
+        now: float = time.time()
+
+        with self._lock:
+            cursor: "sqlite3.Cursor" = self._connection.execute(
+                "INSERT INTO updates (update_id, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (update_id) DO UPDATE SET expires_at = excluded.expires_at "
+                "WHERE updates.expires_at <= ?",
+                (update_id, now + self.ttl, now)
+            )
+            added: bool = cursor.rowcount == 1
+
+            self._added_count += 1
+
+            if self._added_count % self.cleanup_every == 0:
+                self._connection.execute("DELETE FROM updates WHERE expires_at <= ?", (now,))
+
+        return added
+
+    async def add(self, update_id: int) -> bool:
+        return await asyncio.to_thread(self._add, update_id)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._connection.close()
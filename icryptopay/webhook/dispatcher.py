@@ -0,0 +1,174 @@
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional
+
+from icryptopay.types.stats import DispatcherStats
+from icryptopay.types.update import Update
+from icryptopay.webhook.dedup import DedupStore, MemoryDedupStore
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class UpdateDispatcher:
+    """
+    Calls pay handlers for webhook updates.
+    Coroutine handlers are awaited, sync handlers are called inline or in a thread pool.
+    With `queue_size` updates are put into a bounded queue processed by `workers` tasks,
+    so the webhook is acknowledged without waiting for the handlers
+    """
+
+    def __init__(
+            self,
+            queue_size: Optional[int] = None,
+            workers: int = 4,
+            run_sync_in_executor: bool = False,
+            executor: Optional[Executor] = None,
+            dedup_store: Optional[DedupStore] = None
+    ) -> None:
+        """
+        :param queue_size: Queue size, updates are processed inline if not passed.
+        When the queue is full, the webhook response waits for a free slot
+        :param workers: Number of tasks processing the queue
+        :param run_sync_in_executor: Run sync handlers in a thread pool instead of the event loop
+        :param executor: Thread pool for sync handlers, the loop default executor if not passed
+        :param dedup_store: Store of seen update IDs, in-memory by default.
+        Updates are remembered when received, so a redelivered update is dropped even if its handlers failed
+        """
+
+        self.handlers: List[Callable[[Update], Any]] = []
+
+        self._queue_size = queue_size
+        self._workers_count = workers
+        self._run_sync_in_executor = run_sync_in_executor
+        self._executor = executor
+        self._dedup_store = dedup_store or MemoryDedupStore()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        self._received_count = 0
+        self._duplicates_count = 0
+        self._processed_count = 0
+        self._failed_count = 0
+        self._handler_time_total = 0.0
+        self._handler_time_max = 0.0
+
+    def register(self, handler: Callable[[Update], Any]) -> Callable[[Update], Any]:
+        """Register pay handler"""
+
+        self.handlers.append(handler)
+        return handler
+
+    async def feed_update(self, update: Update) -> None:
+        """
+        Process the update or put it into the queue.
+        Updates without update_id are not checked against the dedup store
+
+        :param update: Webhook update
+        """
+
+        self._received_count += 1
+
+        if update.update_id is not None and not await self._dedup_store.add(update.update_id):
+            self._duplicates_count += 1
+            return
+
+        if self._queue_size is None:
+            await self.process_update(update)
+            return
+
+        if self._queue is None:
+            self._start()
+
+        await self._queue.put(update)
+
+    async def process_update(self, update: Update) -> None:
+        """
+        Call all handlers with the update. Handler errors are logged and don't stop other handlers
+
+        :param update: Webhook update
+        """
+
+        for handler in self.handlers:
+            started_at: float = time.monotonic()
+
+            try:
+                await self._call_handler(handler=handler, update=update)
+            except Exception:
+                self._failed_count += 1
+                logger.exception("Pay handler %r failed on update %s", handler, update.update_id)
+            else:
+                self._processed_count += 1
+
+            handler_time: float = time.monotonic() - started_at
+            self._handler_time_total += handler_time
+            self._handler_time_max = max(self._handler_time_max, handler_time)
+
+    async def _call_handler(self, handler: Callable[[Update], Any], update: Update) -> None:
+        if inspect.iscoroutinefunction(handler):
+            await handler(update)
+            return
+
+        if self._run_sync_in_executor:
+            await asyncio.get_running_loop().run_in_executor(self._executor, handler, update)
+            return
+
+        result: Any = handler(update)
+
+        if inspect.isawaitable(result):
+            await result
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self._workers_count)]
+
+    async def _work(self) -> None:
+        while True:
+            update: Update = await self._queue.get()
+
+            try:
+                await self.process_update(update)
+            finally:
+                self._queue.task_done()
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop queue workers
+
+        :param drain: Process queued updates before stopping
+        """
+
+        if self._queue is None:
+            return
+
+        if drain:
+            await self._queue.join()
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+        self._queue = None
+        self._workers = []
+
+    async def close(self) -> None:
+        """Process queued updates, stop queue workers and close the dedup store"""
+
+        await self.stop()
+        await self._dedup_store.close()
+
+    def get_stats(self) -> DispatcherStats:
+        return DispatcherStats(
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            queue_size=self._queue_size or 0,
+            received_count=self._received_count,
+            duplicates_count=self._duplicates_count,
+            processed_count=self._processed_count,
+            failed_count=self._failed_count,
+            handler_time_total=self._handler_time_total,
+            handler_time_max=self._handler_time_max
+        )
@@ -0,0 +1,11 @@
+"""
+Starlette and FastAPI integration. Requires `pip install icryptopay[fastapi]`
+"""
+
+from starlette.responses import JSONResponse
+
+from icryptopay.webhook.asgi import OK_CONTENT
+
+
+def get_ok_response() -> JSONResponse:
+    return JSONResponse(content=OK_CONTENT)
@@ -0,0 +1,332 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+from icryptopay.enums.invoice import InvoiceStatus
+from icryptopay.enums.priority import RequestPriority
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.lite import LiteInvoice
+from icryptopay.types.stats import WatcherStats
+from icryptopay.types.update import Update
+from icryptopay.utils.batching import ID_CHUNK_SIZE, chunked
+from icryptopay.utils.ratelimit import RateLimiter, TokenBucket
+from icryptopay.webhook.dedup import DedupStore, MemoryDedupStore
+
+if TYPE_CHECKING:
+    from icryptopay.api import ICryptoPay
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEDULE: Tuple[Tuple[float, float], ...] = ((60.0, 2.0), (600.0, 5.0), (3600.0, 15.0))
+
+
+class _WatchedInvoice:
+    __slots__ = ("invoice_id", "watched_at", "expires_at", "next_poll_at")
+
+    def __init__(self, invoice_id: int, watched_at: float, expires_at: Optional[float]) -> None:
+        self.invoice_id = invoice_id
+        self.watched_at = watched_at
+        self.expires_at = expires_at
+        self.next_poll_at = watched_at
+
+
+class InvoiceWatcher:
+    """
+    Polls active invoices and passes paid ones to the client pay handlers as invoice_paid updates,
+    for apps that can't receive webhooks.
+    Due invoices are fetched with batched getInvoices requests: new invoices are polled often, older ones
+    less often. Invoices are dropped when they are paid, expired, deleted or past their expiration_date
+
+        async with InvoiceWatcher(client=crypto) as watcher:
+            invoice = await crypto.create_invoice(asset="TON", amount=1)
+            watcher.watch(invoice)
+
+    Updates have no update_id, they are deduplicated by invoice ID in the watcher's own store,
+    so they can't collide with update IDs of webhooks
+    """
+
+    def __init__(
+            self,
+            client: "ICryptoPay",
+            schedule: Sequence[Tuple[float, float]] = DEFAULT_SCHEDULE,
+            max_interval: float = 60.0,
+            requests_per_second: float = 5.0,
+            batch_size: int = ID_CHUNK_SIZE,
+            concurrency: int = 4,
+            expiration_grace: float = 60.0,
+            dedup_store: Optional[DedupStore] = None
+    ) -> None:
+        """
+        :param client: Client to poll with, its pay handlers receive the updates
+        :param schedule: Pairs of (invoice age, poll interval) in seconds, in ascending age order.
+        By default invoices younger than a minute are polled every 2 seconds, younger than 10 minutes every 5
+        and younger than an hour every 15
+        :param max_interval: Poll interval of invoices older than the schedule
+        :param requests_per_second: getInvoices requests per second the watcher may send
+        :param batch_size: Invoice IDs per request
+        :param concurrency: Maximum number of simultaneous requests
+        :param expiration_grace: Seconds an invoice is still polled after its expiration_date
+        :param dedup_store: Store of dispatched invoice IDs, in-memory by default.
+        Don't share it with the dispatcher: invoice IDs and update IDs overlap
+        """
+
+        self.client = client
+        self.schedule = tuple(schedule)
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.expiration_grace = expiration_grace
+
+        self._dedup_store: DedupStore = dedup_store or MemoryDedupStore()
+
+        self._bucket: TokenBucket = TokenBucket(rate=requests_per_second, capacity=max(requests_per_second, 1))
+        self._watched: Dict[int, _WatchedInvoice] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._requests_count = 0
+        self._failed_requests_count = 0
+        self._polled_count = 0
+        self._paid_count = 0
+        self._expired_count = 0
+        self._poll_lag_max = 0.0
+
+    async def __aenter__(self) -> "InvoiceWatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def __len__(self) -> int:
+        return len(self._watched)
+
+    def __contains__(self, invoice_id: int) -> bool:
+        return invoice_id in self._watched
+
+    def watch(
+            self,
+            invoice: Union[Invoice, LiteInvoice, int],
+            expiration_date: Optional[Union[datetime, str]] = None
+    ) -> None:
+        """
+        Start watching an invoice. Invoices which are not active are ignored
+
+        :param invoice: Invoice or invoice ID
+        :param expiration_date: Stop watching after this date, taken from the invoice if not passed
+        """
+
+        if isinstance(invoice, int):
+            invoice_id: int = invoice
+        else:
+            if invoice.status != InvoiceStatus.ACTIVE:
+                return
+
+            invoice_id = invoice.invoice_id
+            expiration_date = expiration_date or invoice.expiration_date
+
+        now: float = time.monotonic()
+        expires_at: Optional[float] = None
+
+        if expiration_date:
+            if isinstance(expiration_date, str):
+                expiration_date = datetime.fromisoformat(expiration_date)
+
+            if expiration_date.tzinfo is None:
+                expiration_date = expiration_date.replace(tzinfo=timezone.utc)
+
+            expires_at = now + expiration_date.timestamp() - time.time()
+
+        watched: _WatchedInvoice = _WatchedInvoice(invoice_id=invoice_id, watched_at=now, expires_at=expires_at)
+        self._watched[invoice_id] = watched
+        self._schedule(watched, now)
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def unwatch(self, invoice_id: int) -> None:
+        """
+        Stop watching an invoice
+
+        :param invoice_id: Invoice ID
+        """
+
+        self._watched.pop(invoice_id, None)
+
+    def get_interval(self, age: float) -> float:
+        """
+        Returns poll interval of an invoice watched for `age` seconds
+
+        :param age: Seconds since the invoice is watched
+        """
+
+        for max_age, interval in self.schedule:
+            if age < max_age:
+                return interval
+
+        return self.max_interval
+
+    def _schedule(self, watched: _WatchedInvoice, now: float) -> None:
+        next_poll_at: float = now + self.get_interval(now - watched.watched_at)
+
+        if watched.expires_at is not None and now < watched.expires_at:
+            next_poll_at = min(next_poll_at, watched.expires_at)
+
+        watched.next_poll_at = next_poll_at
+        heapq.heappush(self._heap, (next_poll_at, watched.invoice_id))
+
+    def _pop_due(self, now: float, limit: int) -> List[_WatchedInvoice]:
+        due: List[_WatchedInvoice] = []
+
+        while self._heap and self._heap[0][0] <= now and len(due) < limit:
+            next_poll_at, invoice_id = heapq.heappop(self._heap)
+            watched: Optional[_WatchedInvoice] = self._watched.get(invoice_id)
+
+            # Entries of unwatched and rescheduled invoices are left in the heap and skipped here
+            if watched is None or watched.next_poll_at != next_poll_at:
+                continue
+
+            self._poll_lag_max = max(self._poll_lag_max, now - next_poll_at)
+            due.append(watched)
+
+        return due
+
+    async def poll(self) -> float:
+        """
+        Fetch due invoices and dispatch paid ones.
+        Returns seconds until the next invoice is due, 0 if some are already due
+        """
+
+        due: List[_WatchedInvoice] = self._pop_due(now=time.monotonic(), limit=self.batch_size * self.concurrency)
+
+        if due:
+            await asyncio.gather(*(self._poll_batch(list(batch)) for batch in chunked(due, self.batch_size)))
+
+        while self._heap and self._heap[0][1] not in self._watched:
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            return self.max_interval
+
+        return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+    async def _acquire(self) -> None:
+        while True:
+            delay: float = self._bucket.get_delay(time.monotonic())
+
+            if delay <= 0:
+                self._bucket.consume()
+                return
+
+            await asyncio.sleep(delay)
+
+    async def _poll_batch(self, batch: List[_WatchedInvoice]) -> None:
+        await self._acquire()
+        self._requests_count += 1
+
+        try:
+            with RateLimiter.priority(RequestPriority.LOW):
+                invoices: List[Invoice] = await self.client.get_invoices(
+                    invoice_ids=[watched.invoice_id for watched in batch],
+                    lite=False
+                )
+        except Exception:
+            self._failed_requests_count += 1
+            logger.exception("Failed to poll %s invoices", len(batch))
+
+            now: float = time.monotonic()
+
+            for watched in batch:
+                if self._watched.get(watched.invoice_id) is watched:
+                    self._schedule(watched, now)
+            return
+
+        self._polled_count += len(batch)
+        found: Dict[int, Invoice] = {invoice.invoice_id: invoice for invoice in invoices}
+        now = time.monotonic()
+
+        for watched in batch:
+            # The invoice was unwatched or watched again while the request was in flight
+            if self._watched.get(watched.invoice_id) is not watched:
+                continue
+
+            invoice: Optional[Invoice] = found.get(watched.invoice_id)
+
+            if invoice is None:
+                del self._watched[watched.invoice_id]
+            elif invoice.status == InvoiceStatus.PAID:
+                del self._watched[watched.invoice_id]
+                self._paid_count += 1
+                await self._dispatch(invoice)
+            elif invoice.status == InvoiceStatus.EXPIRED or (
+                    watched.expires_at is not None and now > watched.expires_at + self.expiration_grace
+            ):
+                del self._watched[watched.invoice_id]
+                self._expired_count += 1
+            else:
+                self._schedule(watched, now)
+
+    async def _dispatch(self, invoice: Invoice) -> None:
+        update: Update = Update(
+            update_type="invoice_paid",
+            request_date=datetime.now(timezone.utc),
+            payload=invoice
+        )
+
+        try:
+            if await self._dedup_store.add(invoice.invoice_id):
+                await self.client.feed_update(update)
+        except Exception:
+            logger.exception("Failed to dispatch paid invoice %s", invoice.invoice_id)
+
+    async def start(self) -> None:
+        """Start polling in a background task"""
+
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling. Watched invoices are kept, so polling can be started again"""
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+        self._task = None
+        self._wakeup = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delay: float = await self.poll()
+            except Exception:
+                logger.exception("Invoice polling failed")
+                delay = self.max_interval
+
+            if delay > 0:
+                self._wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def get_stats(self) -> WatcherStats:
+        """Returns number of watched invoices, requests and the largest poll delay"""
+
+        return WatcherStats(
+            watched=len(self._watched),
+            requests_count=self._requests_count,
+            failed_requests_count=self._failed_requests_count,
+            polled_count=self._polled_count,
+            paid_count=self._paid_count,
+            expired_count=self._expired_count,
+            poll_lag_max=self._poll_lag_max
+        )
@@ -0,0 +1,36 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator, EmulatorState
+from icryptopay.types.update import Update
+
+TOKEN: str = "1234:TEST"
+
+
+@pytest.fixture
+async def emulator() -> AsyncIterator[CryptoPayEmulator]:
+    async with CryptoPayEmulator(token=TOKEN) as emulator:
+        yield emulator
+
+
+@pytest.fixture
+async def crypto(emulator: CryptoPayEmulator) -> AsyncIterator[ICryptoPay]:
+    client: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url)
+
+    yield client
+
+    await client.close()
+
+
+def make_paid_update(state: EmulatorState, update_id: Optional[int] = None) -> Update:
+    """Creates and pays an invoice in the emulator state, returns its invoice_paid update"""
+
+    invoice: Dict[str, Any] = state.create_invoice({"asset": "TON", "amount": "1"})
+    update: Dict[str, Any] = state.make_update(state.pay_invoice(invoice_id=invoice["invoice_id"]))
+
+    if update_id is not None:
+        update["update_id"] = update_id
+
+    return Update.model_validate(update)
@@ -0,0 +1,120 @@
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.types.update import Update
+from icryptopay.webhook.asgi import WebhookApp
+from tests.conftest import TOKEN, make_paid_update
+
+
+class Client:
+    """Calls the ASGI app with one request and records the response"""
+
+    def __init__(self, app: WebhookApp) -> None:
+        self.app = app
+        self.status: Optional[int] = None
+        self.content: Optional[Dict[str, Any]] = None
+
+    async def request(
+            self,
+            messages: List[Dict[str, Any]],
+            method: str = "POST",
+            path: str = "/",
+            signature: str = ""
+    ) -> Optional[int]:
+        scope: Dict[str, Any] = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "headers": [(b"crypto-pay-api-signature", signature.encode("latin-1"))],
+        }
+
+        async def receive() -> Dict[str, Any]:
+            return messages.pop(0)
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                self.status = message["status"]
+            else:
+                self.content = json.loads(message["body"])
+
+        await self.app(scope, receive, send)
+
+        return self.status
+
+    async def post(self, body: bytes, signature: str = "", **kwargs: Any) -> Optional[int]:
+        return await self.request([{"type": "http.request", "body": body}], signature=signature, **kwargs)
+
+
+@pytest.fixture
+def paid() -> List[int]:
+    return []
+
+
+@pytest.fixture
+def client(paid: List[int]) -> Client:
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN)
+
+    @crypto.pay_handler()
+    async def invoice_paid(update: Update) -> None:
+        paid.append(update.payload.invoice_id)
+
+    return Client(crypto.get_asgi_app(path="/webhook"))
+
+
+@pytest.fixture
+def emulator() -> CryptoPayEmulator:
+    return CryptoPayEmulator(token=TOKEN)
+
+
+async def test_signed_update_is_dispatched(client: Client, emulator: CryptoPayEmulator, paid: List[int]):
+    body: bytes = make_paid_update(emulator.state).model_dump_json().encode("UTF-8")
+
+    assert await client.post(body, signature=emulator.sign(body), path="/webhook") == 200
+    assert client.content == {"msg": "Status OK!"}
+    assert paid == [1]
+
+
+async def test_chunked_body_is_joined(client: Client, emulator: CryptoPayEmulator, paid: List[int]):
+    body: bytes = make_paid_update(emulator.state).model_dump_json().encode("UTF-8")
+    messages: List[Dict[str, Any]] = [
+        {"type": "http.request", "body": body[:10], "more_body": True},
+        {"type": "http.request", "body": body[10:]},
+    ]
+
+    assert await client.request(messages, path="/webhook", signature=emulator.sign(body)) == 200
+    assert paid == [1]
+
+
+async def test_unsigned_update_is_ignored(client: Client, emulator: CryptoPayEmulator, paid: List[int]):
+    body: bytes = make_paid_update(emulator.state).model_dump_json().encode("UTF-8")
+
+    assert await client.post(body, signature="bad", path="/webhook") == 200
+    assert paid == []
+
+
+@pytest.mark.parametrize("body", [b"not json", b"", b'{"update_id": 1}', b"[]"])
+async def test_signed_bad_payload_is_rejected(client: Client, emulator: CryptoPayEmulator, body: bytes):
+    assert await client.post(body, signature=emulator.sign(body), path="/webhook") == 400
+
+
+async def test_disconnect_ends_request(client: Client, paid: List[int]):
+    messages: List[Dict[str, Any]] = [
+        {"type": "http.request", "body": b"{", "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+
+    assert await client.request(messages, path="/webhook") is None
+    assert paid == []
+
+
+async def test_routing_and_limits(client: Client):
+    assert await client.post(b"{}", path="/other") == 404
+    assert await client.post(b"{}", method="GET", path="/webhook") == 405
+
+    client.app.max_body_size = 4
+
+    assert await client.post(b"{}" * 4, path="/webhook") == 413
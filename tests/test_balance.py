@@ -0,0 +1,85 @@
+import asyncio
+from decimal import Decimal
+from typing import List
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.exceptions import InsufficientFundsError
+from icryptopay.types.balance import Balance
+from icryptopay.utils.balance import BalanceTracker
+from tests.conftest import TOKEN
+
+
+class Fetcher:
+    def __init__(self, available: str) -> None:
+        self.available = available
+        self.calls = 0
+
+    async def __call__(self) -> List[Balance]:
+        self.calls += 1
+
+        return [Balance(currency_code="TON", available=Decimal(self.available), onhold=Decimal(0))]
+
+
+async def test_payouts_are_reserved():
+    tracker: BalanceTracker = BalanceTracker()
+    fetch: Fetcher = Fetcher("10")
+
+    async with tracker.reserve("TON", 6, fetch=fetch):
+        assert tracker.get_available("TON") == 4
+
+        with pytest.raises(InsufficientFundsError):
+            async with tracker.reserve("TON", 5, fetch=fetch):
+                pass
+
+    assert tracker.get_available("TON") == 4
+    assert fetch.calls == 1
+    assert tracker.get_stats().rejected_count == 1
+
+
+async def test_invalidate_during_refresh_fetches_again():
+    tracker: BalanceTracker = BalanceTracker()
+    fetch: Fetcher = Fetcher("10")
+
+    async def fetch_and_invalidate() -> List[Balance]:
+        # Runs after the refresh stores the snapshot, before reserve() resumes
+        if not fetch.calls:
+            asyncio.get_running_loop().call_soon(tracker.invalidate)
+
+        return await fetch()
+
+    async with tracker.reserve("TON", 1, fetch=fetch_and_invalidate):
+        pass
+
+    assert fetch.calls == 2
+    assert tracker.get_available("TON") == 9
+
+
+async def test_unknown_outcome_invalidates():
+    tracker: BalanceTracker = BalanceTracker()
+    fetch: Fetcher = Fetcher("10")
+
+    with pytest.raises(ConnectionError):
+        async with tracker.reserve("TON", 1, fetch=fetch):
+            raise ConnectionError
+
+    assert tracker.get_available("TON") is None
+
+    fetch.available = "9"
+    balances: List[Balance] = await tracker.get_balances(fetch=fetch)
+
+    assert balances[0].available == Decimal(9)
+
+
+async def test_client_rejects_payout_without_request(emulator: CryptoPayEmulator):
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, balance_tracker=BalanceTracker())
+
+    try:
+        with pytest.raises(InsufficientFundsError):
+            await crypto.create_check(asset="TON", amount=10 ** 9)
+    finally:
+        await crypto.close()
+
+    assert crypto.get_balance_tracker_stats().rejected_count == 1
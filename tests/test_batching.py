@@ -0,0 +1,99 @@
+import asyncio
+from typing import Dict, List
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.utils.batching import BatchLoader, chunked, gather_chunks
+
+
+def test_chunked():
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+async def test_gather_chunks_keeps_order():
+    requests: List[List[int]] = []
+
+    async def fetch(keys: List[int]) -> List[int]:
+        requests.append(keys)
+        await asyncio.sleep(0.01 * (len(requests) % 2))
+
+        return keys
+
+    assert await gather_chunks(fetch=fetch, keys=list(range(10)), chunk_size=3) == list(range(10))
+    assert len(requests) == 4
+
+
+async def test_loader_coalesces_lookups():
+    requests: List[List[int]] = []
+
+    async def fetch(keys: List[int]) -> Dict[int, str]:
+        requests.append(keys)
+
+        return {key: str(key) for key in keys if key != 3}
+
+    loader: BatchLoader[int, str] = BatchLoader(fetch=fetch)
+    values = await asyncio.gather(*(loader.load(key) for key in (1, 2, 2, 3)))
+
+    assert values == ["1", "2", "2", None]
+    assert requests == [[1, 2, 3]]
+
+
+async def test_loader_propagates_errors():
+    async def fetch(keys: List[int]) -> Dict[int, str]:
+        raise RuntimeError("failed")
+
+    loader: BatchLoader[int, str] = BatchLoader(fetch=fetch)
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_loader_keeps_and_awaits_requests_in_flight():
+    released: asyncio.Event = asyncio.Event()
+
+    async def fetch(keys: List[int]) -> Dict[int, str]:
+        await released.wait()
+
+        return {key: str(key) for key in keys}
+
+    loader: BatchLoader[int, str] = BatchLoader(fetch=fetch, window=60)
+    lookup: asyncio.Task = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+
+    # close() sends the pending batch without waiting for the window
+    closing: asyncio.Task = asyncio.ensure_future(loader.close())
+    await asyncio.sleep(0)
+
+    assert len(loader._tasks) == 1
+    assert not closing.done()
+
+    released.set()
+    await closing
+
+    assert await lookup == "1"
+    assert not loader._tasks
+
+
+async def test_long_id_lists_are_chunked(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    invoice_ids: List[int] = [
+        (await crypto.create_invoice(asset="TON", amount=1)).invoice_id for _ in range(150)
+    ]
+
+    invoices = await crypto.get_invoices(invoice_ids=invoice_ids)
+
+    assert {invoice.invoice_id for invoice in invoices} == set(invoice_ids)
+    assert emulator.request_counts["/api/getInvoices"] == 2
+
+
+async def test_single_lookups_share_one_request(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    first = await crypto.create_invoice(asset="TON", amount=1)
+    second = await crypto.create_invoice(asset="TON", amount=2)
+
+    invoices = await asyncio.gather(
+        crypto.get_invoice(first.invoice_id),
+        crypto.get_invoice(second.invoice_id),
+        crypto.get_invoice(10 ** 6)
+    )
+
+    assert [invoice and invoice.invoice_id for invoice in invoices] == [first.invoice_id, second.invoice_id, None]
+    assert emulator.request_counts["/api/getInvoices"] == 1
@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from benchmarks.fixtures import (
+    make_app_stats,
+    make_balance,
+    make_check,
+    make_currency,
+    make_exchange_rate,
+    make_invoice,
+    make_profile,
+    make_transfer,
+    make_update
+)
+from benchmarks.webhook import legacy_verify, make_update_body, sign
+from icryptopay.api import ICryptoPay
+from icryptopay.types.app_stats import AppStats
+from icryptopay.types.balance import Balance
+from icryptopay.types.check import Check
+from icryptopay.types.currencies import Currency
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.profile import Profile
+from icryptopay.types.rates import ExchangeRate
+from icryptopay.types.transfer import Transfer
+from icryptopay.types.update import Update
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+
+def test_fixtures_are_valid_api_objects():
+    Profile.model_validate(make_profile())
+    AppStats.model_validate(make_app_stats())
+    ExchangeRate.model_validate(make_exchange_rate("TON", "USD"))
+    Currency.model_validate(make_currency("TON"))
+    Invoice.model_validate(make_invoice(1))
+    Check.model_validate(make_check(1))
+    Transfer.model_validate(make_transfer(1))
+    Balance.model_validate(make_balance("TON"))
+    Update.model_validate(make_update(1))
+
+
+def test_legacy_verification_matches_client():
+    body: bytes = make_update_body(update_id=5)
+    crypto: ICryptoPay = ICryptoPay(token="1337:JHigdsaASq")
+
+    assert legacy_verify(body, sign(body)) == crypto.parse_update(body, sign(body))
+
+
+def test_runner_writes_json_report():
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-m", "benchmarks", "exceptions", "--json", "-"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    report: Dict[str, Any] = json.loads(result.stdout)
+
+    assert report["results"]
+    assert all(name.startswith("exceptions.") for name in report["results"])
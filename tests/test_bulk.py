@@ -0,0 +1,51 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.types.bulk import BulkInvoiceReport, BulkInvoiceResult
+from icryptopay.utils.batching import gather_chunks
+
+
+def make_specs(count: int) -> List[Dict[str, Any]]:
+    return [{"asset": "TON", "amount": 1, "payload": f"order-{index}"} for index in range(count)]
+
+
+async def test_partial_failures_are_reported(crypto: ICryptoPay):
+    specs: List[Dict[str, Any]] = make_specs(5) + [{"asset": "XXX", "amount": 1, "payload": "bad"}]
+
+    report: BulkInvoiceReport = await crypto.create_invoices(specs=specs, concurrency=2)
+
+    assert len(report.succeeded) == 5
+    assert report.failed["bad"].error_code == 400
+    assert report.failed["bad"].error == "ASSET_INVALID"
+
+
+async def test_resume_skips_created_invoices(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    await crypto.create_invoices(specs=make_specs(3))
+
+    results: List[BulkInvoiceResult] = [
+        result async for result in crypto.iter_create_invoices(specs=make_specs(5), resume=True)
+    ]
+
+    assert sum(result.resumed for result in results) == 3
+    assert len(emulator.state.invoices) == 5
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+async def test_concurrency_below_one_is_rejected(crypto: ICryptoPay, emulator: CryptoPayEmulator, concurrency: int):
+    with pytest.raises(ValueError):
+        await crypto.create_invoices(specs=make_specs(2), concurrency=concurrency)
+
+    with pytest.raises(ValueError):
+        async for _ in crypto.iter_create_invoices(specs=make_specs(2), concurrency=concurrency):
+            pass
+
+    async def fetch(keys: List[int]) -> List[int]:
+        return keys
+
+    with pytest.raises(ValueError):
+        await gather_chunks(fetch=fetch, keys=[1, 2], concurrency=concurrency)
+
+    assert not emulator.state.invoices
@@ -0,0 +1,73 @@
+import asyncio
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.utils.cache import TTLCache
+from icryptopay.utils.exchange import RateTable
+from tests.conftest import TOKEN
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def fetch(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+
+        return self.calls
+
+
+async def test_concurrent_misses_share_one_fetch():
+    cache: TTLCache = TTLCache(ttl=60)
+    counter: Counter = Counter()
+
+    values = await asyncio.gather(*(cache.get(key="key", fetch=counter.fetch) for _ in range(5)))
+
+    assert values == [1] * 5
+    assert counter.calls == 1
+    assert cache.get_stats().coalesced == 4
+
+
+async def test_stale_value_is_refreshed_in_background():
+    cache: TTLCache = TTLCache(ttl=0, stale_ttl=60)
+    counter: Counter = Counter()
+
+    assert await cache.get(key="key", fetch=counter.fetch) == 1
+    assert await cache.get(key="key", fetch=counter.fetch) == 1
+
+    await asyncio.sleep(0.02)
+
+    assert counter.calls == 2
+    assert cache.get_stats().refreshes == 1
+
+
+async def test_rates_and_rate_table_share_one_request(emulator: CryptoPayEmulator):
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, cache=TTLCache(ttl=60))
+
+    try:
+        rates = await crypto.get_exchange_rates()
+        table: RateTable = await crypto.get_rate_table()
+        await crypto.get_amount_by_fiat(summ=100, asset="TON", target="USD")
+
+        assert await crypto.get_rate_table() is table
+        assert len(table) == len([rate for rate in rates if rate.is_valid and rate.rate])
+    finally:
+        await crypto.close()
+
+    assert emulator.request_counts["/api/getExchangeRates"] == 1
+
+
+async def test_rate_table_is_rebuilt_after_refresh(emulator: CryptoPayEmulator):
+    cache: TTLCache = TTLCache(ttl=60)
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, cache=cache)
+
+    try:
+        table: RateTable = await crypto.get_rate_table()
+        cache.invalidate()
+
+        assert await crypto.get_rate_table() is not table
+    finally:
+        await crypto.close()
+
+    assert emulator.request_counts["/api/getExchangeRates"] == 2
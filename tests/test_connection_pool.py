@@ -0,0 +1,56 @@
+import asyncio
+from unittest import mock
+
+from icryptopay.api import ICryptoPay
+from icryptopay.base import BaseClient, get_ssl_context
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.types.stats import PoolStats
+from tests.conftest import TOKEN
+
+
+def test_ssl_context_is_built_once():
+    assert get_ssl_context() is get_ssl_context()
+
+
+def test_stats_without_session():
+    stats: PoolStats = BaseClient(pool_size=10, pool_size_per_host=2).get_pool_stats()
+
+    assert (stats.limit, stats.limit_per_host, stats.in_use, stats.idle, stats.waiting) == (10, 2, 0, 0, 0)
+
+
+async def test_connections_are_reused(crypto: ICryptoPay):
+    for _ in range(3):
+        await crypto.get_me()
+
+    stats: PoolStats = crypto.get_pool_stats()
+
+    assert stats.limit == 100
+    assert stats.in_use == 0
+    assert stats.idle == 1
+
+
+async def test_internal_counts_are_best_effort(crypto: ICryptoPay):
+    connector = crypto.get_session().connector
+
+    with mock.patch.object(connector, "_acquired", None), mock.patch.object(connector, "_conns", [1]):
+        stats: PoolStats = crypto.get_pool_stats()
+
+    assert stats.in_use is None
+    assert stats.idle is None
+    assert stats.limit == 100
+
+
+async def test_requests_wait_for_pool_connection(emulator: CryptoPayEmulator):
+    emulator.latency = 0.05
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, pool_size=1)
+
+    try:
+        await asyncio.gather(*(crypto.get_me() for _ in range(3)))
+    finally:
+        await crypto.close()
+
+    stats: PoolStats = crypto.get_pool_stats()
+
+    assert stats.limit == 1
+    assert stats.queued_count == 2
+    assert stats.queue_wait_max > 0
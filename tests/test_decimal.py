@@ -0,0 +1,67 @@
+import json
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.types.balance import Balance
+from icryptopay.types.invoice import Invoice
+from icryptopay.utils.money import format_amount, quantize_amount
+from tests.conftest import TOKEN, make_paid_update
+
+
+def test_format_amount_has_no_exponent():
+    assert format_amount(Decimal("1E-8")) == "0.00000001"
+    assert format_amount(0.1) == "0.1"
+    assert format_amount(Decimal("10.500")) == "10.5"
+
+
+def test_quantize_amount():
+    assert quantize_amount("1.23456789", decimals=4) == Decimal("1.2346")
+
+
+def test_models_parse_decimal_only_with_context():
+    data: dict = {"currency_code": "TON", "available": "0.1", "onhold": "0"}
+
+    assert Balance.model_validate(data).available == 0.1
+    assert Balance.model_validate(data, context={"use_decimal": True}).available == Decimal("0.1")
+
+
+@pytest.mark.parametrize("available", ["ten", True, [1]])
+def test_malformed_decimal_amount_is_validation_error(available):
+    data: dict = {"currency_code": "TON", "available": available, "onhold": "0"}
+
+    with pytest.raises(ValidationError):
+        Balance.model_validate(data, context={"use_decimal": True})
+
+
+def test_signed_webhook_with_malformed_amount_is_value_error():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    update: dict = make_paid_update(emulator.state).model_dump(mode="json")
+    update["payload"]["paid_amount"] = "1.2.3"
+    body: bytes = json.dumps(update).encode()
+
+    with pytest.raises(ValueError):
+        ICryptoPay(token=TOKEN, use_decimal=True).parse_update(body, emulator.sign(body))
+
+
+async def test_decimal_client_round_trip(emulator: CryptoPayEmulator):
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, use_decimal=True)
+
+    try:
+        invoice: Invoice = await crypto.create_invoice(asset="TON", amount=Decimal("0.000000001"))
+        amount = await crypto.get_amount_by_fiat(summ=100, asset="TON", target="USD")
+    finally:
+        await crypto.close()
+
+    assert invoice.amount == Decimal("0.000000001")
+    assert emulator.state.invoices[invoice.invoice_id]["amount"] == "0.000000001"
+    assert amount == Decimal("18.181818182")
+
+
+async def test_float_client_keeps_model_types(crypto: ICryptoPay):
+    balance: Balance = next(balance for balance in await crypto.get_balance() if balance.currency_code == "TON")
+
+    assert isinstance(balance.available, float)
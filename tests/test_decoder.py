@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.types.profile import Profile
+from icryptopay.types.rates import ExchangeRate
+from icryptopay.utils.decoder import (
+    DecimalJSONDecoder,
+    JSONDecoder,
+    OrjsonDecoder,
+    get_default_decoder,
+    get_response_adapter
+)
+from tests.conftest import TOKEN
+
+
+def test_default_decoder_validates_raw_bytes():
+    assert get_default_decoder(use_decimal=False) is None
+    assert isinstance(get_default_decoder(use_decimal=True), DecimalJSONDecoder)
+
+
+def test_response_adapter_is_cached():
+    assert get_response_adapter(Profile) is get_response_adapter(Profile)
+
+
+def test_decimal_decoder_keeps_exact_numbers():
+    assert DecimalJSONDecoder().decode(b'{"amount": 0.1}') == {"amount": Decimal("0.1")}
+
+
+async def test_client_uses_passed_decoder(emulator: CryptoPayEmulator):
+    pytest.importorskip("orjson")
+
+    decoder: JSONDecoder = OrjsonDecoder()
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, decoder=decoder)
+
+    try:
+        profile: Profile = await crypto.get_me()
+        rates = await crypto.get_exchange_rates()
+    finally:
+        await crypto.close()
+
+    assert crypto._decoder is decoder
+    assert profile.app_id == emulator.state.app_id
+    assert all(isinstance(rate, ExchangeRate) for rate in rates)
+
+
+async def test_client_without_decoder(crypto: ICryptoPay):
+    assert crypto._decoder is None
+    assert (await crypto.get_me()).name == "Emulator"
@@ -0,0 +1,83 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import EmulatorState
+from icryptopay.types.update import Update
+from icryptopay.webhook.dedup import DedupStore, MemoryDedupStore, SQLiteDedupStore
+from icryptopay.webhook.dispatcher import UpdateDispatcher
+from tests.conftest import make_paid_update
+
+
+def test_dedup_store_is_abstract():
+    with pytest.raises(TypeError):
+        DedupStore()
+
+    class Incomplete(DedupStore):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_memory_store_remembers_ids():
+    store: MemoryDedupStore = MemoryDedupStore()
+
+    assert await store.add(1)
+    assert not await store.add(1)
+    assert await store.add(2)
+
+
+async def test_memory_store_forgets_expired_and_oldest_ids():
+    store: MemoryDedupStore = MemoryDedupStore(ttl=0.01, max_size=2)
+
+    await store.add(1)
+    await asyncio.sleep(0.02)
+
+    assert await store.add(1)
+
+    await store.add(2)
+    await store.add(3)
+
+    assert await store.add(1)
+
+
+async def test_sqlite_store_is_shared_between_instances(tmp_path: Path):
+    path: str = str(tmp_path / "dedup.sqlite")
+    first: SQLiteDedupStore = SQLiteDedupStore(path=path)
+    second: SQLiteDedupStore = SQLiteDedupStore(path=path)
+
+    try:
+        assert await first.add(1)
+        assert not await second.add(1)
+    finally:
+        await first.close()
+        await second.close()
+
+
+async def test_redelivered_update_is_dropped():
+    dispatcher: UpdateDispatcher = UpdateDispatcher()
+    calls: List[int] = []
+    dispatcher.register(lambda update: calls.append(update.update_id))
+    update: Update = make_paid_update(EmulatorState())
+
+    await dispatcher.feed_update(update)
+    await dispatcher.feed_update(update)
+
+    assert calls == [update.update_id]
+    assert dispatcher.get_stats().duplicates_count == 1
+
+
+async def test_client_close_closes_dedup_store(tmp_path: Path):
+    store: SQLiteDedupStore = SQLiteDedupStore(path=str(tmp_path / "dedup.sqlite"))
+    crypto: ICryptoPay = ICryptoPay(token="TOKEN", dispatcher=UpdateDispatcher(dedup_store=store))
+
+    await crypto.feed_update(make_paid_update(EmulatorState()))
+    await crypto.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        await store.add(1)
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from typing import List
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import EmulatorState
+from icryptopay.types.update import Update
+from icryptopay.webhook.dispatcher import UpdateDispatcher
+from tests.conftest import make_paid_update
+
+
+async def test_async_and_sync_handlers_are_called():
+    dispatcher: UpdateDispatcher = UpdateDispatcher()
+    calls: List[str] = []
+
+    @dispatcher.register
+    async def async_handler(update: Update) -> None:
+        calls.append("async")
+
+    @dispatcher.register
+    def sync_handler(update: Update) -> None:
+        calls.append("sync")
+
+    await dispatcher.feed_update(make_paid_update(EmulatorState()))
+
+    assert calls == ["async", "sync"]
+
+
+async def test_handler_errors_do_not_stop_other_handlers():
+    dispatcher: UpdateDispatcher = UpdateDispatcher()
+    calls: List[int] = []
+
+    @dispatcher.register
+    def failing(update: Update) -> None:
+        raise RuntimeError("handler failed")
+
+    dispatcher.register(lambda update: calls.append(update.update_id))
+
+    await dispatcher.feed_update(make_paid_update(EmulatorState(), update_id=7))
+
+    assert calls == [7]
+    assert dispatcher.get_stats().failed_count == 1
+    assert dispatcher.get_stats().processed_count == 1
+
+
+async def test_queued_updates_are_acknowledged_before_handlers():
+    dispatcher: UpdateDispatcher = UpdateDispatcher(queue_size=10, workers=2)
+    release: asyncio.Event = asyncio.Event()
+    processed: List[int] = []
+
+    @dispatcher.register
+    async def handler(update: Update) -> None:
+        await release.wait()
+        processed.append(update.update_id)
+
+    state: EmulatorState = EmulatorState()
+
+    for _ in range(3):
+        await dispatcher.feed_update(make_paid_update(state))
+
+    assert processed == []
+    assert dispatcher.get_stats().queue_depth > 0
+
+    release.set()
+    await dispatcher.stop(drain=True)
+
+    assert sorted(processed) == [1, 2, 3]
+
+
+async def test_sync_handlers_run_in_executor():
+    dispatcher: UpdateDispatcher = UpdateDispatcher(run_sync_in_executor=True)
+    threads: List[threading.Thread] = []
+
+    dispatcher.register(lambda update: threads.append(threading.current_thread()))
+
+    await dispatcher.feed_update(make_paid_update(EmulatorState()))
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+async def test_client_pay_handlers_use_dispatcher():
+    crypto: ICryptoPay = ICryptoPay(token="TOKEN", dispatcher=UpdateDispatcher())
+    paid: List[int] = []
+
+    @crypto.pay_handler()
+    async def invoice_paid(update: Update) -> None:
+        paid.append(update.payload.invoice_id)
+
+    await crypto.feed_update(make_paid_update(EmulatorState()))
+
+    assert paid == [1]
+    assert crypto.get_dispatcher_stats().processed_count == 1
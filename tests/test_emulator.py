@@ -0,0 +1,126 @@
+import asyncio
+from typing import List
+
+import pytest
+from aiohttp import web
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator, EmulatorError
+from icryptopay.enums.invoice import InvoiceStatus
+from icryptopay.exceptions import CryptoPayAPIError, InsufficientFundsError, UnauthorizedError
+from icryptopay.types.update import Update
+from icryptopay.utils.retry import RetryPolicy
+from tests.conftest import TOKEN
+
+
+async def test_invoice_is_paid(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    invoice = await crypto.create_invoice(asset="TON", amount=2)
+    await emulator.pay_invoice(invoice.invoice_id, comment="thanks")
+
+    paid = await crypto.get_invoice(invoice.invoice_id)
+
+    assert paid.status == InvoiceStatus.PAID
+    assert paid.paid_amount == 2
+
+    with pytest.raises(EmulatorError):
+        await emulator.pay_invoice(invoice.invoice_id)
+
+
+async def test_unknown_token_is_unauthorized(emulator: CryptoPayEmulator):
+    crypto: ICryptoPay = ICryptoPay(token="OTHER", base_url=emulator.base_url)
+
+    try:
+        with pytest.raises(UnauthorizedError):
+            await crypto.get_me()
+    finally:
+        await crypto.close()
+
+
+async def test_transfers_are_idempotent_and_checked(crypto: ICryptoPay):
+    first = await crypto.transfer(user_id=1, asset="TON", amount=1, spend_id="spend")
+    second = await crypto.transfer(user_id=1, asset="TON", amount=1, spend_id="spend")
+
+    assert first.transfer_id == second.transfer_id
+
+    with pytest.raises(InsufficientFundsError):
+        await crypto.transfer(user_id=1, asset="TON", amount=10 ** 6, spend_id="large")
+
+
+async def test_checks_hold_funds(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    check = await crypto.create_check(asset="TON", amount=10)
+
+    assert emulator.state.onhold["TON"] == 10
+
+    emulator.activate_check(check.check_id)
+
+    assert emulator.state.onhold["TON"] == 0
+
+
+async def test_paid_update_is_delivered_to_webhook(emulator: CryptoPayEmulator):
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url)
+    paid: List[int] = []
+
+    @crypto.pay_handler()
+    async def invoice_paid(update: Update) -> None:
+        paid.append(update.payload.invoice_id)
+
+    async def webhook(request: web.Request) -> web.Response:
+        update = crypto.parse_update(await request.read(), request.headers.get("Crypto-Pay-API-Signature", ""))
+        await crypto.feed_update(update)
+
+        return web.json_response({})
+
+    app: web.Application = web.Application()
+    app.router.add_post("/webhook", webhook)
+    runner: web.AppRunner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+
+    emulator.webhook_url = f"http://{host}:{port}/webhook"
+    emulator.auto_pay_after = 0.01
+
+    try:
+        invoice = await crypto.create_invoice(asset="TON", amount=1)
+        await asyncio.sleep(0.2)
+    finally:
+        await crypto.close()
+        await runner.cleanup()
+
+    assert paid == [invoice.invoice_id]
+    assert emulator.webhook_statuses == {200: 1}
+
+
+async def test_injected_errors_are_retried():
+    async with CryptoPayEmulator(token=TOKEN, error_rate=0.5, seed=1) as emulator:
+        crypto: ICryptoPay = ICryptoPay(
+            token=TOKEN,
+            base_url=emulator.base_url,
+            retry_policy=RetryPolicy(max_attempts=10, backoff_base=0.001)
+        )
+
+        try:
+            await asyncio.gather(*(crypto.get_me() for _ in range(5)))
+        finally:
+            await crypto.close()
+
+    assert emulator.request_counts["/api/getMe"] > 5
+
+
+async def test_rate_limit_answers_429():
+    async with CryptoPayEmulator(token=TOKEN, rate_limit=1, rate_burst=1) as emulator:
+        crypto: ICryptoPay = ICryptoPay(
+            token=TOKEN,
+            base_url=emulator.base_url,
+            retry_policy=RetryPolicy(max_attempts=1)
+        )
+
+        try:
+            await crypto.get_me()
+
+            with pytest.raises(CryptoPayAPIError(429)) as info:
+                await crypto.get_me()
+        finally:
+            await crypto.close()
+
+    assert info.value.retry_after == 1
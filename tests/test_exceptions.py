@@ -0,0 +1,53 @@
+import gc
+from unittest import mock
+
+import pytest
+
+from icryptopay.exceptions import CryptoPayAPIError, InsufficientFundsError
+
+
+def test_exception_class_is_cached():
+    assert CryptoPayAPIError(400) is CryptoPayAPIError(400)
+    assert CryptoPayAPIError.exception_to_handle(400, "INSUFFICIENT_FUNDS") is InsufficientFundsError
+
+
+def test_lookup_does_not_scan_gc():
+    with mock.patch.object(gc, "get_objects", side_effect=AssertionError("gc scanned")):
+        CryptoPayAPIError(418)
+        CryptoPayAPIError(418, "TEAPOT")
+
+
+def test_raised_error_is_handled_by_code_and_name():
+    with pytest.raises(InsufficientFundsError):
+        raise CryptoPayAPIError(400, "INSUFFICIENT_FUNDS")
+
+    with pytest.raises(CryptoPayAPIError(400)):
+        raise CryptoPayAPIError(400, "INSUFFICIENT_FUNDS")
+
+
+def test_other_codes_are_not_handled():
+    with pytest.raises(CryptoPayAPIError(401)):
+        try:
+            raise CryptoPayAPIError(401, "UNAUTHORIZED")
+        except CryptoPayAPIError(400):
+            pytest.fail("401 error handled as 400")
+
+
+def test_named_class_is_subclass_of_code_class():
+    error_type = CryptoPayAPIError.get_exception_class(code=400, name="AMOUNT_TOO_SMALL")
+
+    assert issubclass(error_type, CryptoPayAPIError(400))
+    assert isinstance(error_type(400, "AMOUNT_TOO_SMALL"), CryptoPayAPIError(400))
+    assert error_type.__name__ == "CodeErrorFactory_400_AMOUNT_TOO_SMALL"
+
+
+def test_exception_to_raise_returns_instance():
+    error = CryptoPayAPIError.exception_to_raise(code=503, name="")
+
+    assert type(error) is CryptoPayAPIError(503)
+    assert (error.code, error.name) == (503, None)
+
+    named = CryptoPayAPIError.exception_to_raise(code=400, name="INSUFFICIENT_FUNDS")
+
+    assert type(named) is InsufficientFundsError
+    assert CryptoPayAPIError(400, "INSUFFICIENT_FUNDS").__class__ is type(named)
@@ -0,0 +1,59 @@
+from decimal import Decimal
+from typing import List
+
+import pytest
+
+from icryptopay.types.rates import ExchangeRate
+from icryptopay.utils.exchange import RateTable, get_rate, get_rate_summ
+
+
+def make_rate(source: str, target: str, rate: str, is_valid: bool = True) -> ExchangeRate:
+    return ExchangeRate(is_valid=is_valid, is_crypto=True, is_fiat=False, source=source, target=target, rate=rate)
+
+
+RATES: List[ExchangeRate] = [
+    make_rate("TON", "USD", "5"),
+    make_rate("BTC", "USD", "60000"),
+    make_rate("TON", "EUR", "4.6"),
+    make_rate("USDT", "RUB", "90", is_valid=False),
+]
+
+
+def test_direct_rate():
+    assert RateTable(rates=RATES).get_rate(source="TON", target="USD") == Decimal(5)
+
+
+def test_inverse_and_cross_rates():
+    table: RateTable = RateTable(rates=RATES)
+
+    assert table.get_rate(source="USD", target="TON") == Decimal("0.2")
+    assert table.get_rate(source="BTC", target="TON") == Decimal(12000)
+    assert ("TON", "TON") in table
+
+
+def test_invalid_rates_are_skipped():
+    table: RateTable = RateTable(rates=RATES)
+
+    assert len(table) == 3
+
+    with pytest.raises(ValueError):
+        table.get_rate(source="USDT", target="RUB")
+
+
+def test_convert_matches_linear_scan():
+    table: RateTable = RateTable(rates=RATES)
+
+    rate: ExchangeRate = get_rate(source="TON", target="USD", rates=RATES)
+
+    assert table.convert(amount=2, source="TON", target="USD") == 2 * Decimal(rate.rate)
+    assert table.convert_many([1, "2.5"], source="USD", target="TON") == [Decimal("0.2"), Decimal("0.50")]
+
+
+def test_linear_scan_miss_raises_value_error():
+    assert get_rate_summ(10, get_rate(source="TON", target="USD", rates=RATES)) == 2
+
+    with pytest.raises(ValueError):
+        get_rate(source="USD", target="TON", rates=RATES)
+
+    with pytest.raises(ValueError):
+        get_rate(source="TON", target="USD", rates=[])
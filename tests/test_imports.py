@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import icryptopay
+from benchmarks import import_time
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+
+def imported_modules(statement: str) -> set:
+    """Returns modules loaded by the statement in a fresh interpreter"""
+
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-c", f"import sys; {statement}; print(' '.join(sys.modules))"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    return set(result.stdout.split())
+
+
+def test_package_import_is_lazy():
+    modules: set = imported_modules("import icryptopay")
+
+    assert "aiohttp" not in modules
+    assert "pydantic" not in modules
+
+
+def test_asgi_app_does_not_import_aiohttp():
+    modules: set = imported_modules("import icryptopay.webhook.asgi")
+
+    assert "aiohttp" not in modules
+    assert "starlette" not in modules
+
+
+def test_client_import_does_not_build_adapters():
+    modules: set = imported_modules("import icryptopay.api")
+
+    assert "pydantic.type_adapter" not in modules
+    assert "fastapi" not in modules
+
+
+def test_import_time_budgets():
+    # Same check as `python -m benchmarks.import_time --check`
+    assert import_time.check() == []
+
+
+def test_lazy_attributes():
+    from icryptopay.api import ICryptoPay
+    from icryptopay.pool import CryptoPayPool
+    from icryptopay.sync import SyncICryptoPay
+
+    assert icryptopay.ICryptoPay is ICryptoPay
+    assert icryptopay.CryptoPayPool is CryptoPayPool
+    assert icryptopay.SyncICryptoPay is SyncICryptoPay
+
+    with pytest.raises(AttributeError):
+        icryptopay.Missing
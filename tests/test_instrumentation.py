@@ -0,0 +1,90 @@
+from typing import AsyncIterator, List
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.exceptions import InsufficientFundsError
+from icryptopay.utils.instrumentation import Instrumentation, RequestTrace
+from tests.conftest import TOKEN
+
+
+class Recorder(Instrumentation):
+    def __init__(self) -> None:
+        self.events: List[str] = []
+        self.traces: List[RequestTrace] = []
+
+    def on_request_start(self, trace: RequestTrace) -> None:
+        self.events.append(f"start {trace.method_name}")
+
+    def on_request_end(self, trace: RequestTrace) -> None:
+        self.events.append(f"end {trace.method_name}")
+        self.traces.append(trace)
+
+    def on_request_error(self, trace: RequestTrace, error: BaseException) -> None:
+        self.events.append(f"error {trace.error_name}")
+        self.traces.append(trace)
+
+
+class Failing(Instrumentation):
+    def on_request_start(self, trace: RequestTrace) -> None:
+        raise RuntimeError("hook failed")
+
+
+@pytest.fixture
+def recorder() -> Recorder:
+    return Recorder()
+
+
+@pytest.fixture
+async def crypto(emulator: CryptoPayEmulator, recorder: Recorder) -> AsyncIterator[ICryptoPay]:
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, instrumentation=[Failing(), recorder])
+
+    yield crypto
+
+    await crypto.close()
+
+
+async def test_successful_call_is_traced(crypto: ICryptoPay, recorder: Recorder):
+    await crypto.get_me()
+
+    trace: RequestTrace = recorder.traces[0]
+
+    assert recorder.events == ["start getMe", "end getMe"]
+    assert trace.status == 200
+    assert trace.attempts == 1
+    assert trace.duration > 0
+    assert trace.response_size > 0
+    assert trace.connect_time is not None
+    assert trace.validate_time is not None
+
+
+async def test_api_error_is_traced(crypto: ICryptoPay, recorder: Recorder):
+    with pytest.raises(InsufficientFundsError):
+        await crypto.transfer(user_id=1, asset="TON", amount=10 ** 6, spend_id="spend")
+
+    assert recorder.events == ["start transfer", "error INSUFFICIENT_FUNDS"]
+    assert recorder.traces[0].status == 400
+
+
+async def test_prometheus_metrics(emulator: CryptoPayEmulator):
+    prometheus_client = pytest.importorskip("prometheus_client")
+
+    from icryptopay.contrib.prometheus import PrometheusInstrumentation
+
+    registry = prometheus_client.CollectorRegistry()
+    crypto: ICryptoPay = ICryptoPay(
+        token=TOKEN,
+        base_url=emulator.base_url,
+        instrumentation=PrometheusInstrumentation(registry=registry)
+    )
+
+    try:
+        await crypto.get_me()
+    finally:
+        await crypto.close()
+
+    labels: dict = {"method": "getMe", "status": "200"}
+
+    assert registry.get_sample_value("icryptopay_requests_total", labels) == 1
+    assert registry.get_sample_value("icryptopay_requests_in_flight", {"method": "getMe"}) == 0
@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import EmulatorState
+from icryptopay.types.balance import Balance
+from icryptopay.types.check import Check
+from icryptopay.types.invoice import Invoice
+from icryptopay.types.lite import LiteBalance, LiteCheck, LiteInvoice, LiteModel, LiteTransfer
+from icryptopay.types.transfer import Transfer
+
+
+@pytest.fixture
+def objects() -> Dict[str, Dict[str, Any]]:
+    state: EmulatorState = EmulatorState()
+    fiat_invoice: Dict[str, Any] = state.create_invoice({"currency_type": "fiat", "fiat": "USD", "amount": "10"})
+    state.pay_invoice(invoice_id=fiat_invoice["invoice_id"])
+    check: Dict[str, Any] = state.create_check({"asset": "TON", "amount": "1.5"})
+    state.activate_check(check["check_id"])
+
+    return {
+        "invoice": state.create_invoice({"asset": "TON", "amount": "1.5"}),
+        "fiat_invoice": fiat_invoice,
+        "check": check,
+        "transfer": state.transfer({"user_id": 1, "asset": "TON", "amount": "0.25", "spend_id": "spend"}),
+        "balance": state.get_balance()[0],
+    }
+
+
+MODELS: Dict[str, tuple] = {
+    "invoice": (Invoice, LiteInvoice),
+    "fiat_invoice": (Invoice, LiteInvoice),
+    "check": (Check, LiteCheck),
+    "transfer": (Transfer, LiteTransfer),
+    "balance": (Balance, LiteBalance),
+}
+
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("use_decimal", [False, True])
+def test_lite_fields_match_full_model(objects: Dict[str, Dict[str, Any]], name: str, use_decimal: bool):
+    model, lite_model = MODELS[name]
+    context: Any = {"use_decimal": True} if use_decimal else None
+
+    full: Dict[str, Any] = model.model_validate(objects[name], context=context).model_dump()
+    lite: Dict[str, Any] = lite_model.from_dict(objects[name], use_decimal=use_decimal).to_dict()
+
+    assert lite == full
+
+    for field, value in full.items():
+        # Whole amounts are int in the full models and float in lite models
+        if isinstance(value, int) and not isinstance(value, bool) and isinstance(lite[field], float):
+            continue
+
+        assert isinstance(lite[field], type(value)) or isinstance(value, str), field
+
+
+def test_invoice_amount_stays_str_without_decimal(objects: Dict[str, Dict[str, Any]]):
+    invoice: LiteInvoice = LiteInvoice.from_dict(objects["fiat_invoice"])
+
+    assert invoice.amount == "10"
+    assert isinstance(invoice.paid_fiat_rate, str)
+    assert LiteInvoice.from_dict(objects["fiat_invoice"], use_decimal=True).amount == Decimal(10)
+
+
+def test_utc_suffix_is_parsed(objects: Dict[str, Dict[str, Any]]):
+    check: LiteCheck = LiteCheck.from_dict({**objects["check"], "created_at": "2024-08-19T12:00:00.000Z"})
+
+    assert check.created_at == datetime(2024, 8, 19, 12, tzinfo=timezone.utc)
+
+
+def test_lite_model_is_abstract():
+    with pytest.raises(TypeError):
+        LiteModel()
+
+    class Incomplete(LiteModel):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_client_returns_lite_models(crypto: ICryptoPay):
+    await crypto.create_invoice(asset="TON", amount=1)
+
+    invoices = await crypto.get_invoices(lite=True)
+    balances = await crypto.get_balance(lite=True)
+
+    assert isinstance(invoices[0], LiteInvoice)
+    assert isinstance(balances[0], LiteBalance)
+
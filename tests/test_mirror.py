@@ -0,0 +1,80 @@
+from decimal import Decimal
+from typing import AsyncIterator
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.enums.invoice import InvoiceStatus
+from icryptopay.mirror import CryptoPayMirror
+from tests.conftest import TOKEN
+
+
+@pytest.fixture
+async def mirror(crypto: ICryptoPay) -> AsyncIterator[CryptoPayMirror]:
+    mirror: CryptoPayMirror = CryptoPayMirror(client=crypto, path=":memory:", page_size=2)
+
+    yield mirror
+
+    await mirror.close()
+
+
+async def test_incremental_sync(crypto: ICryptoPay, emulator: CryptoPayEmulator, mirror: CryptoPayMirror):
+    invoices = [await crypto.create_invoice(asset="TON", amount=1) for _ in range(3)]
+
+    result = await mirror.sync_invoices()
+    assert (result.added, result.updated, result.deleted) == (3, 0, 0)
+
+    emulator.state.pay_invoice(invoice_id=invoices[0].invoice_id)
+    await crypto.delete_invoice(invoices[1].invoice_id)
+    await crypto.create_invoice(asset="TON", amount=1)
+
+    result = await mirror.sync_invoices()
+    assert (result.added, result.updated, result.deleted) == (1, 1, 1)
+
+    paid = await mirror.get_invoices(status=InvoiceStatus.PAID)
+    assert [invoice.invoice_id for invoice in paid] == [invoices[0].invoice_id]
+
+
+async def test_full_sync_catches_missed_changes(
+        crypto: ICryptoPay,
+        emulator: CryptoPayEmulator,
+        mirror: CryptoPayMirror
+):
+    invoices = [await crypto.create_invoice(asset="TON", amount=1) for _ in range(3)]
+    emulator.state.pay_invoice(invoice_id=invoices[0].invoice_id)
+    await mirror.sync_invoices()
+
+    # Simulate changes the incremental sync can't see: a stale status, a missed and a deleted invoice
+    mirror._execute("UPDATE invoices SET status = 'expired' WHERE invoice_id = ?", (invoices[0].invoice_id,))
+    mirror._execute("DELETE FROM invoices WHERE invoice_id = ?", (invoices[1].invoice_id,))
+    mirror._execute("INSERT INTO invoices (invoice_id, status, data) VALUES (999, 'paid', '{}')")
+
+    result = await mirror.sync_invoices()
+    assert (result.added, result.updated, result.deleted) == (0, 0, 0)
+
+    result = await mirror.sync_invoices(full=True)
+    assert (result.added, result.updated, result.deleted) == (1, 1, 1)
+
+    stored = await mirror.get_invoices()
+    assert [invoice.invoice_id for invoice in stored] == [invoice.invoice_id for invoice in reversed(invoices)]
+    assert stored[-1].status == InvoiceStatus.PAID
+
+
+async def test_stats_use_client_number_type(emulator: CryptoPayEmulator):
+    crypto: ICryptoPay = ICryptoPay(token=TOKEN, base_url=emulator.base_url, use_decimal=True)
+    mirror: CryptoPayMirror = CryptoPayMirror(client=crypto, path=":memory:")
+
+    invoice = await crypto.create_invoice(asset="TON", amount=1)
+    emulator.state.pay_invoice(invoice_id=invoice.invoice_id)
+    await mirror.sync()
+
+    stats = await mirror.get_stats()
+    stored = await mirror.get_invoices()
+
+    await mirror.close()
+    await crypto.close()
+
+    assert isinstance(stats.volume, Decimal) and stats.volume > 0
+    assert stats.paid_invoice_count == 1
+    assert isinstance(stored[0].paid_usd_rate, Decimal)
@@ -0,0 +1,73 @@
+from typing import List
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.utils.pagination import paginate
+
+
+class Pages:
+    def __init__(self, total: int) -> None:
+        self.items: List[int] = list(range(total))
+        self.requests: List[tuple] = []
+
+    async def fetch(self, offset: int, count: int) -> List[int]:
+        self.requests.append((offset, count))
+
+        return self.items[offset:offset + count]
+
+
+async def test_all_pages_are_fetched():
+    pages: Pages = Pages(total=25)
+
+    assert [item async for item in paginate(pages.fetch, page_size=10)] == pages.items
+    assert pages.requests == [(0, 10), (10, 10), (20, 10)]
+
+
+async def test_limit_stops_fetching():
+    pages: Pages = Pages(total=100)
+
+    assert [item async for item in paginate(pages.fetch, page_size=10, limit=15)] == list(range(15))
+    assert len(pages.requests) == 2
+
+
+async def test_prefetch_yields_the_same_items():
+    pages: Pages = Pages(total=30)
+
+    assert [item async for item in paginate(pages.fetch, page_size=10, prefetch=True)] == pages.items
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+async def test_page_size_below_one_is_rejected(crypto: ICryptoPay, page_size: int):
+    pages: Pages = Pages(total=5)
+
+    with pytest.raises(ValueError):
+        async for _ in paginate(pages.fetch, page_size=page_size):
+            pass
+
+    with pytest.raises(ValueError):
+        async for _ in crypto.iter_invoices(page_size=page_size):
+            pass
+
+    assert not pages.requests
+
+
+async def test_iter_invoices(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    for index in range(7):
+        await crypto.create_invoice(asset="TON", amount=1, payload=str(index))
+
+    invoices = [invoice async for invoice in crypto.iter_invoices(page_size=3)]
+
+    assert len(invoices) == 7
+    assert len({invoice.invoice_id for invoice in invoices}) == 7
+    assert emulator.request_counts["/api/getInvoices"] == 3
+
+
+async def test_iter_transfers_and_checks(crypto: ICryptoPay):
+    for index in range(3):
+        await crypto.transfer(user_id=1, asset="TON", amount=1, spend_id=f"spend-{index}")
+        await crypto.create_check(asset="TON", amount=1)
+
+    assert len([transfer async for transfer in crypto.iter_transfers(page_size=2)]) == 3
+    assert len([check async for check in crypto.iter_checks(page_size=2, limit=2)]) == 2
@@ -0,0 +1,109 @@
+import asyncio
+import hmac
+import json
+from typing import Any, Dict, Hashable, List, Tuple
+from unittest import mock
+
+import pytest
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.pool import CryptoPayPool
+from icryptopay.types.update import Update
+from icryptopay.utils.balance import BalanceTracker
+from tests.conftest import TOKEN
+
+
+def make_body(emulator: CryptoPayEmulator) -> bytes:
+    invoice: Dict[str, Any] = emulator.state.create_invoice({"asset": "TON", "amount": "1"})
+
+    return json.dumps(emulator.state.make_update(emulator.state.pay_invoice(invoice_id=invoice["invoice_id"]))).encode()
+
+
+async def test_webhooks_are_routed_by_signature():
+    stranger: CryptoPayEmulator = CryptoPayEmulator(token="0:STRANGER")
+    other: CryptoPayEmulator = CryptoPayEmulator(token="5678:OTHER")
+    calls: List[Tuple[Hashable, int]] = []
+
+    async with CryptoPayPool() as pool:
+        pool.add_tenant("shop", token=TOKEN)
+        pool.add_tenant("other", token="5678:OTHER")
+        pool.register_pay_handler(lambda tenant_id, update: calls.append((tenant_id, update.update_id)))
+
+        body: bytes = make_body(other)
+
+        assert pool.find_tenant(body, other.sign(body)) == "other"
+        assert await pool.feed_webhook(body, other.sign(body)) == "other"
+        assert await pool.feed_webhook(body, other.sign(body), tenant_id="shop") is None
+        assert await pool.feed_webhook(body, stranger.sign(body)) is None
+
+    assert calls == [("other", 1)]
+
+
+async def test_signature_is_verified_once():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    body: bytes = make_body(emulator)
+
+    async with CryptoPayPool() as pool:
+        pool.add_tenant("shop", token=TOKEN)
+
+        with mock.patch("icryptopay.pool.hmac.digest", wraps=hmac.digest) as digest:
+            assert await pool.feed_webhook(body, emulator.sign(body)) == "shop"
+
+        with mock.patch.object(ICryptoPay, "parse_update") as parse_update:
+            await pool.feed_webhook(body, emulator.sign(body))
+
+    assert digest.call_count == 1
+    parse_update.assert_not_called()
+
+
+async def test_signed_invalid_body_raises_value_error():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+
+    async with CryptoPayPool() as pool:
+        pool.add_tenant("shop", token=TOKEN)
+
+        with pytest.raises(ValueError):
+            await pool.feed_webhook(b"{}", emulator.sign(b"{}"))
+
+
+async def test_state_survives_eviction():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    body: bytes = make_body(emulator)
+    updates: List[Update] = []
+
+    async with CryptoPayPool(
+            idle_timeout=0,
+            client_options=lambda tenant_id: {"balance_tracker": BalanceTracker()}
+    ) as pool:
+        pool.add_tenant("shop", token=TOKEN)
+        pool.register_pay_handler(lambda tenant_id, update: updates.append(update))
+
+        # idle_timeout=0 evicts the client on every get_client, so each webhook gets a new client
+        first: ICryptoPay = pool.get_client("shop")
+        await pool.feed_webhook(body, emulator.sign(body))
+        await pool.feed_webhook(body, emulator.sign(body))
+        second: ICryptoPay = pool.get_client("shop")
+
+        assert first is not second
+        assert first._balance_tracker is second._balance_tracker
+        assert len(updates) == 1
+
+        # A new token is a new app, nothing is kept
+        pool.add_tenant("shop", token="5678:OTHER")
+
+        assert pool.get_client("shop")._balance_tracker is not first._balance_tracker
+
+
+def test_eviction_outside_of_loop_defers_close():
+    pool: CryptoPayPool = CryptoPayPool(idle_timeout=0)
+    client: mock.AsyncMock = mock.AsyncMock(spec=ICryptoPay)
+    pool._clients["shop"] = (client, 0.0)
+
+    assert pool.evict_idle() == 1
+    client.close.assert_not_called()
+
+    asyncio.run(pool.close())
+
+    client.close.assert_awaited_once()
+    assert pool._unclosed == []
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import List
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.enums.method import APIMethod
+from icryptopay.enums.priority import RequestPriority
+from icryptopay.utils.ratelimit import RateLimiter, TokenBucket
+from icryptopay.utils.retry import RetryPolicy
+from tests.conftest import TOKEN
+
+
+def test_token_bucket_delay():
+    bucket: TokenBucket = TokenBucket(rate=10, capacity=1)
+    now: float = time.monotonic()
+
+    assert bucket.get_delay(now) == 0
+    bucket.consume()
+    assert 0 < bucket.get_delay(now) <= 0.1
+
+
+async def test_requests_are_spaced_by_rate():
+    limiter: RateLimiter = RateLimiter(rate=50, burst=1)
+    started_at: float = time.monotonic()
+
+    await asyncio.gather(*(limiter.acquire(APIMethod.GET_ME) for _ in range(5)))
+
+    assert time.monotonic() - started_at >= 0.07
+    assert limiter.get_stats().acquired_count == 5
+    assert limiter.get_stats().waited_count == 4
+
+
+async def test_reads_are_served_before_low_priority_writes():
+    limiter: RateLimiter = RateLimiter(rate=50, burst=1)
+    order: List[str] = []
+
+    async def request(api_method: APIMethod, tag: str) -> None:
+        await limiter.acquire(api_method)
+        order.append(tag)
+
+    async def create(tag: str) -> None:
+        with RateLimiter.priority(RequestPriority.LOW):
+            await request(APIMethod.CREATE_INVOICE, tag)
+
+    await limiter.acquire(APIMethod.GET_ME)
+    writes: List[asyncio.Task] = [asyncio.ensure_future(create(f"write{index}")) for index in range(3)]
+    await asyncio.sleep(0)
+    reads: List[asyncio.Task] = [
+        asyncio.ensure_future(request(APIMethod.GET_INVOICES, f"read{index}")) for index in range(2)
+    ]
+
+    await asyncio.gather(*writes, *reads)
+
+    assert order[:2] == ["read0", "read1"]
+
+
+async def test_client_stays_under_server_limit():
+    async with CryptoPayEmulator(token=TOKEN, rate_limit=20, rate_burst=2) as emulator:
+        crypto: ICryptoPay = ICryptoPay(
+            token=TOKEN,
+            base_url=emulator.base_url,
+            rate_limiter=RateLimiter(rate=10, burst=1),
+            retry_policy=RetryPolicy(max_attempts=1)
+        )
+
+        try:
+            await asyncio.gather(*(crypto.get_me() for _ in range(5)))
+        finally:
+            await crypto.close()
+
+    assert emulator.request_counts["/api/getMe"] == 5
+    assert crypto.get_rate_limiter_stats().waited_count == 4
@@ -0,0 +1,106 @@
+from typing import AsyncIterator, List
+
+import pytest
+from aiohttp import web
+
+from icryptopay.api import ICryptoPay
+from icryptopay.enums.method import APIMethod
+from icryptopay.exceptions import CryptoPayAPIError
+from icryptopay.utils.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+ME: dict = {"app_id": 1, "name": "App", "payment_processing_bot_username": "CryptoTestnetBot"}
+
+
+class FlakyServer:
+    """Returns queued responses in order, then a successful getMe"""
+
+    def __init__(self) -> None:
+        self.responses: List[web.Response] = []
+        self.calls = 0
+        self.crypto: ICryptoPay
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls += 1
+
+        if self.responses:
+            return self.responses.pop(0)
+
+        return web.json_response({"ok": True, "result": ME})
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[FlakyServer]:
+    server: FlakyServer = FlakyServer()
+    app: web.Application = web.Application()
+    app.router.add_route("*", "/api/{method}", server.handle)
+
+    runner: web.AppRunner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+
+    server.crypto = ICryptoPay(
+        token="TOKEN",
+        base_url=f"http://{host}:{port}",
+        retry_policy=RetryPolicy(backoff_base=0.01)
+    )
+
+    yield server
+
+    await server.crypto.close()
+    await runner.cleanup()
+
+
+async def test_idempotent_request_is_retried(server: FlakyServer):
+    server.responses.append(web.Response(status=502, text="Bad Gateway"))
+    server.responses.append(web.json_response({"ok": False, "error": {"code": 429, "name": "FLOOD"}}, status=429))
+
+    me = await server.crypto.get_me()
+
+    assert me.app_id == 1
+    assert server.calls == 3
+
+
+async def test_invoice_creation_is_not_retried(server: FlakyServer):
+    server.responses.append(web.Response(status=502, text="Bad Gateway"))
+
+    with pytest.raises(CryptoPayAPIError(502)):
+        await server.crypto.create_invoice(asset="TON", amount=1)
+
+    assert server.calls == 1
+
+
+async def test_attempts_are_limited(server: FlakyServer):
+    server.responses.extend(web.Response(status=503, text="Unavailable") for _ in range(5))
+
+    with pytest.raises(CryptoPayAPIError(503)):
+        await server.crypto.get_me()
+
+    assert server.calls == 3
+
+
+def test_non_json_error_without_reason_is_instance():
+    crypto: ICryptoPay = ICryptoPay(token="TOKEN")
+
+    with pytest.raises(CryptoPayAPIError(502)) as info:
+        crypto._parse_response(b"<html>", status=502, reason="")
+
+    assert isinstance(info.value, CryptoPayAPIError(502))
+    assert info.value.code == 502
+
+
+def test_policy_decisions():
+    policy: RetryPolicy = RetryPolicy(max_attempts=2, jitter=False, budget=RetryBudget(min_per_second=100))
+    error: CryptoPayAPIError = CryptoPayAPIError.exception_to_raise(code=502)
+
+    assert policy.should_retry(APIMethod.GET_ME, error, attempt=0)
+    assert not policy.should_retry(APIMethod.GET_ME, error, attempt=1)
+    assert not policy.should_retry(APIMethod.CREATE_INVOICE, error, attempt=0)
+    assert not policy.should_retry(APIMethod.GET_ME, CryptoPayAPIError.exception_to_raise(code=400), attempt=0)
+    assert policy.get_delay(attempt=2, retry_after=5) == 5
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.sync import SyncICryptoPay
+from icryptopay.types.update import Update
+from tests.conftest import TOKEN
+
+
+@pytest.fixture
+def emulator() -> Iterator[CryptoPayEmulator]:
+    # The test itself has no running loop, the emulator gets a loop thread of its own
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    thread: threading.Thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    asyncio.run_coroutine_threadsafe(emulator.start(), loop).result()
+
+    yield emulator
+
+    asyncio.run_coroutine_threadsafe(emulator.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture
+def crypto(emulator: CryptoPayEmulator) -> Iterator[SyncICryptoPay]:
+    crypto: SyncICryptoPay = SyncICryptoPay(token=TOKEN, base_url=emulator.base_url)
+
+    yield crypto
+
+    crypto.close()
+
+
+def test_calls_block_until_result(crypto: SyncICryptoPay):
+    invoice = crypto.create_invoice(asset="TON", amount=1)
+
+    assert crypto.get_invoice(invoice.invoice_id).invoice_id == invoice.invoice_id
+    assert crypto.submit(crypto.client.get_me()).result().name
+
+
+def test_async_iterators_become_iterators(crypto: SyncICryptoPay):
+    for _ in range(3):
+        crypto.create_invoice(asset="TON", amount=1)
+
+    assert len(list(crypto.iter_invoices(page_size=2))) == 3
+
+
+def test_blocking_call_from_loop_thread_raises(crypto: SyncICryptoPay, emulator: CryptoPayEmulator):
+    errors: List[Exception] = []
+
+    def handler(update: Update) -> None:
+        for call in (crypto.get_me, crypto.close):
+            try:
+                call()
+            except RuntimeError as error:
+                errors.append(error)
+
+    crypto.client.register_pay_handler(handler)
+    invoice: Dict[str, Any] = emulator.state.create_invoice({"asset": "TON", "amount": "1"})
+    update: Dict[str, Any] = emulator.state.make_update(emulator.state.pay_invoice(invoice_id=invoice["invoice_id"]))
+    crypto.run(crypto.client.feed_update(Update.model_validate(update)))
+
+    assert len(errors) == 2
+    assert not crypto._closed
+
+
+def test_close_is_idempotent(crypto: SyncICryptoPay):
+    crypto.close()
+    crypto.close()
+
+    with pytest.raises(RuntimeError):
+        crypto.get_me()
+
+    assert not any(thread.name == "icryptopay-loop" and thread.is_alive() for thread in threading.enumerate())
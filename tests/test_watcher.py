@@ -0,0 +1,95 @@
+import asyncio
+from typing import List, Optional
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator
+from icryptopay.types.update import Update
+from icryptopay.webhook.watcher import InvoiceWatcher
+from tests.conftest import make_paid_update
+
+
+class Handler:
+    def __init__(self, crypto: ICryptoPay) -> None:
+        self.updates: List[Update] = []
+        crypto.register_pay_handler(self.handle)
+
+    async def handle(self, update: Update) -> None:
+        self.updates.append(update)
+
+    @property
+    def invoice_ids(self) -> List[int]:
+        return [update.payload.invoice_id for update in self.updates]
+
+
+def test_poll_interval_grows_with_age(crypto: ICryptoPay):
+    watcher: InvoiceWatcher = InvoiceWatcher(client=crypto, schedule=((60, 2), (600, 5)), max_interval=30)
+
+    assert watcher.get_interval(10) == 2
+    assert watcher.get_interval(120) == 5
+    assert watcher.get_interval(6000) == 30
+
+
+async def test_paid_invoices_are_dispatched_once(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    handler: Handler = Handler(crypto)
+    watcher: InvoiceWatcher = InvoiceWatcher(client=crypto, schedule=((60, 0),))
+    invoices = [await crypto.create_invoice(asset="TON", amount=1) for _ in range(3)]
+
+    for invoice in invoices:
+        watcher.watch(invoice)
+
+    await emulator.pay_invoice(invoices[0].invoice_id)
+    await crypto.delete_invoice(invoices[1].invoice_id)
+    await watcher.poll()
+
+    assert handler.invoice_ids == [invoices[0].invoice_id]
+    assert handler.updates[0].update_id is None
+    assert list(watcher._watched) == [invoices[2].invoice_id]
+
+    # Watching a dispatched invoice again doesn't dispatch it twice
+    watcher.watch(invoices[0].invoice_id)
+    await watcher.poll()
+
+    assert len(handler.updates) == 1
+    assert watcher.get_stats().paid_count == 2
+
+
+async def test_polled_and_webhook_updates_do_not_collide(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    handler: Handler = Handler(crypto)
+    watcher: InvoiceWatcher = InvoiceWatcher(client=crypto, schedule=((60, 0),))
+
+    polled = await crypto.create_invoice(asset="TON", amount=1)
+    webhook_update: Update = make_paid_update(emulator.state, update_id=polled.invoice_id)
+
+    # A webhook update whose update_id equals the polled invoice ID
+    await crypto.feed_update(webhook_update)
+
+    watcher.watch(polled)
+    await emulator.pay_invoice(polled.invoice_id)
+    await watcher.poll()
+
+    # Redelivery of the webhook is still dropped
+    await crypto.feed_update(webhook_update)
+
+    assert handler.invoice_ids == [webhook_update.payload.invoice_id, polled.invoice_id]
+    assert crypto.get_dispatcher_stats().duplicates_count == 1
+
+
+async def test_background_polling(crypto: ICryptoPay, emulator: CryptoPayEmulator):
+    handler: Handler = Handler(crypto)
+    invoice = await crypto.create_invoice(asset="TON", amount=1)
+
+    async with InvoiceWatcher(client=crypto, schedule=((60, 0.05),), requests_per_second=100) as watcher:
+        watcher.watch(invoice)
+        await asyncio.sleep(0.1)
+        await emulator.pay_invoice(invoice.invoice_id)
+
+        for _ in range(50):
+            if handler.updates:
+                break
+
+            await asyncio.sleep(0.02)
+
+    paid: Optional[Update] = handler.updates[0] if handler.updates else None
+
+    assert paid is not None and paid.payload.invoice_id == invoice.invoice_id
+    assert len(watcher) == 0
@@ -0,0 +1,50 @@
+import json
+from typing import Any, Dict, Optional
+
+from icryptopay.api import ICryptoPay
+from icryptopay.emulator import CryptoPayEmulator, EmulatorState
+from icryptopay.types.update import Update
+from tests.conftest import TOKEN
+
+
+def make_body(state: EmulatorState) -> bytes:
+    invoice: Dict[str, Any] = state.create_invoice({"asset": "TON", "amount": "1"})
+    update: Dict[str, Any] = state.make_update(state.pay_invoice(invoice_id=invoice["invoice_id"]))
+
+    # Signature is computed over the raw bytes, so formatting must not matter
+    return json.dumps(update, indent=2, sort_keys=True).encode("UTF-8")
+
+
+def test_signed_body_is_parsed():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    body: bytes = make_body(emulator.state)
+
+    update: Optional[Update] = ICryptoPay(token=TOKEN).parse_update(body, emulator.sign(body))
+
+    assert update is not None
+    assert update.payload.invoice_id == 1
+    assert update.update_type == "invoice_paid"
+
+
+def test_tampered_body_is_rejected():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    body: bytes = make_body(emulator.state)
+
+    assert ICryptoPay(token=TOKEN).parse_update(body.replace(b'"1"', b'"9"'), emulator.sign(body)) is None
+
+
+def test_other_token_is_rejected():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token="OTHER")
+    body: bytes = make_body(emulator.state)
+
+    assert ICryptoPay(token=TOKEN).parse_update(body, emulator.sign(body)) is None
+    assert ICryptoPay(token=TOKEN).parse_update(body, "") is None
+
+
+def test_decimal_mode_update():
+    emulator: CryptoPayEmulator = CryptoPayEmulator(token=TOKEN)
+    body: bytes = make_body(emulator.state)
+
+    update: Optional[Update] = ICryptoPay(token=TOKEN, use_decimal=True).parse_update(body, emulator.sign(body))
+
+    assert str(update.payload.paid_amount) == emulator.state.invoices[1]["paid_amount"]